@@ -1,19 +1,59 @@
-import boto3
+from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
 from common.logger import Logger
+from common.priming import get_client, get_resource
+
+# Key attribute names by (region, table), shared by every client in the process so that the
+# DescribeTable behind Table.key_schema runs once per table rather than once per instance.
+_KEY_ATTRIBUTES = {}
+
+def reset_key_attributes():
+    _KEY_ATTRIBUTES.clear()
 
 class DynamoDBClient:
     def __init__(self, region_name=None):
         self.logger = Logger(__name__)
-        self.dynamodb = boto3.resource('dynamodb', region_name=region_name)
+        self.region_name = region_name
+        self.dynamodb = get_resource('dynamodb', region_name=region_name)
+        self._client = None
+        self.serializer = TypeSerializer()
+        self.deserializer = TypeDeserializer()
+        self._tables = {}
+
+    @property
+    def client(self):
+        # A dedicated low-level client: the resource registers its (de)serialization
+        # handlers on its own meta.client, so that one cannot be used for the fast path.
+        if self._client is None:
+            self._client = get_client('dynamodb', region_name=self.region_name)
+        return self._client
+
+    def get_table(self, table_name):
+        table = self._tables.get(table_name)
+        if table is None:
+            table = self._tables[table_name] = self.dynamodb.Table(table_name)
+        return table
+
+    def get_key_attributes(self, table_name):
+        names = _KEY_ATTRIBUTES.get((self.region_name, table_name))
+        if names is None:
+            key_schema = self.get_table(table_name).key_schema
+            names = _KEY_ATTRIBUTES[(self.region_name, table_name)] = tuple(k['AttributeName'] for k in key_schema)
+        return names
 
     def get_item(self, table_name, key):
         self.logger.info(f"Getting item from table: {table_name}, key: {key}")
-        table = self.dynamodb.Table(table_name)
+        table = self.get_table(table_name)
         return table.get_item(Key=key)
 
     def put_item(self, table_name, item):
         self.logger.info(f"Putting item to table: {table_name}, item: {item}")
-        table = self.dynamodb.Table(table_name)
+        table = self.get_table(table_name)
         return table.put_item(Item=item)
 
-    # Add more methods as needed 
\ No newline at end of file
+    def serialize_item(self, item):
+        return {k: self.serializer.serialize(v) for k, v in item.items()}
+
+    def deserialize_item(self, item):
+        return {k: self.deserializer.deserialize(v) for k, v in item.items()}
+
+    # Add more methods as needed
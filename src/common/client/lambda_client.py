@@ -0,0 +1,20 @@
+import json
+from common.logger import Logger
+from common.priming import get_client
+
+class LambdaClient:
+    def __init__(self, region_name=None):
+        self.logger = Logger(__name__)
+        self.lambda_client = get_client('lambda', region_name=region_name)
+
+    def invoke_async(self, function_name, payload):
+        self.logger.info(f"Invoking function asynchronously: {function_name}")
+        try:
+            return self.lambda_client.invoke(
+                FunctionName=function_name,
+                InvocationType='Event',
+                Payload=json.dumps(payload, default=str).encode('utf-8'),
+            )
+        except Exception as e:
+            self.logger.error(f"Error invoking function: {e}")
+            raise
@@ -1,10 +1,10 @@
-import boto3
 from common.logger import Logger
+from common.priming import get_client
 
 class S3Client:
     def __init__(self, region_name=None):
         self.logger = Logger(__name__)
-        self.s3 = boto3.client('s3', region_name=region_name)
+        self.s3 = get_client('s3', region_name=region_name)
 
     def get_object(self, bucket, key):
         self.logger.info(f"Getting object from bucket: {bucket}, key: {key}")
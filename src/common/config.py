@@ -0,0 +1,233 @@
+"""
+Config: Load-once, immutable settings shared by the handlers and utils.
+
+Values are merged once, lowest precedence first, from the Config defaults, a YAML file (CONFIG_FILE,
+default config.yaml), an optional YAML object in S3 (CONFIG_S3_URI), optional SSM parameters under a
+path (CONFIG_SSM_PATH) and finally environment variables named after the fields (AWS_REGION,
+TARGET_OUTPUT_BUCKET, ...). The result is validated into a frozen Config. A top-level `workflows`
+mapping holds per-workflow overrides, resolved at load time and read with Config.for_workflow(name).
+
+get_config() returns the shared instance without re-reading anything. When remote sources are
+configured, a daemon thread reloads them every CONFIG_TTL_SECONDS and swaps in the new Config; a
+failed reload keeps the previous one.
+"""
+import dataclasses
+import os
+import threading
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlparse
+
+import boto3
+import yaml
+
+from common.logger import Logger
+
+DEFAULT_CONFIG_FILE = "config.yaml"
+DEFAULT_TTL_SECONDS = 300
+TRUE_VALUES = ("1", "true", "yes", "on")
+FALSE_VALUES = ("0", "false", "no", "off")
+
+
+class ConfigError(ValueError):
+    """Raised when configuration values fail validation."""
+
+
+@dataclass(frozen=True)
+class Config:
+    """Validated, immutable settings."""
+
+    aws_region: str = "us-east-1"
+    target_output_bucket: str = "new-recording-with-pii"
+    counter_table_name: str = "item-counters"
+    checkpoint_table_name: str = "job-checkpoints"
+    scheduler_safety_margin_ms: int = 30000
+    transcribe_chunk_seconds: float = 0.0
+    transcribe_chunk_overlap_seconds: float = 5.0
+    transcribe_max_parallel_jobs: int = 10
+    prime_warm_up: bool = False
+    profiling_sample_rate: float = 0.0
+    profiling_s3_uri: str = ""
+    profiling_top_n: int = 20
+    workflows: Mapping[str, "Config"] = field(default_factory=lambda: MappingProxyType({}), compare=False)
+
+    def for_workflow(self, name: str) -> "Config":
+        """Returns the settings of a workflow, or the shared settings if it has no overrides."""
+        return self.workflows.get(name, self)
+
+
+SETTINGS = {f.name: f.type for f in dataclasses.fields(Config) if f.name != "workflows"}
+
+
+def _coerce(name: str, value: Any, kind: type) -> Any:
+    """Converts a raw value (often a string) to the field type."""
+    if kind is bool and isinstance(value, str):
+        if value.lower() in TRUE_VALUES or value.lower() in FALSE_VALUES:
+            return value.lower() in TRUE_VALUES
+    elif isinstance(value, kind) and not (isinstance(value, bool) and kind is not bool):
+        return value
+    elif kind in (int, float) and isinstance(value, (str, int, float)) and not isinstance(value, bool):
+        try:
+            return kind(value)
+        except ValueError:
+            pass
+    raise ConfigError(f"Invalid value for {name}: {value!r} (expected {kind.__name__})")
+
+
+def validate(values: Mapping[str, Any]) -> Config:
+    """Validates merged values into a Config, including its per-workflow overrides."""
+    values = dict(values)
+    workflows = values.pop("workflows", None) or {}
+    unknown = set(values) - set(SETTINGS)
+    if unknown:
+        raise ConfigError(f"Unknown settings: {sorted(unknown)}")
+    if not isinstance(workflows, Mapping):
+        raise ConfigError("workflows must be a mapping of workflow name to settings")
+    settings = {name: _coerce(name, value, SETTINGS[name]) for name, value in values.items() if value is not None}
+    config = Config(**settings)
+    for name, value in settings.items():
+        if isinstance(value, (int, float)) and value < 0:
+            raise ConfigError(f"{name} must not be negative")
+    if config.transcribe_chunk_seconds and config.transcribe_chunk_overlap_seconds >= config.transcribe_chunk_seconds:
+        raise ConfigError("transcribe_chunk_overlap_seconds must be shorter than transcribe_chunk_seconds")
+    if config.transcribe_max_parallel_jobs < 1:
+        raise ConfigError("transcribe_max_parallel_jobs must be at least 1")
+    if config.profiling_sample_rate > 1:
+        raise ConfigError("profiling_sample_rate must be between 0 and 1")
+    if config.profiling_s3_uri and not config.profiling_s3_uri.startswith("s3://"):
+        raise ConfigError("profiling_s3_uri must be an s3:// URI")
+    resolved = {name: validate(dict(values, **(overrides or {}))) for name, overrides in workflows.items()}
+    return dataclasses.replace(config, workflows=MappingProxyType(resolved))
+
+
+def _merge(base: Dict[str, Any], overrides: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """Merges overrides into base, one level deep for the workflows mapping."""
+    for key, value in (overrides or {}).items():
+        if key == "workflows" and isinstance(value, Mapping):
+            workflows = base.setdefault("workflows", {})
+            for name, settings in value.items():
+                workflows[name] = dict(workflows.get(name) or {}, **(settings or {}))
+        else:
+            base[key] = value
+    return base
+
+
+def _read_yaml_file(path: str) -> Dict[str, Any]:
+    """Reads a YAML mapping from a file, or nothing if the file does not exist."""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as handle:
+        return _parse_yaml(handle.read(), path)
+
+
+def _parse_yaml(text: Any, source: str) -> Dict[str, Any]:
+    """Parses a YAML mapping."""
+    values = yaml.safe_load(text) or {}
+    if not isinstance(values, dict):
+        raise ConfigError(f"{source} must contain a mapping")
+    return values
+
+
+def _read_s3(uri: str, region_name: Optional[str]) -> Dict[str, Any]:
+    """Reads a YAML mapping from an s3:// URI."""
+    parsed = urlparse(uri)
+    body = boto3.client("s3", region_name=region_name).get_object(Bucket=parsed.netloc, Key=parsed.path.lstrip("/"))
+    return _parse_yaml(body["Body"].read(), uri)
+
+
+def _read_ssm(path: str, region_name: Optional[str]) -> Dict[str, Any]:
+    """Reads parameters under an SSM path; /path/workflows/<name>/<setting> become workflow overrides."""
+    values: Dict[str, Any] = {}
+    paginator = boto3.client("ssm", region_name=region_name).get_paginator("get_parameters_by_path")
+    for page in paginator.paginate(Path=path, Recursive=True, WithDecryption=True):
+        for parameter in page["Parameters"]:
+            parts = parameter["Name"][len(path):].strip("/").split("/")
+            if len(parts) == 3 and parts[0] == "workflows":
+                values.setdefault("workflows", {}).setdefault(parts[1], {})[parts[2]] = parameter["Value"]
+            else:
+                values[parts[-1]] = parameter["Value"]
+    return values
+
+
+def _read_environment(environ: Mapping[str, str]) -> Dict[str, Any]:
+    """Reads settings from environment variables named after the upper-cased fields."""
+    return {name: environ[name.upper()] for name in SETTINGS if name.upper() in environ}
+
+
+def load_config(environ: Optional[Mapping[str, str]] = None) -> Config:
+    """Merges every configured source and validates the result."""
+    environ = os.environ if environ is None else environ
+    region_name = environ.get("AWS_REGION")
+    values = _merge({}, _read_yaml_file(environ.get("CONFIG_FILE", DEFAULT_CONFIG_FILE)))
+    if environ.get("CONFIG_S3_URI"):
+        _merge(values, _read_s3(environ["CONFIG_S3_URI"], region_name))
+    if environ.get("CONFIG_SSM_PATH"):
+        _merge(values, _read_ssm(environ["CONFIG_SSM_PATH"], region_name))
+    _merge(values, _read_environment(environ))
+    return validate(values)
+
+
+class ConfigStore:
+    """Holds the current Config and optionally refreshes it in the background."""
+
+    def __init__(self, loader=None, ttl_seconds: float = 0):
+        self.logger = Logger(__name__)
+        self.loader = loader or load_config
+        self.ttl_seconds = ttl_seconds
+        self._config = self.loader()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def get(self) -> Config:
+        """Returns the current Config; never reloads on the caller's thread."""
+        return self._config
+
+    def refresh(self) -> Config:
+        """Reloads the Config, keeping the previous one if the reload fails."""
+        try:
+            self._config = self.loader()
+        except Exception as e:
+            self.logger.error(f"Error refreshing config, keeping previous values: {e}")
+        return self._config
+
+    def start(self) -> None:
+        """Starts the background refresh thread if a TTL is set."""
+        if self.ttl_seconds > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="config-refresh", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the background refresh thread."""
+        self._stopped.set()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.ttl_seconds):
+            self.refresh()
+
+
+_store: Optional[ConfigStore] = None
+_store_lock = threading.Lock()
+
+
+def get_config() -> Config:
+    """Returns the shared Config, loading it on first use (normally during the init phase)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                remote = os.environ.get("CONFIG_S3_URI") or os.environ.get("CONFIG_SSM_PATH")
+                ttl_seconds = float(os.environ.get("CONFIG_TTL_SECONDS", DEFAULT_TTL_SECONDS)) if remote else 0
+                store = ConfigStore(ttl_seconds=ttl_seconds)
+                store.start()
+                _store = store
+    return _store.get()
+
+
+def reset_config() -> None:
+    """Drops the shared Config so the next get_config() loads again; used by tests."""
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.stop()
+        _store = None
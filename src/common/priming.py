@@ -0,0 +1,115 @@
+"""
+Priming: Build AWS clients during the Lambda init phase instead of inside the first request.
+
+Workflows call prime() at module import time. It resolves credentials once, creates the clients (and
+the DynamoDB resource) their utils need, which loads the botocore models and resolves endpoints, and can
+optionally make a cheap warm-up call per service to open a pooled TLS connection (for S3, a head_bucket
+on the configured output bucket, which needs no account-wide permission). The clients go into a
+registry that get_client()/get_resource() hand to the utils; services that were not primed get a new
+client exactly as before.
+
+When the snapshot_restore_py module is available (Lambda SnapStart), priming is registered to run again
+after restore, so restored environments get fresh credentials and connections instead of stale ones.
+The time spent in each step is logged and returned.
+"""
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import boto3
+
+from common.config import get_config
+from common.logger import Logger
+
+try:
+    from snapshot_restore_py import register_after_restore
+except ImportError:
+    register_after_restore = None
+
+DEFAULT_SERVICES = ("s3", "dynamodb", "transcribe")
+RESOURCE_SERVICES = ("dynamodb",)
+WARM_UP_CALLS: Dict[str, Callable[[Any], Any]] = {
+    "dynamodb": lambda client: client.describe_limits(),
+    "transcribe": lambda client: client.list_transcription_jobs(MaxResults=1),
+    "lambda": lambda client: client.get_account_settings(),
+    "s3": lambda client: client.head_bucket(Bucket=get_config().target_output_bucket),
+}
+
+_clients: Dict[tuple, Any] = {}
+_resources: Dict[tuple, Any] = {}
+_restore_hook_registered = False
+logger = Logger(__name__)
+
+
+def get_client(service: str, region_name: Optional[str] = None) -> Any:
+    """Returns the primed client for a service and region, or a new one if it was not primed."""
+    client = _clients.get((service, region_name))
+    return client if client is not None else boto3.client(service, region_name=region_name)
+
+
+def get_resource(service: str, region_name: Optional[str] = None) -> Any:
+    """Returns the primed resource for a service and region, or a new one if it was not primed."""
+    resource = _resources.get((service, region_name))
+    return resource if resource is not None else boto3.resource(service, region_name=region_name)
+
+
+def prime(services: Iterable[str] = DEFAULT_SERVICES, region_name: Optional[str] = None, warm_up: bool = False,
+          warm_up_calls: Optional[Dict[str, Callable[[Any], Any]]] = None) -> Dict[str, float]:
+    """
+    Creates and registers the clients for the given services.
+
+    Warm-up calls open a connection; their failures (e.g. AccessDenied) are logged and ignored because
+    the connection is already established by then. warm_up_calls overrides the call used per service.
+    Returns the milliseconds spent per step, e.g. {'credentials': 3.1, 's3.client': 41.7, ...}.
+    """
+    global _restore_hook_registered
+    services = tuple(services)
+    calls = dict(WARM_UP_CALLS, **(warm_up_calls or {}))
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    def step(name: str, action: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return action()
+        finally:
+            timings[name] = round((time.perf_counter() - start) * 1000, 3)
+
+    session = step("session", lambda: boto3.Session(region_name=region_name))
+    step("credentials", lambda: _resolve_credentials(session))
+    clients, resources = {}, {}
+    for service in services:
+        client = clients[(service, region_name)] = step(f"{service}.client", lambda: session.client(service))
+        if service in RESOURCE_SERVICES:
+            resources[(service, region_name)] = step(f"{service}.resource", lambda: session.resource(service))
+        if warm_up and service in calls:
+            step(f"{service}.warm_up", lambda: _warm_up(service, client, calls[service]))
+    _clients.update(clients)
+    _resources.update(resources)
+    timings["total"] = round((time.perf_counter() - started) * 1000, 3)
+    logger.info(f"Primed clients for {', '.join(services)}: {timings}")
+
+    if register_after_restore is not None and not _restore_hook_registered:
+        register_after_restore(prime, services, region_name, warm_up, warm_up_calls)
+        _restore_hook_registered = True
+    return timings
+
+
+def reset_primed_clients() -> None:
+    """Empties the registry; used by tests."""
+    _clients.clear()
+    _resources.clear()
+
+
+def _resolve_credentials(session: Any) -> None:
+    """Resolves credentials now so the provider chain does not run inside the first request."""
+    credentials = session.get_credentials()
+    if credentials is not None:
+        credentials.get_frozen_credentials()
+
+
+def _warm_up(service: str, client: Any, call: Callable[[Any], Any]) -> None:
+    """Makes a cheap call to open a pooled connection."""
+    try:
+        call(client)
+    except Exception as e:
+        logger.warning(f"Warm-up call for {service} failed (connection is still reused): {e}")
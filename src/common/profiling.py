@@ -0,0 +1,142 @@
+"""
+Profiling: Opt-in cProfile and tracemalloc capture for Lambda entry points.
+
+Decorate an entry point with @profiled(). The profiling_sample_rate setting (PROFILING_SAMPLE_RATE)
+decides which invocations are profiled: 1.0 profiles every invocation, 0.05 about one in twenty. A
+profiled invocation logs a compact summary (top functions by cumulative time, top allocation sites, peak
+traced memory) through Logger. If profiling_s3_uri is set (s3://bucket/prefix), the full stats are also
+uploaded as a .pstats file that pstats.Stats or snakeviz can open.
+
+The sample rate is read on every call, so a config reload turns profiling on or off without a new
+environment. When it is 0, which is the default, an invocation costs one config lookup. cProfile only
+records the thread that called the entry point: time spent in worker threads (thread pools in the
+utils) shows up as waiting in the calling thread, not as the workers' functions. Allocations are traced
+in every thread.
+"""
+import cProfile
+import functools
+import marshal
+import pstats
+import random
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from common.config import get_config
+from common.logger import Logger
+from common.priming import get_client
+
+TRACEMALLOC_FRAMES = 1
+
+logger = Logger(__name__)
+
+
+class InvocationProfile:
+    """Captures cProfile stats and tracemalloc allocations around one call."""
+
+    def __init__(self, name: str, top_n: int = 20):
+        self.name = name
+        self.top_n = top_n
+        self.profiler = cProfile.Profile()
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.peak_bytes = 0
+        self.duration_ms = 0.0
+        self._started_tracing = False
+        self._start = 0.0
+
+    def __enter__(self) -> "InvocationProfile":
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.profiler.disable()
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+        self.peak_bytes = tracemalloc.get_traced_memory()[1]
+        self.snapshot = tracemalloc.take_snapshot()
+        if self._started_tracing:
+            tracemalloc.stop()
+
+    def summary(self) -> Dict[str, Any]:
+        """Returns the top functions by cumulative time and the top allocation sites."""
+        stats = pstats.Stats(self.profiler).stats
+        functions: List[Dict[str, Any]] = []
+        for (filename, line, function), (_, calls, tottime, cumtime, _) in sorted(
+                stats.items(), key=lambda entry: entry[1][3], reverse=True)[:self.top_n]:
+            functions.append({
+                "function": f"{filename}:{line}({function})",
+                "calls": calls,
+                "tottime_ms": round(tottime * 1000, 3),
+                "cumtime_ms": round(cumtime * 1000, 3),
+            })
+        allocations = [
+            {"site": str(stat.traceback), "size_kb": round(stat.size / 1024, 1), "count": stat.count}
+            for stat in self.snapshot.statistics("lineno")[:self.top_n]
+        ] if self.snapshot else []
+        return {
+            "name": self.name,
+            "duration_ms": round(self.duration_ms, 3),
+            "peak_memory_kb": round(self.peak_bytes / 1024, 1),
+            "top_functions": functions,
+            "top_allocations": allocations,
+        }
+
+    def pstats_bytes(self) -> bytes:
+        """Returns the stats in the format written by cProfile's dump_stats."""
+        self.profiler.create_stats()
+        return marshal.dumps(self.profiler.stats)
+
+
+def upload_profile(profile: InvocationProfile, s3_uri: str, request_id: Optional[str] = None) -> str:
+    """Uploads the full stats under the s3://bucket/prefix URI and returns the object URI."""
+    parsed = urlparse(s3_uri)
+    prefix = parsed.path.strip("/")
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    key = "/".join(part for part in (prefix, profile.name, f"{timestamp}-{request_id or 'local'}.pstats") if part)
+    get_client("s3", get_config().aws_region).put_object(Bucket=parsed.netloc, Key=key, Body=profile.pstats_bytes())
+    return f"s3://{parsed.netloc}/{key}"
+
+
+def profiled(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorates a Lambda entry point (event, context) so sampled invocations are profiled.
+
+    profiling_sample_rate is checked on each call against the current config.
+    """
+    def decorator(func: Callable) -> Callable:
+        profile_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(event: Any, context: Any = None, *args: Any, **kwargs: Any) -> Any:
+            config = get_config()
+            if config.profiling_sample_rate <= 0 or random.random() >= config.profiling_sample_rate:
+                return func(event, context, *args, **kwargs)
+            profile = InvocationProfile(profile_name, config.profiling_top_n)
+            try:
+                with profile:
+                    return func(event, context, *args, **kwargs)
+            finally:
+                _report(profile, config.profiling_s3_uri, getattr(context, "aws_request_id", None))
+
+        return wrapper
+
+    return decorator
+
+
+def _report(profile: InvocationProfile, s3_uri: str, request_id: Optional[str]) -> None:
+    """Logs the summary and uploads the stats; never fails the invocation."""
+    try:
+        summary = profile.summary()
+        if s3_uri:
+            summary["pstats_uri"] = upload_profile(profile, s3_uri, request_id)
+        logger.add_tempdata("profile", summary)
+        # Logged at WARNING so sampled profiles show at the default level without raising the logger's level.
+        logger.warning(f"Invocation profile for {profile.name}")
+    except Exception as e:
+        logger.error(f"Error reporting invocation profile: {e}")
@@ -1,6 +1,7 @@
+from common.profiling import profiled
 
 
-
+@profiled()
 def handler(event, context):
 
     pass
@@ -0,0 +1,291 @@
+"""
+AsyncDynamoDBUtils: asyncio-native counterpart of DynamoDBUtils.
+
+Same method names and semantics as the DynamoDBUtils CRUD, batch and query methods, awaited inside
+`async with AsyncDynamoDBUtils() as dynamodb:`. Items go in and come out as Python values. Batch gets
+and writes are split at the DynamoDB limits, and the chunks are sent concurrently with unprocessed
+entries retried. Counters, sharded keys and write-behind are only available on the sync DynamoDBUtils.
+One difference: a condition expression without expression values, such as 'attribute_not_exists(id)',
+is applied here, while the sync save_item and remove_item_by_key ignore it.
+Requires the optional aioboto3 dependency.
+"""
+from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
+from strategies.utils.async_support import AsyncClientUtils, bounded_map
+from strategies.utils.dynamodb_batch_session import MAX_BATCH_GET_KEYS, MAX_BATCH_WRITE_ITEMS
+from strategies.utils.dynamodb_utils import DynamoDBUtils, MAX_UNPROCESSED_RETRIES
+import asyncio
+
+
+class AsyncDynamoDBUtils(AsyncClientUtils):
+    """
+    Async utility class for DynamoDB operations.
+    """
+    service_name = 'dynamodb'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.serializer = TypeSerializer()
+        self.deserializer = TypeDeserializer()
+
+    # Expression building is shared with the sync utils; it only needs serialize_item.
+    _build_expression_kwargs = DynamoDBUtils._build_expression_kwargs
+
+    def serialize_item(self, item):
+        return {k: self.serializer.serialize(v) for k, v in item.items()}
+
+    def deserialize_item(self, item):
+        return {k: self.deserializer.deserialize(v) for k, v in item.items()}
+
+    async def fetch_item_by_key(self, table_name, key, raw=False):
+        """
+        Fetch a single item from a DynamoDB table by its key.
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            key (dict): The primary key of the item to fetch.
+            raw (bool, optional): Return the item as raw attribute-value dicts.
+        Returns:
+            dict: The response from DynamoDB get_item.
+        Raises:
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Fetching item from {table_name} with key {key}")
+        try:
+            response = await self.client.get_item(TableName=table_name, Key=self.serialize_item(key))
+        except Exception as e:
+            self.logger.error(f"Error fetching item: {e}")
+            raise
+        if not raw and 'Item' in response:
+            response['Item'] = self.deserialize_item(response['Item'])
+        return response
+
+    async def save_item(self, table_name, item, condition_expression=None, expression_values=None):
+        """
+        Save (put) an item into a DynamoDB table. Optionally use a condition expression, which is applied
+        with or without expression_values (e.g. 'attribute_not_exists(id)').
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            item (dict): The item to save.
+            condition_expression (optional): Condition for the put (str or boto3 condition object).
+            expression_values (dict, optional): Values for the condition expression.
+        Returns:
+            dict: The response from DynamoDB put_item.
+        Raises:
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Saving item in {table_name}: {item}")
+        kwargs = {'TableName': table_name, 'Item': self.serialize_item(item)}
+        if condition_expression:
+            kwargs.update(self._build_expression_kwargs(
+                condition_expression=condition_expression, expression_values=expression_values))
+        try:
+            return await self.client.put_item(**kwargs)
+        except Exception as e:
+            self.logger.error(f"Error saving item: {e}")
+            raise
+
+    async def update_item_attributes(self, table_name, key, update_expression, expression_values,
+                                     condition_expression=None):
+        """
+        Update attributes of a single item in a DynamoDB table.
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            key (dict): The primary key of the item to update.
+            update_expression (str): The update expression (e.g., 'SET attr = :val').
+            expression_values (dict): Values for the update expression.
+            condition_expression (optional): Condition for the update (str or boto3 condition object).
+        Returns:
+            dict: The response from DynamoDB update_item, with Attributes deserialized.
+        Raises:
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Updating item in {table_name} with key {key}")
+        kwargs = {
+            'TableName': table_name,
+            'Key': self.serialize_item(key),
+            'UpdateExpression': update_expression,
+            'ReturnValues': "UPDATED_NEW",
+        }
+        kwargs.update(self._build_expression_kwargs(
+            condition_expression=condition_expression, expression_values=expression_values))
+        try:
+            response = await self.client.update_item(**kwargs)
+        except Exception as e:
+            self.logger.error(f"Error updating item: {e}")
+            raise
+        if 'Attributes' in response:
+            response['Attributes'] = self.deserialize_item(response['Attributes'])
+        return response
+
+    async def remove_item_by_key(self, table_name, key, condition_expression=None, expression_values=None):
+        """
+        Remove (delete) a single item from a DynamoDB table by its key. Optionally use a condition
+        expression, which is applied with or without expression_values.
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            key (dict): The primary key of the item to delete.
+            condition_expression (optional): Condition for the delete (str or boto3 condition object).
+            expression_values (dict, optional): Values for the condition expression.
+        Returns:
+            dict: The response from DynamoDB delete_item.
+        Raises:
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Removing item from {table_name} with key {key}")
+        kwargs = {'TableName': table_name, 'Key': self.serialize_item(key)}
+        if condition_expression:
+            kwargs.update(self._build_expression_kwargs(
+                condition_expression=condition_expression, expression_values=expression_values))
+        try:
+            return await self.client.delete_item(**kwargs)
+        except Exception as e:
+            self.logger.error(f"Error removing item: {e}")
+            raise
+
+    async def fetch_multiple_items_by_keys(self, table_name, keys, raw=False, limit=None):
+        """
+        Fetch multiple items by key. Keys are split into 100-key requests sent concurrently, and
+        unprocessed keys are retried with backoff.
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            keys (list): List of key dicts for the items to fetch.
+            raw (bool, optional): Return items as raw attribute-value dicts.
+            limit (int, optional): Requests in flight (defaults to max_concurrency).
+        Returns:
+            dict: {'Responses': {table_name: items}, 'UnprocessedKeys': {...}}.
+        Raises:
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Fetching multiple items from {table_name} with keys {keys}")
+        serialized_keys = [self.serialize_item(key) for key in keys]
+        chunks = [serialized_keys[start:start + MAX_BATCH_GET_KEYS]
+                  for start in range(0, len(serialized_keys), MAX_BATCH_GET_KEYS)]
+        try:
+            results = await bounded_map(lambda chunk: self._send_batch_get(table_name, chunk), chunks,
+                                        limit or self.max_concurrency)
+        except Exception as e:
+            self.logger.error(f"Error fetching multiple items: {e}")
+            raise
+        items = [item for found, _ in results for item in found]
+        unprocessed = [key for _, pending in results for key in pending]
+        if not raw:
+            items = [self.deserialize_item(item) for item in items]
+            unprocessed = [self.deserialize_item(key) for key in unprocessed]
+        response = {'Responses': {table_name: items}, 'UnprocessedKeys': {}}
+        if unprocessed:
+            response['UnprocessedKeys'][table_name] = {'Keys': unprocessed}
+        return response
+
+    async def bulk_save_or_remove_items(self, table_name, put_items=None, delete_keys=None, limit=None):
+        """
+        Bulk save (put) or remove (delete) items. Requests are split into 25-item batches sent
+        concurrently, and unprocessed items are retried with backoff.
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            put_items (list, optional): List of items to put.
+            delete_keys (list, optional): List of key dicts for items to delete.
+            limit (int, optional): Requests in flight (defaults to max_concurrency).
+        Returns:
+            None
+        Raises:
+            RuntimeError: If items remain unprocessed after all retries.
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Bulk saving or removing items in {table_name}")
+        requests = [{'PutRequest': {'Item': self.serialize_item(item)}} for item in put_items or []]
+        requests += [{'DeleteRequest': {'Key': self.serialize_item(key)}} for key in delete_keys or []]
+        chunks = [requests[start:start + MAX_BATCH_WRITE_ITEMS]
+                  for start in range(0, len(requests), MAX_BATCH_WRITE_ITEMS)]
+        try:
+            pending = await bounded_map(lambda chunk: self._send_batch_write(table_name, chunk), chunks,
+                                        limit or self.max_concurrency)
+        except Exception as e:
+            self.logger.error(f"Error in bulk save or remove: {e}")
+            raise
+        unprocessed = sum(len(entries) for entries in pending)
+        if unprocessed:
+            raise RuntimeError(f"{unprocessed} items unprocessed in {table_name} after retries")
+
+    async def find_items_by_key_condition(self, table_name, key_condition_expression, expression_values,
+                                          index_name=None, filter_expression=None, raw=False):
+        """
+        Query items in a DynamoDB table using a key condition expression (one page).
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            key_condition_expression: The key condition expression (str or boto3 condition object).
+            expression_values (dict): Values for string expression placeholders ({} for condition objects).
+            index_name (str, optional): Name of the index to query.
+            filter_expression: Additional filter expression (str or boto3 condition object), optional.
+            raw (bool, optional): Return items as raw attribute-value dicts.
+        Returns:
+            dict: The response from DynamoDB query.
+        Raises:
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Finding items in {table_name} with key condition {key_condition_expression}")
+        kwargs = {'TableName': table_name}
+        kwargs.update(self._build_expression_kwargs(
+            key_condition_expression=key_condition_expression,
+            filter_expression=filter_expression,
+            expression_values=expression_values))
+        if index_name:
+            kwargs['IndexName'] = index_name
+        try:
+            response = await self.client.query(**kwargs)
+        except Exception as e:
+            self.logger.error(f"Error finding items: {e}")
+            raise
+        if not raw:
+            response['Items'] = [self.deserialize_item(item) for item in response.get('Items', [])]
+            if 'LastEvaluatedKey' in response:
+                response['LastEvaluatedKey'] = self.deserialize_item(response['LastEvaluatedKey'])
+        return response
+
+    async def item_exists(self, table_name, key):
+        """
+        Check if an item exists in a DynamoDB table by its key.
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            key (dict): The primary key of the item to check.
+        Returns:
+            bool: True if the item exists, False otherwise.
+        """
+        self.logger.info(f"Checking if item exists in {table_name} with key {key}")
+        try:
+            response = await self.fetch_item_by_key(table_name, key)
+            return 'Item' in response and response['Item'] is not None
+        except Exception as e:
+            self.logger.error(f"Error checking item existence: {e}")
+            return False
+
+    async def _send_batch_get(self, table_name, keys):
+        """
+        Send one batch_get_item request, retrying unprocessed keys with backoff.
+        Returns:
+            tuple: (raw items, raw keys left unprocessed after retries).
+        """
+        items, pending = [], {table_name: {'Keys': keys}}
+        for attempt in range(MAX_UNPROCESSED_RETRIES + 1):
+            response = await self.client.batch_get_item(RequestItems=pending)
+            items.extend(response.get('Responses', {}).get(table_name, []))
+            pending = response.get('UnprocessedKeys') or {}
+            if not pending:
+                return items, []
+            if attempt < MAX_UNPROCESSED_RETRIES:
+                await asyncio.sleep(0.05 * (2 ** attempt))
+        return items, pending[table_name]['Keys']
+
+    async def _send_batch_write(self, table_name, requests):
+        """
+        Send one batch_write_item request, retrying unprocessed items with backoff.
+        Returns:
+            list: Requests left unprocessed after retries.
+        """
+        pending = {table_name: requests}
+        for attempt in range(MAX_UNPROCESSED_RETRIES + 1):
+            response = await self.client.batch_write_item(RequestItems=pending)
+            pending = response.get('UnprocessedItems') or {}
+            if not pending:
+                return []
+            if attempt < MAX_UNPROCESSED_RETRIES:
+                await asyncio.sleep(0.05 * (2 ** attempt))
+        return pending[table_name]
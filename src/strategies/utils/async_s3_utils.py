@@ -0,0 +1,210 @@
+"""
+AsyncS3Utils: asyncio-native counterpart of S3Utils.
+
+Same method names and semantics as S3Utils, awaited inside `async with AsyncS3Utils() as s3:`, plus
+bounded fan-out helpers for bulk gets, puts, deletes and prefix listings.
+Requires the optional aioboto3 dependency.
+"""
+from botocore.exceptions import ClientError
+from strategies.utils.async_support import AsyncClientUtils, bounded_map
+from strategies.utils.s3_utils import (
+    CHECKSUM_METADATA_KEY, MISSING_OBJECT_CODES, matches_checksum, sha256_checksum,
+)
+
+
+class AsyncS3Utils(AsyncClientUtils):
+    """
+    Async utility class for AWS S3 operations.
+    """
+    service_name = 's3'
+    client_attribute = 's3'
+
+    async def get_object(self, bucket, key):
+        """
+        Get an object from an S3 bucket.
+        Args:
+            bucket (str): The name of the S3 bucket.
+            key (str): The object key.
+        Returns:
+            dict: The response from S3 get_object; await response['Body'].read() inside the block.
+        Raises:
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Getting object from bucket: {bucket}, key: {key}")
+        try:
+            return await self.s3.get_object(Bucket=bucket, Key=key)
+        except Exception as e:
+            self.logger.error(f"Error getting object: {e}")
+            raise
+
+    async def put_object(self, bucket, key, body, skip_if_unchanged=False, verify_checksum=False):
+        """
+        Put an object into an S3 bucket.
+        Args:
+            bucket (str): The name of the S3 bucket.
+            key (str): The object key.
+            body (bytes or str): The content to upload.
+            skip_if_unchanged (bool, optional): Skip the upload when the stored object has the same
+                SHA-256 checksum. Implies verify_checksum.
+            verify_checksum (bool, optional): Send the SHA-256 checksum so S3 rejects a corrupted upload,
+                and record it in the object metadata.
+        Returns:
+            dict: The response from S3 put_object, or {'Skipped': True, 'ETag': ...} if the upload was skipped.
+        Raises:
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Putting object to bucket: {bucket}, key: {key}")
+        try:
+            if not (skip_if_unchanged or verify_checksum):
+                return await self.s3.put_object(Bucket=bucket, Key=key, Body=body)
+            if hasattr(body, 'read'):
+                body = body.read()
+            checksum = sha256_checksum(body)
+            if skip_if_unchanged:
+                stored = await self._head_object_if_exists(bucket, key)
+                if stored is not None and matches_checksum(stored, checksum):
+                    self.logger.info(f"Skipping unchanged object: {bucket}/{key}")
+                    return {'Skipped': True, 'ETag': stored.get('ETag')}
+            return await self.s3.put_object(Bucket=bucket, Key=key, Body=body, ChecksumSHA256=checksum,
+                                            Metadata={CHECKSUM_METADATA_KEY: checksum})
+        except Exception as e:
+            self.logger.error(f"Error putting object: {e}")
+            raise
+
+    async def _head_object_if_exists(self, bucket, key):
+        """
+        Head an object with checksums enabled.
+        Returns:
+            dict: The response from S3 head_object, or None if the object does not exist.
+        """
+        try:
+            return await self.s3.head_object(Bucket=bucket, Key=key, ChecksumMode='ENABLED')
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in MISSING_OBJECT_CODES:
+                return None
+            raise
+
+    async def delete_object(self, bucket, key):
+        """
+        Delete an object from an S3 bucket.
+        Args:
+            bucket (str): The name of the S3 bucket.
+            key (str): The object key.
+        Returns:
+            dict: The response from S3 delete_object.
+        Raises:
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Deleting object from bucket: {bucket}, key: {key}")
+        try:
+            return await self.s3.delete_object(Bucket=bucket, Key=key)
+        except Exception as e:
+            self.logger.error(f"Error deleting object: {e}")
+            raise
+
+    async def list_objects(self, bucket, prefix=None):
+        """
+        List objects in an S3 bucket, optionally filtered by prefix.
+        Args:
+            bucket (str): The name of the S3 bucket.
+            prefix (str, optional): Prefix to filter objects.
+        Returns:
+            dict: The response from S3 list_objects_v2.
+        Raises:
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Listing objects in bucket: {bucket}, prefix: {prefix}")
+        try:
+            kwargs = {'Bucket': bucket}
+            if prefix:
+                kwargs['Prefix'] = prefix
+            return await self.s3.list_objects_v2(**kwargs)
+        except Exception as e:
+            self.logger.error(f"Error listing objects: {e}")
+            raise
+
+    async def list_all_objects(self, bucket, prefix=None):
+        """
+        List every object under a prefix, following continuation tokens.
+        Args:
+            bucket (str): The name of the S3 bucket.
+            prefix (str, optional): Prefix to filter objects.
+        Returns:
+            list: The Contents entries of every page.
+        Raises:
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Listing all objects in bucket: {bucket}, prefix: {prefix}")
+        kwargs = {'Bucket': bucket}
+        if prefix:
+            kwargs['Prefix'] = prefix
+        contents = []
+        try:
+            while True:
+                response = await self.s3.list_objects_v2(**kwargs)
+                contents.extend(response.get('Contents', []))
+                if not response.get('IsTruncated'):
+                    return contents
+                kwargs['ContinuationToken'] = response['NextContinuationToken']
+        except Exception as e:
+            self.logger.error(f"Error listing objects: {e}")
+            raise
+
+    async def get_objects(self, bucket, keys, limit=None, return_exceptions=False):
+        """
+        Read many objects concurrently.
+        Args:
+            bucket (str): The name of the S3 bucket.
+            keys (list): Object keys.
+            limit (int, optional): Maximum requests in flight (defaults to max_concurrency).
+            return_exceptions (bool, optional): Return per-key exceptions instead of raising.
+        Returns:
+            list: Object bodies (bytes) in key order.
+        """
+        async def read(key):
+            response = await self.get_object(bucket, key)
+            async with response['Body'] as body:
+                return await body.read()
+        return await bounded_map(read, keys, limit or self.max_concurrency, return_exceptions)
+
+    async def put_objects(self, bucket, objects, limit=None, return_exceptions=False):
+        """
+        Upload many objects concurrently.
+        Args:
+            bucket (str): The name of the S3 bucket.
+            objects (dict): Object key to body.
+            limit (int, optional): Maximum requests in flight (defaults to max_concurrency).
+            return_exceptions (bool, optional): Return per-key exceptions instead of raising.
+        Returns:
+            list: put_object responses in key order.
+        """
+        return await bounded_map(lambda entry: self.put_object(bucket, *entry), objects.items(),
+                                 limit or self.max_concurrency, return_exceptions)
+
+    async def delete_objects(self, bucket, keys, limit=None, return_exceptions=False):
+        """
+        Delete many objects concurrently.
+        Args:
+            bucket (str): The name of the S3 bucket.
+            keys (list): Object keys.
+            limit (int, optional): Maximum requests in flight (defaults to max_concurrency).
+            return_exceptions (bool, optional): Return per-key exceptions instead of raising.
+        Returns:
+            list: delete_object responses in key order.
+        """
+        return await bounded_map(lambda key: self.delete_object(bucket, key), keys,
+                                 limit or self.max_concurrency, return_exceptions)
+
+    async def list_objects_for_prefixes(self, bucket, prefixes, limit=None):
+        """
+        List every object under several prefixes concurrently.
+        Args:
+            bucket (str): The name of the S3 bucket.
+            prefixes (list): Prefixes to list.
+            limit (int, optional): Prefixes listed at once (defaults to max_concurrency).
+        Returns:
+            dict: Prefix to its Contents entries.
+        """
+        listings = await bounded_map(lambda prefix: self.list_all_objects(bucket, prefix), prefixes,
+                                     limit or self.max_concurrency)
+        return dict(zip(prefixes, listings))
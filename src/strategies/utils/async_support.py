@@ -0,0 +1,108 @@
+"""
+Async support: Shared pieces of the asyncio-native utils.
+
+The async utils run on aioboto3/aiobotocore, which is an optional dependency (pip install aioboto3).
+Everything here imports without it; creating an async util without it raises ImportError.
+bounded_map and bounded_gather are the fan-out helpers. They keep at most `limit` calls in flight on
+one event loop, and each client's connection pool is sized to match.
+"""
+from common.config import get_config
+from common.logger import Logger
+import asyncio
+
+try:
+    import aioboto3
+    from aiobotocore.config import AioConfig
+except ImportError:
+    aioboto3 = None
+    AioConfig = None
+
+DEFAULT_ASYNC_CONCURRENCY = 64
+
+
+async def bounded_map(func, iterable, limit=DEFAULT_ASYNC_CONCURRENCY, return_exceptions=False):
+    """
+    Await func(item) for every item with at most `limit` calls in flight, preserving order.
+    Only `limit` worker tasks are created, however many items there are.
+    Args:
+        func (callable): Coroutine function called with each item.
+        iterable: The items.
+        limit (int, optional): Maximum concurrent calls.
+        return_exceptions (bool, optional): Return exceptions in place of results instead of raising
+            the first one (which cancels the remaining work).
+    Returns:
+        list: Results in item order.
+    """
+    items = list(iterable)
+    results = [None] * len(items)
+    pending = iter(enumerate(items))
+
+    async def worker():
+        for index, item in pending:
+            try:
+                results[index] = await func(item)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results[index] = e
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(min(limit, len(items)))]
+    try:
+        await asyncio.gather(*workers)
+    except BaseException:
+        for task in workers:
+            task.cancel()
+        raise
+    return results
+
+
+async def bounded_gather(*factories, limit=DEFAULT_ASYNC_CONCURRENCY, return_exceptions=False):
+    """
+    Like asyncio.gather for zero-argument coroutine functions, with at most `limit` running at once.
+    Pass factories (e.g. functools.partial or lambdas) rather than coroutines so that waiting calls
+    are not created early.
+    Returns:
+        list: Results in argument order.
+    """
+    return await bounded_map(lambda factory: factory(), factories, limit, return_exceptions)
+
+
+class AsyncClientUtils:
+    """
+    Base for async utils: owns one aiobotocore client for the lifetime of an `async with` block.
+    """
+    service_name = None
+    client_attribute = 'client'
+
+    def __init__(self, region_name=None, max_concurrency=DEFAULT_ASYNC_CONCURRENCY, session=None):
+        """
+        Initialize the util. The client is opened by `async with`.
+        Args:
+            region_name (str, optional): AWS region (defaults to the aws_region setting).
+            max_concurrency (int, optional): Connection pool size and default fan-out limit.
+            session (aioboto3.Session, optional): Session to share between utils.
+        Raises:
+            ImportError: If aioboto3 is not installed.
+        """
+        if aioboto3 is None:
+            raise ImportError("aioboto3 is required for the async utils: pip install aioboto3")
+        self.logger = Logger(__name__)
+        self.region_name = region_name or get_config().aws_region
+        self.max_concurrency = max_concurrency
+        self.session = session or aioboto3.Session()
+        self._client_context = None
+        setattr(self, self.client_attribute, None)
+
+    async def __aenter__(self):
+        self._client_context = self.session.client(
+            self.service_name, region_name=self.region_name,
+            config=AioConfig(max_pool_connections=self.max_concurrency))
+        setattr(self, self.client_attribute, await self._client_context.__aenter__())
+        return self
+
+    async def __aexit__(self, *exc_info):
+        try:
+            await self._client_context.__aexit__(*exc_info)
+        finally:
+            self._client_context = None
+            setattr(self, self.client_attribute, None)
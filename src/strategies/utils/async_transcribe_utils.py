@@ -0,0 +1,156 @@
+"""
+AsyncTranscribeUtils: asyncio-native counterpart of TranscribeUtils.
+
+Same method names and semantics as TranscribeUtils, awaited inside
+`async with AsyncTranscribeUtils() as transcribe:`. Polling sleeps with asyncio.sleep, so many jobs
+can be submitted and awaited from one invocation without a thread each.
+Requires the optional aioboto3 dependency.
+"""
+from strategies.utils.async_support import AsyncClientUtils, bounded_map
+import asyncio
+
+
+class AsyncTranscribeUtils(AsyncClientUtils):
+    """
+    Async utility class for AWS Transcribe operations.
+    """
+    service_name = 'transcribe'
+    client_attribute = 'transcribe'
+
+    async def start_transcription_job(self, transcription_job_name, media_file_uri, output_bucket,
+                                      language_code='en-US', output_key=None):
+        """
+        Start a PII-redacting transcription job.
+        Args:
+            transcription_job_name (str): Name of the transcription job.
+            media_file_uri (str): s3:// URI of the media file.
+            output_bucket (str): Bucket for the transcript.
+            language_code (str, optional): Language of the media.
+            output_key (str, optional): Output key or prefix in the bucket.
+        Returns:
+            dict: The response from Transcribe start_transcription_job.
+        Raises:
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Starting transcription job: {transcription_job_name} for file: {media_file_uri}")
+        kwargs = {}
+        if output_key:
+            kwargs['OutputKey'] = output_key
+        try:
+            return await self.transcribe.start_transcription_job(
+                TranscriptionJobName=transcription_job_name,
+                LanguageCode=language_code,
+                Media={'MediaFileUri': media_file_uri},
+                ContentRedaction={'RedactionType': 'PII', 'RedactionOutput': 'redacted'},
+                OutputBucketName=output_bucket,
+                **kwargs
+            )
+        except Exception as e:
+            self.logger.error(f"Error starting transcription job: {e}")
+            raise
+
+    async def get_transcription_job(self, transcription_job_name):
+        """
+        Get a transcription job description.
+        Returns:
+            dict: The response from Transcribe get_transcription_job.
+        Raises:
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Getting transcription job status for: {transcription_job_name}")
+        try:
+            return await self.transcribe.get_transcription_job(TranscriptionJobName=transcription_job_name)
+        except Exception as e:
+            self.logger.error(f"Error getting transcription job status: {e}")
+            raise
+
+    async def delete_transcription_job(self, transcription_job_name):
+        """
+        Delete a transcription job.
+        Returns:
+            dict: The response from Transcribe delete_transcription_job.
+        Raises:
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Deleting transcription job status for: {transcription_job_name}")
+        try:
+            return await self.transcribe.delete_transcription_job(TranscriptionJobName=transcription_job_name)
+        except Exception as e:
+            self.logger.error(f"Error deleting transcription job: {e}")
+            raise
+
+    async def check_transcription_status(self, transcription_job_name):
+        """
+        Poll the status of a transcription job until it completes or fails.
+        Args:
+            transcription_job_name (str): Name of the transcription job.
+        Returns:
+            str: Final status ('COMPLETED', 'FAILED', or 'UNKNOWN').
+        Raises:
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Checking transcription job status for: {transcription_job_name}")
+        try:
+            while True:
+                response = await self.get_transcription_job(transcription_job_name)
+                status = response['TranscriptionJob']['TranscriptionJobStatus']
+                if status in ('COMPLETED', 'FAILED'):
+                    self.logger.info(f"Transcription job finished with status: {status}")
+                    return status
+                if status != 'IN_PROGRESS':
+                    self.logger.error(f"Transcription job status not found: {response}")
+                    return "UNKNOWN"
+                await asyncio.sleep(5)
+        except Exception as e:
+            self.logger.error(f"Error checking transcription job status: {e}")
+            raise
+
+    async def wait_for_transcription_job(self, transcription_job_name, poll_seconds=5):
+        """
+        Poll a transcription job until it leaves the QUEUED and IN_PROGRESS states.
+        Args:
+            transcription_job_name (str): Name of the transcription job.
+            poll_seconds (float, optional): Delay between status polls.
+        Returns:
+            dict: The final TranscriptionJob description, including Transcript file URIs.
+        Raises:
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Waiting for transcription job: {transcription_job_name}")
+        try:
+            while True:
+                job = (await self.get_transcription_job(transcription_job_name))['TranscriptionJob']
+                if job['TranscriptionJobStatus'] not in ('QUEUED', 'IN_PROGRESS'):
+                    return job
+                await asyncio.sleep(poll_seconds)
+        except Exception as e:
+            self.logger.error(f"Error waiting for transcription job: {e}")
+            raise
+
+    async def start_transcription_jobs(self, jobs, limit=None, return_exceptions=False):
+        """
+        Submit many transcription jobs concurrently.
+        Args:
+            jobs (list): Dicts of start_transcription_job keyword arguments.
+            limit (int, optional): Maximum requests in flight (defaults to max_concurrency).
+            return_exceptions (bool, optional): Return per-job exceptions instead of raising.
+        Returns:
+            list: start_transcription_job responses in job order.
+        """
+        return await bounded_map(lambda job: self.start_transcription_job(**job), jobs,
+                                 limit or self.max_concurrency, return_exceptions)
+
+    async def wait_for_transcription_jobs(self, transcription_job_names, poll_seconds=5, limit=None,
+                                          return_exceptions=False):
+        """
+        Wait for many transcription jobs concurrently.
+        Args:
+            transcription_job_names (list): Names of the transcription jobs.
+            poll_seconds (float, optional): Delay between status polls of each job.
+            limit (int, optional): Jobs polled at once (defaults to max_concurrency).
+            return_exceptions (bool, optional): Return per-job exceptions instead of raising.
+        Returns:
+            list: Final TranscriptionJob descriptions in name order.
+        """
+        return await bounded_map(lambda name: self.wait_for_transcription_job(name, poll_seconds),
+                                 transcription_job_names, limit or self.max_concurrency, return_exceptions)
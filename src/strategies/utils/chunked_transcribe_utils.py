@@ -0,0 +1,211 @@
+"""
+ChunkedTranscribeUtils: Split-and-parallelize PII redaction for long WAV recordings.
+
+A long recording is streamed from S3 once and split into overlapping time chunks, each uploaded and
+submitted as its own Transcribe job. The redacted chunk transcripts are merged back into one
+transcript with timestamps shifted by each chunk's offset. In the overlap, words are taken from the
+earlier chunk before the overlap midpoint and from the later chunk after it. Latency then scales with
+the number of concurrent Transcribe jobs instead of the recording length.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from strategies.utils.s3_utils import S3Utils
+from strategies.utils.transcribe_utils import TranscribeUtils
+import io
+import json
+import wave
+
+DEFAULT_CHUNK_SECONDS = 300
+DEFAULT_OVERLAP_SECONDS = 5
+DEFAULT_PARALLEL_JOBS = 10
+CHUNK_PREFIX = 'transcribe-chunks'
+
+
+class _ForwardOnlyReader:
+    """
+    Exposes only read() so wave treats a streaming body as unseekable and skips chunks by reading.
+    """
+    def __init__(self, stream):
+        self.stream = stream
+
+    def read(self, size=-1):
+        return self.stream.read(size)
+
+
+def split_wav(stream, chunk_seconds=DEFAULT_CHUNK_SECONDS, overlap_seconds=DEFAULT_OVERLAP_SECONDS):
+    """
+    Split a WAV (PCM) stream into overlapping chunks in a single forward pass.
+    Only one chunk of audio is held in memory at a time.
+    Args:
+        stream: File-like object with read(), e.g. an S3 StreamingBody.
+        chunk_seconds (float, optional): Length of each chunk.
+        overlap_seconds (float, optional): Audio shared by consecutive chunks.
+    Yields:
+        tuple: (index, offset_seconds, wav_bytes) for each chunk.
+    Raises:
+        ValueError: If the overlap is not shorter than the chunk.
+        wave.Error: If the stream is not PCM WAV.
+    """
+    if overlap_seconds >= chunk_seconds:
+        raise ValueError("overlap_seconds must be shorter than chunk_seconds")
+    reader = wave.open(_ForwardOnlyReader(stream), 'rb')
+    params = reader.getparams()
+    frame_size = params.sampwidth * params.nchannels
+    chunk_frames = int(chunk_seconds * params.framerate)
+    overlap_bytes = int(overlap_seconds * params.framerate) * frame_size
+    tail = b''
+    start_frame = 0
+    index = 0
+    while True:
+        data = reader.readframes(chunk_frames - len(tail) // frame_size)
+        if not data:
+            return
+        frames = tail + data
+        yield index, start_frame / params.framerate, _wav_bytes(params, frames)
+        if len(frames) < chunk_frames * frame_size:
+            return
+        tail = frames[-overlap_bytes:] if overlap_bytes else b''
+        start_frame += (len(frames) - len(tail)) // frame_size
+        index += 1
+
+
+def _wav_bytes(params, frames):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as writer:
+        writer.setparams(params)
+        writer.writeframes(frames)
+    return buffer.getvalue()
+
+
+def merge_transcripts(chunks, overlap_seconds=DEFAULT_OVERLAP_SECONDS, job_name=None):
+    """
+    Merge chunk transcripts into one transcript in Transcribe's output format.
+    Args:
+        chunks (list): (offset_seconds, transcript) tuples in chunk order, where transcript is the
+            parsed Transcribe output JSON of that chunk.
+        overlap_seconds (float, optional): Overlap the chunks were split with.
+        job_name (str, optional): jobName of the merged transcript.
+    Returns:
+        dict: {'jobName', 'status', 'results': {'transcripts', 'items'}} with absolute timestamps.
+    """
+    items = []
+    for position, (offset, transcript) in enumerate(chunks):
+        lower = offset + overlap_seconds / 2 if position else None
+        upper = chunks[position + 1][0] + overlap_seconds / 2 if position + 1 < len(chunks) else None
+        keep = False
+        for item in transcript['results']['items']:
+            if 'start_time' not in item:
+                # Punctuation has no timestamps and follows the word before it.
+                if keep:
+                    items.append(dict(item))
+                continue
+            start = float(item['start_time']) + offset
+            keep = (lower is None or start >= lower) and (upper is None or start < upper)
+            if keep:
+                items.append(dict(item, start_time=f"{start:.3f}",
+                                  end_time=f"{float(item['end_time']) + offset:.3f}"))
+    words = []
+    for item in items:
+        content = item['alternatives'][0]['content']
+        if item.get('type') == 'punctuation' and words:
+            words[-1] += content
+        else:
+            words.append(content)
+    return {
+        'jobName': job_name,
+        'status': 'COMPLETED',
+        'results': {'transcripts': [{'transcript': ' '.join(words)}], 'items': items},
+    }
+
+
+class ChunkedTranscribeUtils(S3Utils, TranscribeUtils):
+    """
+    S3 and Transcribe operations plus chunked, parallel redaction of long WAV recordings.
+    """
+    def __init__(self, region_name=None):
+        """
+        Initialize the S3 and Transcribe clients for the region.
+        """
+        S3Utils.__init__(self, region_name=region_name)
+        TranscribeUtils.__init__(self, region_name=region_name)
+
+    def transcribe_wav_in_chunks(self, bucket, key, output_bucket, transcription_job_name,
+                                 chunk_seconds=DEFAULT_CHUNK_SECONDS, overlap_seconds=DEFAULT_OVERLAP_SECONDS,
+                                 max_parallel_jobs=DEFAULT_PARALLEL_JOBS, language_code='en-US', poll_seconds=5):
+        """
+        Redact a long WAV recording as parallel Transcribe jobs and write one merged transcript.
+        Chunk audio and chunk transcripts are staged under transcribe-chunks/<job name>/ in the output
+        bucket and removed afterwards; the merged transcript is written to redacted-<job name>.json.
+        Args:
+            bucket (str): Bucket of the recording.
+            key (str): Key of the recording.
+            output_bucket (str): Bucket for staged chunks and the merged transcript.
+            transcription_job_name (str): Base name for the chunk jobs and the merged transcript.
+            chunk_seconds (float, optional): Length of each chunk.
+            overlap_seconds (float, optional): Audio shared by consecutive chunks.
+            max_parallel_jobs (int, optional): Chunk jobs running at once; keep within the Transcribe quota.
+            language_code (str, optional): Language of the recording.
+            poll_seconds (float, optional): Delay between job status polls.
+        Returns:
+            dict: {'TranscriptionJobStatus', 'TranscriptKey', 'ChunkCount'}.
+        Raises:
+            Exception: If splitting, a chunk job or the merge fails.
+        """
+        self.logger.info(f"Transcribing s3://{bucket}/{key} in {chunk_seconds}s chunks as {transcription_job_name}")
+        prefix = f"{CHUNK_PREFIX}/{transcription_job_name}/"
+        staged = []
+        try:
+            with ThreadPoolExecutor(max_workers=max_parallel_jobs) as executor:
+                futures = []
+                # Chunks are uploaded as they are cut, so early chunk jobs run while later chunks upload.
+                for index, offset, audio in split_wav(self.get_object(bucket, key)['Body'], chunk_seconds,
+                                                      overlap_seconds):
+                    chunk_key = f"{prefix}chunk-{index:05d}.wav"
+                    self.put_object(output_bucket, chunk_key, audio)
+                    staged.append(chunk_key)
+                    futures.append((offset, executor.submit(
+                        self._transcribe_chunk, output_bucket, chunk_key, f"{transcription_job_name}-{index:05d}",
+                        prefix, language_code, poll_seconds, staged)))
+                chunks = [(offset, future.result()) for offset, future in futures]
+            merged = merge_transcripts(chunks, overlap_seconds, transcription_job_name)
+            transcript_key = f"redacted-{transcription_job_name}.json"
+            self.put_object(output_bucket, transcript_key, json.dumps(merged).encode('utf-8'))
+            self.logger.info(f"Merged {len(chunks)} chunk transcripts into s3://{output_bucket}/{transcript_key}")
+            return {'TranscriptionJobStatus': 'COMPLETED', 'TranscriptKey': transcript_key, 'ChunkCount': len(chunks)}
+        except Exception as e:
+            self.logger.error(f"Error transcribing in chunks: {e}")
+            raise
+        finally:
+            self._remove_staged_objects(output_bucket, staged)
+
+    def _transcribe_chunk(self, output_bucket, chunk_key, chunk_job_name, prefix, language_code, poll_seconds,
+                          staged):
+        self.start_transcription_job(chunk_job_name, f"s3://{output_bucket}/{chunk_key}", output_bucket,
+                                     language_code, output_key=prefix)
+        try:
+            job = self.wait_for_transcription_job(chunk_job_name, poll_seconds)
+            if job['TranscriptionJobStatus'] != 'COMPLETED':
+                raise RuntimeError(f"Chunk job {chunk_job_name} failed: {job.get('FailureReason')}")
+            transcript_bucket, transcript_key = self._parse_s3_uri(job['Transcript']['RedactedTranscriptFileUri'])
+            staged.append(transcript_key)
+            return json.loads(self.get_object(transcript_bucket, transcript_key)['Body'].read())
+        finally:
+            self.delete_transcription_job(chunk_job_name)
+
+    def _remove_staged_objects(self, bucket, keys):
+        for key in keys:
+            try:
+                self.delete_object(bucket, key)
+            except Exception as e:
+                self.logger.error(f"Error removing staged object {key}: {e}")
+
+    @staticmethod
+    def _parse_s3_uri(uri):
+        """
+        Split an s3:// or path-style https S3 URI into (bucket, key).
+        """
+        parsed = urlparse(uri)
+        if parsed.scheme == 's3':
+            return parsed.netloc, parsed.path.lstrip('/')
+        bucket, _, key = parsed.path.lstrip('/').partition('/')
+        return bucket, key
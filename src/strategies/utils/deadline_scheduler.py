@@ -0,0 +1,371 @@
+"""
+DeadlineScheduler: Runs large jobs across as many Lambda invocations as they need.
+
+A job is a source that returns batches of JSON-serializable work units for a cursor, and a process
+function applied to each unit. The scheduler processes units in parallel, watches
+context.get_remaining_time_in_millis() and stops pulling new units once the remaining time drops
+below a safety margin. It then persists a resume cursor (plus any units it did not start) to DynamoDB
+and re-invokes the function, or calls a custom continuation, to pick the job up again.
+Units are processed at least once: a batch interrupted by a crash is replayed from its checkpoint,
+and a unit whose processing raises is put back in the pending list and retried up to max_attempts times.
+
+Each invocation leases the job before working on it. Checkpoint writes are conditional on the version
+the invocation last wrote, so an async retry or an overlapping continuation cannot run the same job
+twice or overwrite another invocation's cursor: the loser stops with status SUPERSEDED.
+"""
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+from common.client.lambda_client import LambdaClient
+from common.config import get_config
+from common.logger import Logger
+from strategies.utils.dynamodb_utils import DynamoDBUtils
+import base64
+import json
+import time
+import uuid
+
+DEFAULT_SCHEDULER_WORKERS = 16
+DEFAULT_MAX_ATTEMPTS = 3
+MAX_FAILED_UNITS_KEPT = 100
+# A scan page becomes the checkpoint's pending list, which must fit in one 400 KB DynamoDB item.
+DEFAULT_SCAN_PAGE_SIZE = 100
+STATUS_RUNNING = 'RUNNING'
+STATUS_CONTINUED = 'CONTINUED'
+STATUS_COMPLETED = 'COMPLETED'
+STATUS_SUPERSEDED = 'SUPERSEDED'
+
+
+class CheckpointConflictError(Exception):
+    """
+    Raised when a checkpoint write finds that another invocation has taken over the job.
+    """
+
+
+def dumps_checkpoint_value(value, sort_keys=False):
+    """
+    Serialize a cursor or unit list to JSON, encoding bytes (e.g. binary key attributes) as base64.
+    """
+    def default(obj):
+        if isinstance(obj, (bytes, bytearray)):
+            return {'__bytes__': base64.b64encode(bytes(obj)).decode('ascii')}
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return json.dumps(value, default=default, sort_keys=sort_keys)
+
+
+def loads_checkpoint_value(text):
+    """
+    Deserialize a value written by dumps_checkpoint_value.
+    """
+    def object_hook(obj):
+        if set(obj) == {'__bytes__'}:
+            return base64.b64decode(obj['__bytes__'])
+        return obj
+    return json.loads(text, object_hook=object_hook)
+
+
+class DeadlineScheduler:
+    """
+    Deadline-aware, checkpointing work scheduler for one job.
+    """
+    def __init__(self, context, job_id, event=None, dynamodb_utils=None, checkpoint_table_name=None,
+                 safety_margin_ms=None, max_workers=DEFAULT_SCHEDULER_WORKERS,
+                 continuation=None, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """
+        Initialize the scheduler.
+        Args:
+            context: Lambda context object.
+            job_id (str): Stable identifier of the job; also the checkpoint key.
+            event (dict, optional): Event of this invocation, re-sent with job_id on continuation.
+            dynamodb_utils (DynamoDBUtils, optional): Utils used for checkpoints.
+            checkpoint_table_name (str, optional): Checkpoint table
+                (defaults to the checkpoint_table_name setting).
+            safety_margin_ms (int, optional): Stop pulling new units when less time than this remains.
+                Must exceed the longest unit plus the checkpoint write
+                (defaults to the scheduler_safety_margin_ms setting).
+            max_workers (int, optional): Maximum units processed in parallel.
+            continuation (callable, optional): Called with the continuation event instead of
+                re-invoking this function asynchronously, e.g. to re-enqueue on SQS.
+            max_attempts (int, optional): Times a unit is tried before it is counted as failed.
+        """
+        self.logger = Logger(__name__)
+        self.context = context
+        self.job_id = job_id
+        self.event = dict(event or {})
+        self.dynamodb_utils = dynamodb_utils or DynamoDBUtils()
+        config = get_config()
+        self.checkpoint_table_name = checkpoint_table_name or config.checkpoint_table_name
+        self.safety_margin_ms = config.scheduler_safety_margin_ms if safety_margin_ms is None else safety_margin_ms
+        self.max_workers = max_workers
+        self.continuation = continuation or self._reinvoke
+        self.max_attempts = max_attempts
+        # Unique per invocation attempt: async retries of one event share the Lambda request id.
+        self.owner = uuid.uuid4().hex
+        self._version = 0
+        self._lease_expires_at = 0
+
+    def time_left(self):
+        """
+        Check whether there is time to start another unit.
+        Returns:
+            bool: True if the remaining time is above the safety margin.
+        """
+        return self.context.get_remaining_time_in_millis() > self.safety_margin_ms
+
+    def load_checkpoint(self):
+        """
+        Load the job checkpoint.
+        Returns:
+            dict or None: The checkpoint item, or None if the job has not started.
+        """
+        response = self.dynamodb_utils.fetch_item_by_key(self.checkpoint_table_name, {'job_id': self.job_id})
+        return response.get('Item')
+
+    def save_checkpoint(self, status, cursor, pending, started, processed, failed, invocations,
+                        attempts=None, failed_units=None):
+        """
+        Persist the job checkpoint, conditional on the version this invocation last read or wrote.
+        RUNNING checkpoints hold the lease until this invocation's deadline; CONTINUED and COMPLETED
+        checkpoints release it.
+        Args:
+            status (str): RUNNING, CONTINUED or COMPLETED.
+            cursor: Source cursor for the next batch (JSON-serializable) or None.
+            pending (list): Units not yet processed: unstarted units of the current batch and units to retry.
+            started (bool): Whether the first batch has been fetched, so a None cursor means done.
+            processed (int): Units processed so far.
+            failed (int): Units that failed max_attempts times so far.
+            invocations (int): Invocations that have worked on the job.
+            attempts (dict, optional): Failed attempts so far of units awaiting retry, by unit JSON.
+            failed_units (list, optional): Units that failed max_attempts times (the first 100 are kept).
+        Raises:
+            CheckpointConflictError: If another invocation has written the checkpoint since.
+        """
+        leased = status == STATUS_RUNNING
+        item = {
+            'job_id': self.job_id,
+            'status': status,
+            'cursor': dumps_checkpoint_value(cursor),
+            'pending': dumps_checkpoint_value(pending),
+            'attempts': json.dumps(attempts or {}),
+            'failed_units': dumps_checkpoint_value(failed_units or []),
+            'started': started,
+            'processed': processed,
+            'failed': failed,
+            'invocations': invocations,
+            'version': self._version + 1,
+            'owner': self.owner if leased else None,
+            'lease_expires_at': self._lease_expires_at if leased else 0,
+            'updated_at': datetime.now(timezone.utc).isoformat(),
+        }
+        try:
+            self.dynamodb_utils.save_item(self.checkpoint_table_name, item,
+                                          'attribute_not_exists(version) OR version = :version',
+                                          {':version': self._version})
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                raise CheckpointConflictError(f"Job {self.job_id} was taken over by another invocation") from e
+            raise
+        self._version += 1
+
+    def run(self, source, process):
+        """
+        Run (or resume) the job until it completes or the deadline approaches.
+        Args:
+            source (callable): source(cursor) -> (units, next_cursor); cursor None is the first batch,
+                next_cursor None means no batches remain. Units and cursors must be JSON-serializable
+                (bytes are allowed).
+            process (callable): process(unit), called in worker threads.
+        Returns:
+            dict: {'job_id', 'status', 'processed', 'failed', 'invocations'}; status is SUPERSEDED
+                if another invocation holds or took over the job.
+        """
+        checkpoint = self.load_checkpoint() or {}
+        if checkpoint.get('status') == STATUS_COMPLETED:
+            self.logger.info(f"Job {self.job_id} already completed")
+            return self._result(checkpoint['status'], checkpoint)
+        if checkpoint.get('owner') and int(checkpoint.get('lease_expires_at', 0)) > time.time() * 1000:
+            self.logger.info(f"Job {self.job_id} is leased by another invocation")
+            return self._result(STATUS_SUPERSEDED, checkpoint)
+        self._version = int(checkpoint.get('version', 0))
+        self._lease_expires_at = int(time.time() * 1000) + self.context.get_remaining_time_in_millis()
+        cursor = loads_checkpoint_value(checkpoint.get('cursor', 'null'))
+        pending = loads_checkpoint_value(checkpoint.get('pending', '[]'))
+        state = {
+            'processed': int(checkpoint.get('processed', 0)),
+            'failed': int(checkpoint.get('failed', 0)),
+            'invocations': int(checkpoint.get('invocations', 0)) + 1,
+            'started': bool(checkpoint.get('started', False)),
+            'attempts': json.loads(checkpoint.get('attempts', '{}')),
+            'failed_units': loads_checkpoint_value(checkpoint.get('failed_units', '[]')),
+        }
+        self.logger.info(f"Running job {self.job_id}, invocation {state['invocations']}")
+        try:
+            self.save_checkpoint(STATUS_RUNNING, cursor, pending, **state)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                while True:
+                    if not pending:
+                        if state['started'] and cursor is None:
+                            self.save_checkpoint(STATUS_COMPLETED, None, [], **state)
+                            self.logger.info(f"Job {self.job_id} completed: {state['processed']} units")
+                            return self._result(STATUS_COMPLETED, state)
+                        if not self.time_left():
+                            break
+                        pending, cursor = source(cursor)
+                        state['started'] = True
+                    unstarted, retries = self._process_batch(executor, pending, process, state)
+                    pending = unstarted + retries
+                    self.save_checkpoint(STATUS_RUNNING, cursor, pending, **state)
+                    if unstarted or (retries and not self.time_left()):
+                        break
+            self.save_checkpoint(STATUS_CONTINUED, cursor, pending, **state)
+        except CheckpointConflictError as e:
+            self.logger.error(f"Stopping job {self.job_id}: {e}")
+            return self._result(STATUS_SUPERSEDED, state)
+        self.logger.info(f"Job {self.job_id} continuing after {state['processed']} units")
+        self.continuation(dict(self.event, job_id=self.job_id))
+        return self._result(STATUS_CONTINUED, state)
+
+    def update_items_by_attribute(self, table_name, attribute_name, attribute_value, update_expression,
+                                  expression_values):
+        """
+        Run DynamoDBUtils.update_items_by_attribute as a scheduled job: matching items are found page by
+        page with a scan and updated in parallel, across as many invocations as needed.
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            attribute_name (str): The attribute to filter by.
+            attribute_value: The value to match.
+            update_expression (str): The update expression.
+            expression_values (dict): Values for the update expression.
+        Returns:
+            dict: The run result.
+        """
+        self.logger.info(f"Scheduling update of {table_name} items where {attribute_name} = {attribute_value}")
+        source = dynamodb_scan_source(self.dynamodb_utils, table_name, Attr(attribute_name).eq(attribute_value))
+        return self.run(source, lambda key: self.dynamodb_utils.update_item_attributes(
+            table_name, self.dynamodb_utils.deserialize_item(key), update_expression, expression_values))
+
+    def remove_items_by_attribute(self, table_name, attribute_name, attribute_value):
+        """
+        Run DynamoDBUtils.remove_items_by_attribute as a scheduled job: matching items are found page by
+        page with a scan and deleted in parallel, across as many invocations as needed.
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            attribute_name (str): The attribute to filter by.
+            attribute_value: The value to match.
+        Returns:
+            dict: The run result.
+        """
+        self.logger.info(f"Scheduling removal of {table_name} items where {attribute_name} = {attribute_value}")
+        source = dynamodb_scan_source(self.dynamodb_utils, table_name, Attr(attribute_name).eq(attribute_value))
+        return self.run(source, lambda key: self.dynamodb_utils.remove_item_by_key(
+            table_name, self.dynamodb_utils.deserialize_item(key)))
+
+    def _process_batch(self, executor, units, process, state):
+        """
+        Process units in parallel while time allows.
+        Returns:
+            tuple: (units that were not started, failed units to retry).
+        """
+        futures = {}
+        retries = []
+        index = 0
+        while index < len(units) and self.time_left():
+            if len(futures) >= self.max_workers:
+                done, _ = wait(futures, return_when='FIRST_COMPLETED')
+                self._collect(futures, done, state, retries)
+                continue
+            futures[executor.submit(process, units[index])] = units[index]
+            index += 1
+        self._collect(futures, wait(futures).done, state, retries)
+        return units[index:], retries
+
+    def _collect(self, futures, done, state, retries):
+        for future in done:
+            unit = futures.pop(future)
+            unit_id = dumps_checkpoint_value(unit, sort_keys=True)
+            error = future.exception()
+            if error is None:
+                state['processed'] += 1
+                state['attempts'].pop(unit_id, None)
+                continue
+            attempts = state['attempts'].pop(unit_id, 0) + 1
+            if attempts < self.max_attempts:
+                self.logger.error(f"Error processing unit {unit} (attempt {attempts}), will retry: {error}")
+                state['attempts'][unit_id] = attempts
+                retries.append(unit)
+            else:
+                self.logger.error(f"Error processing unit {unit}, giving up after {attempts} attempts: {error}")
+                state['failed'] += 1
+                if len(state['failed_units']) < MAX_FAILED_UNITS_KEPT:
+                    state['failed_units'].append(unit)
+
+    def _reinvoke(self, event):
+        LambdaClient().invoke_async(self.context.invoked_function_arn, event)
+
+    def _result(self, status, state):
+        return {
+            'job_id': self.job_id,
+            'status': status,
+            'processed': int(state.get('processed', 0)),
+            'failed': int(state.get('failed', 0)),
+            'invocations': int(state.get('invocations', 0)),
+        }
+
+
+def dynamodb_scan_source(dynamodb_utils, table_name, filter_expression=None, expression_values=None,
+                         page_size=DEFAULT_SCAN_PAGE_SIZE):
+    """
+    Build a source that scans a table page by page and yields the primary keys of matching items.
+    Keys and cursors are in attribute-value form so they survive the JSON checkpoint unchanged;
+    pass them through dynamodb_utils.deserialize_item in the process function.
+    Args:
+        dynamodb_utils (DynamoDBUtils): Utils whose low-level client performs the scan.
+        table_name (str): The name of the DynamoDB table.
+        filter_expression: Filter expression (str or boto3 condition object), optional.
+        expression_values (dict, optional): Values for string expression placeholders.
+        page_size (int, optional): Items evaluated per scan page (default 100). Each page is stored in the
+            checkpoint until processed, so keep it small enough for the 400 KB item limit.
+    Returns:
+        callable: source(cursor) -> (keys, next_cursor).
+    """
+    key_attributes = dynamodb_utils.get_key_attributes(table_name)
+
+    def source(cursor):
+        kwargs = {'TableName': table_name}
+        kwargs.update(dynamodb_utils._build_expression_kwargs(
+            filter_expression=filter_expression, expression_values=expression_values))
+        if page_size:
+            kwargs['Limit'] = page_size
+        if cursor:
+            kwargs['ExclusiveStartKey'] = dynamodb_utils.decode_cursor(cursor)
+        response = dynamodb_utils.client.scan(**kwargs)
+        keys = [{name: item[name] for name in key_attributes} for item in response.get('Items', [])]
+        last_key = response.get('LastEvaluatedKey')
+        return keys, dynamodb_utils.encode_cursor(last_key) if last_key else None
+
+    return source
+
+
+def s3_prefix_source(s3_utils, bucket, prefix=None, page_size=1000):
+    """
+    Build a source that lists every object under a prefix, one list_objects_v2 page per batch.
+    Args:
+        s3_utils (S3Utils): Utils whose client performs the listing.
+        bucket (str): The name of the S3 bucket.
+        prefix (str, optional): Prefix to filter objects.
+        page_size (int, optional): Keys per page.
+    Returns:
+        callable: source(cursor) -> (object keys, next_cursor).
+    """
+    def source(cursor):
+        kwargs = {'Bucket': bucket, 'MaxKeys': page_size}
+        if prefix:
+            kwargs['Prefix'] = prefix
+        if cursor:
+            kwargs['ContinuationToken'] = cursor
+        response = s3_utils.s3.list_objects_v2(**kwargs)
+        keys = [obj['Key'] for obj in response.get('Contents', [])]
+        return keys, response.get('NextContinuationToken') if response.get('IsTruncated') else None
+
+    return source
@@ -0,0 +1,376 @@
+"""
+DynamoDBBatchSession: Collects DynamoDB gets, puts and deletes across tables and flushes them together.
+
+Operations queued on a session are packed into the fewest batch_get_item/batch_write_item requests
+allowed by the DynamoDB limits (100 keys per get, 25 requests and 16 MB per write), sent concurrently,
+and the results and unprocessed entries are mapped back to the future returned for each operation.
+WriteBehindBuffer builds on a session to defer single-item writes until a size or age threshold.
+Sessions and buffers are thread-safe: queueing and the hand-off to a flush happen under a lock.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from common.logger import Logger
+import threading
+import time
+
+MAX_BATCH_GET_KEYS = 100
+MAX_BATCH_WRITE_ITEMS = 25
+MAX_BATCH_WRITE_BYTES = 16 * 1024 * 1024
+DEFAULT_BATCH_WORKERS = 8
+DEFAULT_WRITE_BEHIND_ITEMS = 100
+DEFAULT_WRITE_BEHIND_SECONDS = 1.0
+
+
+def attribute_identity(value):
+    """
+    Build a hashable identity for a serialized attribute value or item.
+    Binary values stay bytes, so B/BS attributes are supported.
+    Args:
+        value: An attribute-value dict, a serialized item, or a part of one.
+    Returns:
+        A hashable value; equal inputs give equal identities.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((name, attribute_identity(member)) for name, member in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(attribute_identity(member) for member in value)
+    if isinstance(value, bytearray):
+        return bytes(value)
+    return value
+
+
+def estimated_size(value):
+    """
+    Estimate the request size of a serialized attribute value or write request in bytes.
+    Names and string, number and binary values count their encoded length, as DynamoDB sizes items.
+    """
+    if isinstance(value, dict):
+        return sum(len(name.encode('utf-8')) + estimated_size(member) for name, member in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sum(estimated_size(member) for member in value)
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return 1
+
+
+class DynamoDBBatchSession:
+    """
+    Cross-table batch session bound to a DynamoDBUtils instance.
+    Each get/put/delete returns a concurrent.futures.Future that resolves when the session is flushed:
+    gets resolve to the item (or None if it does not exist), writes resolve to None. Entries still
+    unprocessed after retries, or whose request failed, resolve with an exception instead.
+    """
+    def __init__(self, dynamodb_utils, max_workers=DEFAULT_BATCH_WORKERS, raw=False):
+        """
+        Initialize the batch session.
+        Args:
+            dynamodb_utils (DynamoDBUtils): Utils instance whose low-level client sends the requests.
+            max_workers (int, optional): Maximum number of batch requests in flight.
+            raw (bool, optional): Resolve gets to raw attribute-value dicts.
+        """
+        self.logger = Logger(__name__)
+        self.dynamodb_utils = dynamodb_utils
+        self.max_workers = max_workers
+        self.raw = raw
+        self._gets = {}
+        self._writes = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        return False
+
+    def get(self, table_name, key):
+        """
+        Queue a get. Duplicate keys share a single request entry.
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            key (dict): The primary key of the item to fetch.
+        Returns:
+            Future: Resolves to the item, or None if it does not exist.
+        """
+        serialized_key = self.dynamodb_utils.serialize_item(key)
+        identity = (table_name, self._identity(serialized_key, key.keys()))
+        future = Future()
+        with self._lock:
+            entry = self._gets.setdefault(identity, {'key': serialized_key, 'futures': []})
+            entry['futures'].append(future)
+        return future
+
+    def put(self, table_name, item):
+        """
+        Queue a put. A later put or delete of the same key replaces it.
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            item (dict): The item to save.
+        Returns:
+            Future: Resolves to None once the write is applied.
+        """
+        serialized_item = self.dynamodb_utils.serialize_item(item)
+        key_attributes = self.dynamodb_utils.get_key_attributes(table_name)
+        return self._queue_write(table_name, self._identity(serialized_item, key_attributes),
+                                 {'PutRequest': {'Item': serialized_item}})
+
+    def delete(self, table_name, key):
+        """
+        Queue a delete. A later put or delete of the same key replaces it.
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            key (dict): The primary key of the item to delete.
+        Returns:
+            Future: Resolves to None once the write is applied.
+        """
+        serialized_key = self.dynamodb_utils.serialize_item(key)
+        return self._queue_write(table_name, self._identity(serialized_key, key.keys()),
+                                 {'DeleteRequest': {'Key': serialized_key}})
+
+    def pending_count(self):
+        """
+        Count the queued operations, after duplicate collapsing.
+        Returns:
+            int: Number of distinct gets and writes waiting for flush.
+        """
+        with self._lock:
+            return len(self._gets) + len(self._writes)
+
+    def flush(self):
+        """
+        Send all queued operations and resolve their futures.
+        Returns:
+            dict: Per-table 'UnprocessedKeys' and 'UnprocessedItems' left after retries, and
+                'FailedWrites' as (table name, write request, exception) for every write not applied.
+        """
+        with self._lock:
+            gets, writes = self._gets, self._writes
+            self._gets, self._writes = {}, {}
+        get_batches = self._pack_gets(gets)
+        write_batches = self._pack_writes(writes)
+        self.logger.info(f"Flushing batch session: {len(gets)} gets in {len(get_batches)} requests, "
+                         f"{len(writes)} writes in {len(write_batches)} requests")
+        summary = {'UnprocessedKeys': {}, 'UnprocessedItems': {}, 'FailedWrites': []}
+        if not get_batches and not write_batches:
+            return summary
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            get_futures = [(batch, executor.submit(self.dynamodb_utils._send_batch_get, self._get_request(batch)))
+                           for batch in get_batches]
+            write_futures = [(batch, executor.submit(self.dynamodb_utils._send_batch_write, self._write_request(batch)))
+                             for batch in write_batches]
+            for batch, request_future in get_futures:
+                self._resolve_gets(batch, request_future, summary['UnprocessedKeys'])
+            for batch, request_future in write_futures:
+                self._resolve_writes(batch, request_future, summary)
+        return summary
+
+    def _queue_write(self, table_name, key_identity, request):
+        """
+        Queue a write request, collapsing it with any earlier write to the same key.
+        """
+        identity = (table_name, key_identity)
+        future = Future()
+        size = estimated_size(request)
+        with self._lock:
+            entry = self._writes.pop(identity, {'futures': []})
+            entry['request'] = request
+            entry['size'] = size
+            entry['futures'].append(future)
+            # Re-insert so the entry is ordered by its latest write.
+            self._writes[identity] = entry
+        return future
+
+    @staticmethod
+    def _identity(serialized, key_attributes):
+        return tuple(sorted((name, attribute_identity(serialized[name])) for name in key_attributes))
+
+    @staticmethod
+    def _pack_gets(gets):
+        entries = list(gets.items())
+        return [entries[start:start + MAX_BATCH_GET_KEYS] for start in range(0, len(entries), MAX_BATCH_GET_KEYS)]
+
+    @staticmethod
+    def _pack_writes(writes):
+        batches, batch, batch_size = [], [], 0
+        for identity, entry in writes.items():
+            if batch and (len(batch) == MAX_BATCH_WRITE_ITEMS or batch_size + entry['size'] > MAX_BATCH_WRITE_BYTES):
+                batches.append(batch)
+                batch, batch_size = [], 0
+            batch.append((identity, entry))
+            batch_size += entry['size']
+        if batch:
+            batches.append(batch)
+        return batches
+
+    @staticmethod
+    def _get_request(batch):
+        request_items = {}
+        for (table_name, _), entry in batch:
+            request_items.setdefault(table_name, {'Keys': []})['Keys'].append(entry['key'])
+        return request_items
+
+    @staticmethod
+    def _write_request(batch):
+        request_items = {}
+        for (table_name, _), entry in batch:
+            request_items.setdefault(table_name, []).append(entry['request'])
+        return request_items
+
+    def _resolve_gets(self, batch, request_future, unprocessed_summary):
+        try:
+            responses, unprocessed = request_future.result()
+        except Exception as e:
+            self.logger.error(f"Error in batch get: {e}")
+            for _, entry in batch:
+                for future in entry['futures']:
+                    future.set_exception(e)
+            return
+        key_attributes = {table_name: entry['key'].keys() for (table_name, _), entry in batch}
+        found = {}
+        for table_name, items in responses.items():
+            for item in items:
+                found[(table_name, self._identity(item, key_attributes[table_name]))] = item
+        unprocessed_identities = set()
+        for table_name, request in unprocessed.items():
+            unprocessed_summary.setdefault(table_name, {'Keys': []})['Keys'].extend(request['Keys'])
+            for key in request['Keys']:
+                unprocessed_identities.add((table_name, self._identity(key, key.keys())))
+        for identity, entry in batch:
+            if identity in unprocessed_identities:
+                error = RuntimeError(f"Key unprocessed in {identity[0]} after retries")
+                for future in entry['futures']:
+                    future.set_exception(error)
+                continue
+            item = found.get(identity)
+            if item is not None and not self.raw:
+                item = self.dynamodb_utils.deserialize_item(item)
+            for future in entry['futures']:
+                future.set_result(item)
+
+    def _resolve_writes(self, batch, request_future, summary):
+        try:
+            unprocessed = request_future.result()
+        except Exception as e:
+            self.logger.error(f"Error in batch write: {e}")
+            for (table_name, _), entry in batch:
+                summary['FailedWrites'].append((table_name, entry['request'], e))
+                for future in entry['futures']:
+                    future.set_exception(e)
+            return
+        unprocessed_requests = set()
+        for table_name, requests in unprocessed.items():
+            summary['UnprocessedItems'].setdefault(table_name, []).extend(requests)
+            for request in requests:
+                unprocessed_requests.add((table_name, attribute_identity(request)))
+        for (table_name, _), entry in batch:
+            if (table_name, attribute_identity(entry['request'])) in unprocessed_requests:
+                error = RuntimeError(f"Write unprocessed in {table_name} after retries")
+                summary['FailedWrites'].append((table_name, entry['request'], error))
+                for future in entry['futures']:
+                    future.set_exception(error)
+                continue
+            for future in entry['futures']:
+                future.set_result(None)
+
+
+class WriteBehindFlushError(Exception):
+    """
+    Raised when a write-behind flush leaves buffered writes unapplied.
+    The failures attribute lists (table name, write request, exception) for every failed write.
+    """
+    def __init__(self, failures):
+        self.failures = failures
+        tables = sorted({table_name for table_name, _, _ in failures})
+        super().__init__(f"{len(failures)} buffered writes failed to flush in {', '.join(tables)}: {failures[0][2]}")
+
+
+class WriteBehindBuffer:
+    """
+    Buffers unconditional puts and deletes in a batch session and flushes them when a size or age
+    threshold is reached, or when flush() is called at the end of the invocation.
+    Repeated writes to the same key collapse to the last one. Thresholds are checked on each write;
+    nothing flushes a partial batch in the background, so the owner must call flush() when done.
+    """
+    def __init__(self, dynamodb_utils, max_items=DEFAULT_WRITE_BEHIND_ITEMS,
+                 max_age_seconds=DEFAULT_WRITE_BEHIND_SECONDS, max_workers=DEFAULT_BATCH_WORKERS,
+                 table_names=None):
+        """
+        Initialize the write-behind buffer.
+        Args:
+            dynamodb_utils (DynamoDBUtils): Utils instance whose low-level client sends the requests.
+            max_items (int, optional): Flush once this many distinct keys are buffered.
+            max_age_seconds (float, optional): Flush once the oldest buffered write is this old.
+            max_workers (int, optional): Maximum number of batch requests in flight during a flush.
+            table_names (iterable, optional): Only buffer writes to these tables (default: every table).
+        """
+        self.logger = Logger(__name__)
+        self.session = DynamoDBBatchSession(dynamodb_utils, max_workers=max_workers)
+        self.max_items = max_items
+        self.max_age_seconds = max_age_seconds
+        self.table_names = frozenset(table_names) if table_names is not None else None
+        self._first_write_at = None
+        self._lock = threading.Lock()
+
+    def buffers(self, table_name):
+        """
+        Check whether writes to a table are buffered.
+        Returns:
+            bool: True if the table is in scope.
+        """
+        return self.table_names is None or table_name in self.table_names
+
+    def put(self, table_name, item):
+        """
+        Buffer a put, flushing if a threshold is reached.
+        Returns:
+            Future: Resolves to None once the write is applied.
+        Raises:
+            WriteBehindFlushError: If a threshold flush fails.
+        """
+        return self._buffer(self.session.put(table_name, item))
+
+    def delete(self, table_name, key):
+        """
+        Buffer a delete, flushing if a threshold is reached.
+        Returns:
+            Future: Resolves to None once the write is applied.
+        Raises:
+            WriteBehindFlushError: If a threshold flush fails.
+        """
+        return self._buffer(self.session.delete(table_name, key))
+
+    def pending_count(self):
+        """
+        Count the buffered writes, after collapsing repeated keys.
+        Returns:
+            int: Number of distinct keys waiting for flush.
+        """
+        return self.session.pending_count()
+
+    def flush(self):
+        """
+        Send every buffered write through batched, parallel batch_write_item calls.
+        Raises:
+            WriteBehindFlushError: If any buffered write was not applied.
+        """
+        with self._lock:
+            self._first_write_at = None
+        if not self.session.pending_count():
+            return
+        self.logger.info(f"Flushing {self.session.pending_count()} buffered writes")
+        failures = self.session.flush()['FailedWrites']
+        if failures:
+            self.logger.error(f"Write-behind flush failed for {len(failures)} writes")
+            raise WriteBehindFlushError(failures)
+
+    def _buffer(self, future):
+        with self._lock:
+            if self._first_write_at is None:
+                self._first_write_at = time.monotonic()
+            due = (self.session.pending_count() >= self.max_items
+                   or time.monotonic() - self._first_write_at >= self.max_age_seconds)
+        if due:
+            self.flush()
+        return future
@@ -0,0 +1,93 @@
+"""
+DynamoDB materialized counters: named counts of items matching a predicate, kept in a counter table.
+
+DynamoDBUtils keeps registered counters up to date with atomic ADD updates on its put, delete and
+bulk write paths, so reading a count is one small batch get instead of a table scan.
+Each counter can be split over several shard items to spread write traffic across partition keys.
+"""
+import random
+
+COUNTER_KEY_ATTRIBUTE = 'counter_id'
+COUNTER_VALUE_ATTRIBUTE = 'item_count'
+
+
+class CounterUpdateError(Exception):
+    """
+    Raised after a data write succeeded but one or more counter ADD updates failed.
+    The failures attribute lists (counter name, delta, exception); rebuild_counter repairs the counts.
+    """
+    def __init__(self, table_name, failures):
+        self.table_name = table_name
+        self.failures = failures
+        names = ', '.join(counter_name for counter_name, _, _ in failures)
+        super().__init__(f"Counter updates failed on {table_name} for {names}: {failures[0][2]}")
+
+
+class CounterDefinition:
+    """
+    A named counter over one table, counting the items for which the predicate returns True.
+    """
+    def __init__(self, table_name, counter_name, predicate, shards=1):
+        """
+        Initialize the counter definition.
+        Args:
+            table_name (str): The name of the counted DynamoDB table.
+            counter_name (str): The counter name, unique per table.
+            predicate (callable): Called with a deserialized item; returns True if the item is counted.
+            shards (int, optional): Number of counter items the count is spread across.
+        Raises:
+            ValueError: If shards is less than 1.
+        """
+        if shards < 1:
+            raise ValueError(f"Counter shards must be at least 1, got {shards}")
+        self.table_name = table_name
+        self.counter_name = counter_name
+        self.predicate = predicate
+        self.shards = shards
+
+    def matches(self, item):
+        """
+        Check whether an item is counted. A missing item (None) is never counted.
+        Args:
+            item (dict or None): The deserialized item.
+        Returns:
+            int: 1 if counted, 0 otherwise.
+        """
+        return 1 if item is not None and self.predicate(item) else 0
+
+    def delta(self, old_item, new_item):
+        """
+        Compute the count change for an item going from old_item to new_item.
+        Args:
+            old_item (dict or None): The item before the write.
+            new_item (dict or None): The item after the write.
+        Returns:
+            int: -1, 0 or 1.
+        """
+        return self.matches(new_item) - self.matches(old_item)
+
+    def shard_key(self, shard):
+        """
+        Build the counter table key for a shard.
+        Args:
+            shard (int): The shard number.
+        Returns:
+            dict: The counter table key.
+        """
+        return {COUNTER_KEY_ATTRIBUTE: f"{self.table_name}#{self.counter_name}#{shard}"}
+
+    def shard_keys(self):
+        """
+        Build the counter table keys for every shard.
+        Returns:
+            list: Counter table keys.
+        """
+        return [self.shard_key(shard) for shard in range(self.shards)]
+
+    def random_shard_key(self):
+        """
+        Pick a shard key at random for an update.
+        Returns:
+            dict: The counter table key.
+        """
+        return self.shard_key(random.randrange(self.shards))  # nosec B311 - load spreading, not security
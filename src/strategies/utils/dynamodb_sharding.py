@@ -0,0 +1,187 @@
+"""
+DynamoDB write sharding: spread a hot partition key value over several physical partition keys.
+
+A sharded key attribute is stored as "<value>#<shard>". Writes pick the shard at random, or with a
+shard function computed from the item, so one logical value (a day, a queue) is written across
+several partitions. Reads, queries and counts address the logical value; DynamoDBUtils scatters them
+over every shard in parallel, merges the results and strips the suffix again.
+
+With a computed shard function, keyed operations (get, update, delete) go straight to one shard.
+The function must then only use key attributes, because it is also called with bare keys.
+With random sharding they first locate the item across the shards, and so do puts when the sharded
+attribute is part of the primary key, so an overwrite replaces the stored item instead of adding a
+copy on another shard. Two concurrent first writes of the same new key can still land on different
+shards; use a shard function when that matters.
+"""
+import random
+import re
+import zlib
+from boto3.dynamodb.conditions import AttributeBase, ConditionBase, Equals, Key
+
+SHARD_SEPARATOR = '#'
+
+
+def stable_shard_function(*attribute_names):
+    """
+    Build a shard function that hashes the given attributes with CRC32.
+    Python's hash() is salted per process, so it cannot be used for shard routing.
+    Args:
+        *attribute_names (str): Attributes (normally the sort key) that select the shard.
+    Returns:
+        callable: shard_function(item) -> int.
+    """
+    def shard_function(item):
+        return zlib.crc32('\x1f'.join(str(item[name]) for name in attribute_names).encode('utf-8'))
+    return shard_function
+
+
+class ShardedKeyDefinition:
+    """
+    A key attribute of one table whose values are spread over a fixed number of shards.
+    """
+    def __init__(self, table_name, attribute_name, shards, shard_function=None):
+        """
+        Initialize the sharded key definition.
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            attribute_name (str): The partition key attribute of the table (or of a GSI) to shard.
+            shards (int): Number of shards each value is spread across.
+            shard_function (callable, optional): Called with an item or key (logical values); returns
+                an int mapped onto a shard. Shards are picked at random when omitted.
+        Raises:
+            ValueError: If shards is less than 1.
+        """
+        if shards < 1:
+            raise ValueError(f"Key shards must be at least 1, got {shards}")
+        self.table_name = table_name
+        self.attribute_name = attribute_name
+        self.shards = shards
+        self.shard_function = shard_function
+
+    @property
+    def computed(self):
+        """
+        bool: True if shards are computed from the item rather than picked at random.
+        """
+        return self.shard_function is not None
+
+    def shard_for(self, item):
+        """
+        Pick the shard for an item or key.
+        Args:
+            item (dict): The item or key, with logical values.
+        Returns:
+            int: The shard number.
+        """
+        if self.computed:
+            return self.shard_function(item) % self.shards
+        return random.randrange(self.shards)  # nosec B311 - load spreading, not security
+
+    def shard_value(self, value, shard):
+        """
+        Build the stored value of a logical value on a shard.
+        Raises:
+            ValueError: If the value is not a string.
+        """
+        if not isinstance(value, str):
+            raise ValueError(f"Sharded key {self.attribute_name} must be a string, got {type(value).__name__}")
+        return f"{value}{SHARD_SEPARATOR}{shard}"
+
+    def shard_item(self, item, shard=None):
+        """
+        Return a copy of an item or key with the sharded attribute suffixed.
+        Args:
+            item (dict): The item or key, with logical values.
+            shard (int, optional): The shard to use; picked with shard_for when omitted.
+        Returns:
+            dict: The item as stored.
+        """
+        if self.attribute_name not in item:
+            return item
+        shard = self.shard_for(item) if shard is None else shard
+        return dict(item, **{self.attribute_name: self.shard_value(item[self.attribute_name], shard)})
+
+    def all_shard_items(self, key):
+        """
+        Build the stored key on every shard.
+        Args:
+            key (dict): The key, with logical values.
+        Returns:
+            list: One key per shard.
+        """
+        return [self.shard_item(key, shard) for shard in range(self.shards)]
+
+    def unshard_item(self, item):
+        """
+        Return a copy of a stored item with the shard suffix removed; works on raw attribute values too.
+        """
+        value = item.get(self.attribute_name) if item else None
+        if isinstance(value, dict) and 'S' in value:
+            return dict(item, **{self.attribute_name: {'S': value['S'].rsplit(SHARD_SEPARATOR, 1)[0]}})
+        if isinstance(value, str):
+            return dict(item, **{self.attribute_name: value.rsplit(SHARD_SEPARATOR, 1)[0]})
+        return item
+
+    def shard_key_conditions(self, key_condition_expression, expression_values=None):
+        """
+        Rewrite a key condition with an equality on the sharded attribute into one condition per shard.
+        Args:
+            key_condition_expression: Key condition (str or boto3 condition object).
+            expression_values (dict, optional): Values for string expression placeholders.
+        Returns:
+            list or None: (key condition, expression values) per shard, or None if the condition does
+                not test the sharded attribute for equality.
+        Raises:
+            ValueError: If a string condition tests a '#name' placeholder for equality, which cannot be
+                resolved without expression attribute names.
+        """
+        if isinstance(key_condition_expression, str):
+            match = re.search(rf"(?<![\w#:.]){re.escape(self.attribute_name)}\s*=\s*(:\w+)", key_condition_expression)
+            if not match and re.search(r"#\w+\s*=\s*:\w+", key_condition_expression):
+                raise ValueError(f"Cannot tell whether {key_condition_expression!r} tests sharded key "
+                                 f"{self.attribute_name}; use the attribute name or a boto3 condition object")
+            if not match or match.group(1) not in (expression_values or {}):
+                return None
+            placeholder = match.group(1)
+            return [(key_condition_expression,
+                     dict(expression_values, **{placeholder: self.shard_value(expression_values[placeholder], shard)}))
+                    for shard in range(self.shards)]
+        if not self._tests_attribute(key_condition_expression):
+            return None
+        return [(self._rewrite_condition(key_condition_expression, shard), expression_values)
+                for shard in range(self.shards)]
+
+    def references_attribute(self, condition):
+        """
+        Check whether a filter or condition expression refers to the sharded attribute, whose stored
+        values carry the shard suffix.
+        Args:
+            condition: Expression (str or boto3 condition object), or None.
+        Returns:
+            bool: True if the sharded attribute (or a '#name' placeholder, which may stand for it) is used.
+        """
+        if isinstance(condition, str):
+            return bool(re.search(rf"(?<![\w:.]){re.escape(self.attribute_name)}(?!\w)|#\w+", condition))
+        if isinstance(condition, AttributeBase):
+            return condition.name == self.attribute_name
+        return isinstance(condition, ConditionBase) and any(
+            self.references_attribute(value) for value in condition.get_expression()['values'])
+
+    def _is_equality(self, condition):
+        if not isinstance(condition, Equals):
+            return False
+        operand = condition.get_expression()['values'][0]
+        return isinstance(operand, Key) and operand.name == self.attribute_name
+
+    def _tests_attribute(self, condition):
+        if self._is_equality(condition):
+            return True
+        return isinstance(condition, ConditionBase) and any(
+            self._tests_attribute(value) for value in condition.get_expression()['values'])
+
+    def _rewrite_condition(self, condition, shard):
+        values = condition.get_expression()['values']
+        if self._is_equality(condition):
+            return Equals(values[0], self.shard_value(values[1], shard))
+        return type(condition)(*[self._rewrite_condition(value, shard) if isinstance(value, ConditionBase) else value
+                                 for value in values])
@@ -5,35 +5,80 @@ This class provides high-level, descriptive methods for common and advanced Dyna
 including single and batch CRUD, attribute-based queries, existence checks, and more.
 All methods include logging and error handling for robust production use.
 """
-from client.dynamodb_client import DynamoDBClient
+from common.client.dynamodb_client import DynamoDBClient
+from common.config import get_config
 from common.logger import Logger
-import os
+from strategies.utils.dynamodb_batch_session import (
+    DynamoDBBatchSession, WriteBehindBuffer, attribute_identity, DEFAULT_BATCH_WORKERS,
+    DEFAULT_WRITE_BEHIND_ITEMS, DEFAULT_WRITE_BEHIND_SECONDS, MAX_BATCH_GET_KEYS, MAX_BATCH_WRITE_ITEMS,
+)
+from strategies.utils.dynamodb_counters import CounterDefinition, CounterUpdateError, COUNTER_VALUE_ATTRIBUTE
+from strategies.utils.dynamodb_sharding import ShardedKeyDefinition
+from boto3.dynamodb.conditions import ConditionExpressionBuilder
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import base64
+import json
+import threading
+import time
+
+MAX_UNPROCESSED_RETRIES = 5
 
 class DynamoDBUtils(DynamoDBClient):
     """
     Utility class for DynamoDB operations with descriptive, robust methods.
     Inherits from DynamoDBClient and adds logging, error handling, and high-level helpers.
     """
-    def __init__(self):
+    def __init__(self, use_low_level_client=False, counter_table_name=None):
         """
         Initialize the DynamoDBUtils class with region and logger.
+        Args:
+            use_low_level_client (bool, optional): Route the hot get/put/query/batch paths through the
+                low-level client instead of the resource layer.
+            counter_table_name (str, optional): Table holding materialized counters
+                (defaults to the counter_table_name setting).
         """
-        super().__init__(region_name=os.environ.get('AWS_REGION', 'us-east-1'))
+        config = get_config()
+        super().__init__(region_name=config.aws_region)
         self.logger = Logger(__name__)
+        self.use_low_level_client = use_low_level_client
+        self.counter_table_name = counter_table_name or config.counter_table_name
+        self._counters = {}
+        self._write_behind_state = threading.local()
+        self._sharded_keys = {}
+
+    @property
+    def _write_behind(self):
+        # Write-behind is per thread: concurrent write_behind() blocks on a shared utils instance each
+        # get their own buffer, and threads that did not enable it write straight through.
+        return getattr(self._write_behind_state, 'buffer', None)
+
+    @_write_behind.setter
+    def _write_behind(self, buffer):
+        self._write_behind_state.buffer = buffer
 
-    def fetch_item_by_key(self, table_name, key):
+    def fetch_item_by_key(self, table_name, key, raw=False):
         """
         Fetch a single item from a DynamoDB table by its key.
         Args:
             table_name (str): The name of the DynamoDB table.
             key (dict): The primary key of the item to fetch.
+            raw (bool, optional): Return the item as raw attribute-value dicts (low-level client only).
         Returns:
             dict: The response from DynamoDB get_item.
         Raises:
             Exception: If the operation fails.
         """
         self.logger.info(f"Fetching item from {table_name} with key {key}")
+        sharded_key = self._sharded_keys.get(table_name)
+        if sharded_key and sharded_key.attribute_name in key:
+            return self._fetch_sharded_item(sharded_key, key, raw)
         try:
+            if self.use_low_level_client or raw:
+                response = self.client.get_item(TableName=table_name, Key=self.serialize_item(key))
+                if not raw and 'Item' in response:
+                    response['Item'] = self.deserialize_item(response['Item'])
+                return response
             return self.get_item(table_name, key)
         except Exception as e:
             self.logger.error(f"Error fetching item: {e}")
@@ -42,27 +87,48 @@ class DynamoDBUtils(DynamoDBClient):
     def save_item(self, table_name, item, condition_expression=None, expression_values=None):
         """
         Save (put) an item into a DynamoDB table. Optionally use a condition expression.
+        A sharded key attribute is stored with its shard suffix.
         Args:
             table_name (str): The name of the DynamoDB table.
             item (dict): The item to save.
             condition_expression (str, optional): Condition for the put operation.
             expression_values (dict, optional): Values for the condition expression.
         Returns:
-            dict: The response from DynamoDB put_item.
+            dict: The response from DynamoDB put_item ({} when buffered by write-behind).
         Raises:
             Exception: If the operation fails.
         """
         self.logger.info(f"Saving item in {table_name}: {item}")
-        table = self.dynamodb.Table(table_name)
-        kwargs = {'Item': item}
-        if condition_expression and expression_values:
-            kwargs['ConditionExpression'] = condition_expression
-            kwargs['ExpressionAttributeValues'] = expression_values
+        buffered = self._buffers_writes(table_name, condition_expression)
+        if not buffered:
+            self._flush_write_behind_before_direct_write(table_name)
+        if table_name in self._sharded_keys:
+            item, = self._shard_items_for_write(self._sharded_keys[table_name], [item])
+        if buffered:
+            self._write_behind.put(table_name, item)
+            return {}
+        if self.use_low_level_client:
+            kwargs = {'TableName': table_name, 'Item': self.serialize_item(item)}
+            if condition_expression and expression_values:
+                kwargs.update(self._build_expression_kwargs(
+                    condition_expression=condition_expression, expression_values=expression_values))
+            put_item = self.client.put_item
+        else:
+            kwargs = {'Item': item}
+            if condition_expression and expression_values:
+                kwargs['ConditionExpression'] = condition_expression
+                kwargs['ExpressionAttributeValues'] = expression_values
+            put_item = self.get_table(table_name).put_item
+        if table_name in self._counters:
+            kwargs['ReturnValues'] = 'ALL_OLD'
         try:
-            return table.put_item(**kwargs)
+            response = put_item(**kwargs)
         except Exception as e:
             self.logger.error(f"Error saving item: {e}")
             raise
+        if table_name in self._counters:
+            self._apply_counter_deltas(table_name, [(self._old_image(response), item)])
+        return response
 
     def update_item_attributes(self, table_name, key, update_expression, expression_values, condition_expression=None):
         """
@@ -79,7 +145,9 @@ class DynamoDBUtils(DynamoDBClient):
             Exception: If the operation fails.
         """
         self.logger.info(f"Updating item in {table_name} with key {key}")
-        table = self.dynamodb.Table(table_name)
+        self._flush_write_behind_before_direct_write(table_name)
+        key = self._resolve_sharded_key(table_name, key)
+        table = self.get_table(table_name)
         kwargs = {
             'Key': key,
             'UpdateExpression': update_expression,
@@ -103,43 +171,76 @@ class DynamoDBUtils(DynamoDBClient):
             condition_expression (str, optional): Condition for the delete operation.
             expression_values (dict, optional): Values for the condition expression.
         Returns:
-            dict: The response from DynamoDB delete_item.
+            dict: The response from DynamoDB delete_item ({} when buffered by write-behind).
         Raises:
             Exception: If the operation fails.
         """
         self.logger.info(f"Removing item from {table_name} with key {key}")
-        table = self.dynamodb.Table(table_name)
+        buffered = self._buffers_writes(table_name, condition_expression)
+        if not buffered:
+            self._flush_write_behind_before_direct_write(table_name)
+        key = self._resolve_sharded_key(table_name, key)
+        if buffered:
+            self._write_behind.delete(table_name, key)
+            return {}
+        table = self.get_table(table_name)
         kwargs = {'Key': key}
         if condition_expression and expression_values:
             kwargs['ConditionExpression'] = condition_expression
             kwargs['ExpressionAttributeValues'] = expression_values
+        if table_name in self._counters:
+            kwargs['ReturnValues'] = 'ALL_OLD'
         try:
-            return table.delete_item(**kwargs)
+            response = table.delete_item(**kwargs)
         except Exception as e:
             self.logger.error(f"Error removing item: {e}")
             raise
+        if table_name in self._counters:
+            self._apply_counter_deltas(table_name, [(response.get('Attributes'), None)])
+        return response
 
-    def fetch_multiple_items_by_keys(self, table_name, keys):
+    def fetch_multiple_items_by_keys(self, table_name, keys, raw=False):
         """
         Fetch multiple items from a DynamoDB table by a list of keys (batch get).
+        With the low-level client, or on a sharded table (where each key expands to one key per shard),
+        keys are split into 100-key requests and unprocessed keys are retried.
         Args:
             table_name (str): The name of the DynamoDB table.
             keys (list): List of key dicts for the items to fetch.
+            raw (bool, optional): Return items as raw attribute-value dicts (low-level client only).
         Returns:
             dict: The response from DynamoDB batch_get_item.
         Raises:
             Exception: If the operation fails.
         """
         self.logger.info(f"Fetching multiple items from {table_name} with keys {keys}")
+        sharded_key = self._sharded_keys.get(table_name)
+        if sharded_key:
+            keys = [stored for key in keys for stored in self._stored_keys(sharded_key, key)]
         try:
-            return self.dynamodb.batch_get_item(RequestItems={table_name: {'Keys': keys}})
+            if self.use_low_level_client or raw or sharded_key:
+                response = self._batch_get_low_level(table_name, keys, raw)
+            else:
+                response = self.dynamodb.batch_get_item(RequestItems={table_name: {'Keys': keys}})
         except Exception as e:
             self.logger.error(f"Error fetching multiple items: {e}")
             raise
+        if sharded_key:
+            response['Responses'][table_name] = [
+                sharded_key.unshard_item(item) for item in response['Responses'].get(table_name, [])]
+            if response['UnprocessedKeys']:
+                logical_keys = {}
+                for key in response['UnprocessedKeys'][table_name]['Keys']:
+                    key = sharded_key.unshard_item(key)
+                    logical_keys[attribute_identity(key if raw else self.serialize_item(key))] = key
+                response['UnprocessedKeys'][table_name]['Keys'] = list(logical_keys.values())
+        return response
 
     def bulk_save_or_remove_items(self, table_name, put_items=None, delete_keys=None):
         """
         Bulk save (put) or remove (delete) multiple items in a DynamoDB table.
+        On a table with registered counters each write is sent as its own put/delete with ReturnValues
+        ALL_OLD (in parallel), so counter deltas come from the image each write actually replaced.
         Args:
             table_name (str): The name of the DynamoDB table.
             put_items (list, optional): List of items to put.
@@ -150,34 +251,76 @@ class DynamoDBUtils(DynamoDBClient):
             Exception: If the operation fails.
         """
         self.logger.info(f"Bulk saving or removing items in {table_name}")
+        sharded_key = self._sharded_keys.get(table_name)
+        if sharded_key:
+            put_items = self._shard_items_for_write(sharded_key, put_items or [])
+            delete_keys = [stored for key in delete_keys or [] for stored in self._stored_keys(sharded_key, key)]
         try:
-            with self.dynamodb.Table(table_name).batch_writer() as batch:
-                if put_items:
-                    for item in put_items:
-                        batch.put_item(Item=item)
-                if delete_keys:
-                    for key in delete_keys:
-                        batch.delete_item(Key=key)
+            if table_name in self._counters:
+                changes = self._write_items_returning_old_images(table_name, put_items, delete_keys)
+            elif self.use_low_level_client:
+                requests = [{'PutRequest': {'Item': self.serialize_item(item)}} for item in put_items or []]
+                requests += [{'DeleteRequest': {'Key': self.serialize_item(key)}} for key in delete_keys or []]
+                self._batch_write_low_level(table_name, requests)
+            else:
+                with self.get_table(table_name).batch_writer() as batch:
+                    if put_items:
+                        for item in put_items:
+                            batch.put_item(Item=item)
+                    if delete_keys:
+                        for key in delete_keys:
+                            batch.delete_item(Key=key)
         except Exception as e:
             self.logger.error(f"Error in bulk save or remove: {e}")
             raise
+        if table_name in self._counters:
+            self._apply_counter_deltas(table_name, changes)
 
-    def find_items_by_key_condition(self, table_name, key_condition_expression, expression_values, index_name=None, filter_expression=None):
+    def find_items_by_key_condition(self, table_name, key_condition_expression, expression_values, index_name=None,
+                                    filter_expression=None, raw=False):
         """
         Query items in a DynamoDB table using a key condition expression.
+        If the condition tests a sharded key for equality, every shard is queried in parallel to the last
+        page and the merged result has no LastEvaluatedKey.
         Args:
             table_name (str): The name of the DynamoDB table.
             key_condition_expression: The key condition expression (boto3 condition object).
             expression_values (dict): Values for the key condition expression.
             index_name (str, optional): Name of the index to query.
             filter_expression: Additional filter expression (boto3 condition object).
+            raw (bool, optional): Return items as raw attribute-value dicts (low-level client only).
         Returns:
             dict: The response from DynamoDB query.
         Raises:
             Exception: If the operation fails.
         """
         self.logger.info(f"Finding items in {table_name} with key condition {key_condition_expression}")
-        table = self.dynamodb.Table(table_name)
+        shard_conditions = self._shard_key_conditions(table_name, key_condition_expression, expression_values)
+        if shard_conditions:
+            try:
+                return self._scatter_query(table_name, shard_conditions, index_name, filter_expression, raw)
+            except Exception as e:
+                self.logger.error(f"Error finding items: {e}")
+                raise
+        if self.use_low_level_client or raw:
+            kwargs = {'TableName': table_name}
+            kwargs.update(self._build_expression_kwargs(
+                key_condition_expression=key_condition_expression,
+                filter_expression=filter_expression,
+                expression_values=expression_values))
+            if index_name:
+                kwargs['IndexName'] = index_name
+            try:
+                response = self.client.query(**kwargs)
+            except Exception as e:
+                self.logger.error(f"Error finding items: {e}")
+                raise
+            if not raw:
+                response['Items'] = [self.deserialize_item(item) for item in response.get('Items', [])]
+                if 'LastEvaluatedKey' in response:
+                    response['LastEvaluatedKey'] = self.deserialize_item(response['LastEvaluatedKey'])
+            return response
+        table = self.get_table(table_name)
         kwargs = {
             'KeyConditionExpression': key_condition_expression,
             'ExpressionAttributeValues': expression_values
@@ -192,6 +335,147 @@ class DynamoDBUtils(DynamoDBClient):
             self.logger.error(f"Error finding items: {e}")
             raise
 
+    def query_items_page(self, table_name, key_condition_expression, expression_values=None, index_name=None,
+                         filter_expression=None, projection=None, limit=None, scan_index_forward=True,
+                         cursor=None, raw=False):
+        """
+        Query a single page of items, returning an opaque cursor for the next page.
+        Uses the low-level client so the cursor carries the LastEvaluatedKey in attribute-value form.
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            key_condition_expression: The key condition expression (str or boto3 condition object).
+            expression_values (dict, optional): Values for string expression placeholders.
+            index_name (str, optional): Name of the index to query.
+            filter_expression: Additional filter expression (str or boto3 condition object), optional.
+            projection (list, optional): Attribute names (or dotted paths) to return.
+            limit (int, optional): Maximum number of items to evaluate for this page.
+            scan_index_forward (bool, optional): Sort key order; False returns items in descending order.
+            cursor (str, optional): Cursor returned by a previous page.
+            raw (bool, optional): Return items as raw attribute-value dicts.
+        Returns:
+            dict: {'Items': list, 'Count': int, 'ScannedCount': int, 'Cursor': str or None}.
+        Raises:
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Querying page in {table_name} with key condition {key_condition_expression}")
+        kwargs = {'TableName': table_name, 'ScanIndexForward': scan_index_forward}
+        kwargs.update(self._build_expression_kwargs(
+            key_condition_expression=key_condition_expression,
+            filter_expression=filter_expression,
+            expression_values=expression_values))
+        if index_name:
+            kwargs['IndexName'] = index_name
+        if limit:
+            kwargs['Limit'] = limit
+        if projection:
+            projection_expression, projection_names = self._build_projection(projection)
+            kwargs['ProjectionExpression'] = projection_expression
+            kwargs.setdefault('ExpressionAttributeNames', {}).update(projection_names)
+        if cursor:
+            kwargs['ExclusiveStartKey'] = self.decode_cursor(cursor)
+        try:
+            response = self.client.query(**kwargs)
+        except Exception as e:
+            self.logger.error(f"Error querying page: {e}")
+            raise
+        items = response.get('Items', [])
+        if not raw:
+            items = [self.deserialize_item(item) for item in items]
+        last_key = response.get('LastEvaluatedKey')
+        return {
+            'Items': items,
+            'Count': response.get('Count', len(items)),
+            'ScannedCount': response.get('ScannedCount', len(items)),
+            'Cursor': self.encode_cursor(last_key) if last_key else None,
+        }
+
+    def iterate_items_by_key_condition(self, table_name, key_condition_expression, expression_values=None,
+                                       index_name=None, filter_expression=None, projection=None, page_size=None,
+                                       scan_index_forward=True, cursor=None, raw=False):
+        """
+        Iterate over every item matching a key condition, fetching pages lazily.
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            key_condition_expression: The key condition expression (str or boto3 condition object).
+            expression_values (dict, optional): Values for string expression placeholders.
+            index_name (str, optional): Name of the index to query.
+            filter_expression: Additional filter expression (str or boto3 condition object), optional.
+            projection (list, optional): Attribute names (or dotted paths) to return.
+            page_size (int, optional): Limit passed to each page request.
+            scan_index_forward (bool, optional): Sort key order; False returns items in descending order.
+            cursor (str, optional): Cursor to resume from.
+            raw (bool, optional): Yield items as raw attribute-value dicts.
+        Yields:
+            dict: Each matching item.
+        """
+        while True:
+            page = self.query_items_page(
+                table_name, key_condition_expression, expression_values, index_name=index_name,
+                filter_expression=filter_expression, projection=projection, limit=page_size,
+                scan_index_forward=scan_index_forward, cursor=cursor, raw=raw)
+            yield from page['Items']
+            cursor = page['Cursor']
+            if not cursor:
+                return
+
+    @staticmethod
+    def encode_cursor(last_evaluated_key):
+        """
+        Encode a raw LastEvaluatedKey as an opaque, URL-safe cursor string.
+        Args:
+            last_evaluated_key (dict): Attribute-value LastEvaluatedKey from a low-level response.
+        Returns:
+            str: The cursor.
+        """
+        encoded = {}
+        for name, value in last_evaluated_key.items():
+            if 'B' in value:
+                value = {'B': base64.b64encode(value['B']).decode('ascii')}
+            encoded[name] = value
+        payload = json.dumps(encoded, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(payload).decode('ascii')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """
+        Decode a cursor produced by encode_cursor back into an ExclusiveStartKey.
+        Args:
+            cursor (str): The cursor.
+        Returns:
+            dict: Attribute-value ExclusiveStartKey.
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        try:
+            decoded = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+        if not isinstance(decoded, dict) or not all(isinstance(value, dict) for value in decoded.values()):
+            raise ValueError(f"Invalid cursor: {cursor}")
+        for name, value in decoded.items():
+            if 'B' in value:
+                decoded[name] = {'B': base64.b64decode(value['B'])}
+        return decoded
+
+    @staticmethod
+    def _build_projection(projection):
+        """
+        Build a ProjectionExpression with name placeholders for each path segment.
+        Args:
+            projection (list): Attribute names or dotted paths.
+        Returns:
+            tuple: (projection expression, ExpressionAttributeNames).
+        """
+        names, paths = {}, []
+        for attribute in projection:
+            segments = []
+            for segment in attribute.split('.'):
+                placeholder = f"#p{len(names)}"
+                names[placeholder] = segment
+                segments.append(placeholder)
+            paths.append('.'.join(segments))
+        return ', '.join(paths), names
+
     def scan_all_items_with_filter(self, table_name, filter_expression=None, expression_values=None):
         """
         Scan all items in a DynamoDB table, optionally with a filter expression.
@@ -205,7 +489,7 @@ class DynamoDBUtils(DynamoDBClient):
             Exception: If the operation fails.
         """
         self.logger.info(f"Scanning all items in {table_name}")
-        table = self.dynamodb.Table(table_name)
+        table = self.get_table(table_name)
         kwargs = {}
         if filter_expression:
             kwargs['FilterExpression'] = filter_expression
@@ -230,7 +514,7 @@ class DynamoDBUtils(DynamoDBClient):
             Exception: If the operation fails.
         """
         self.logger.info(f"Fetching items from {table_name} where {attribute_name} = {attribute_value}")
-        table = self.dynamodb.Table(table_name)
+        table = self.get_table(table_name)
         from boto3.dynamodb.conditions import Attr
         try:
             return table.scan(FilterExpression=Attr(attribute_name).eq(attribute_value))
@@ -301,29 +585,167 @@ class DynamoDBUtils(DynamoDBClient):
             self.logger.error(f"Error checking item existence: {e}")
             return False
 
-    def count_items_by_condition(self, table_name, condition_expression, expression_values):
+    def count_items_by_condition(self, table_name, condition_expression=None, expression_values=None, counter_name=None):
         """
         Count the number of items in a DynamoDB table matching a condition.
+        Scans every page of the table unless counter_name names a registered counter,
+        in which case the materialized count is read instead.
         Args:
             table_name (str): The name of the DynamoDB table.
             condition_expression: The filter expression (boto3 condition object).
             expression_values (dict): Values for the filter expression.
+            counter_name (str, optional): Registered counter to read instead of scanning.
         Returns:
             int: The count of matching items.
+        Raises:
+            ValueError: If the condition refers to a sharded key attribute, whose stored values carry
+                the shard suffix; use count_items_by_key_condition instead.
         """
         self.logger.info(f"Counting items in {table_name} by condition")
-        table = self.dynamodb.Table(table_name)
+        sharded_key = self._sharded_keys.get(table_name)
+        if not counter_name and sharded_key and sharded_key.references_attribute(condition_expression):
+            raise ValueError(f"Cannot scan-count {table_name} by sharded key {sharded_key.attribute_name}; "
+                             f"use count_items_by_key_condition")
+        if counter_name:
+            try:
+                return self.read_counter(table_name, counter_name)
+            except Exception as e:
+                self.logger.error(f"Error reading counter {counter_name}: {e}")
+                return 0
+        table = self.get_table(table_name)
+        kwargs = {'Select': 'COUNT'}
+        if condition_expression is not None:
+            kwargs['FilterExpression'] = condition_expression
+        if expression_values:
+            kwargs['ExpressionAttributeValues'] = expression_values
+        count = 0
+        try:
+            while True:
+                response = table.scan(**kwargs)
+                count += response.get('Count', 0)
+                if 'LastEvaluatedKey' not in response:
+                    return count
+                kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except Exception as e:
+            self.logger.error(f"Error counting items: {e}")
+            return 0
+
+    def count_items_by_key_condition(self, table_name, key_condition_expression, expression_values=None,
+                                     index_name=None, filter_expression=None):
+        """
+        Count the items matching a key condition with COUNT queries, across every shard of a sharded key.
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            key_condition_expression: The key condition expression (str or boto3 condition object).
+            expression_values (dict, optional): Values for string expression placeholders.
+            index_name (str, optional): Name of the index to query.
+            filter_expression: Additional filter expression (str or boto3 condition object), optional.
+        Returns:
+            int: The count of matching items.
+        """
+        self.logger.info(f"Counting items in {table_name} with key condition {key_condition_expression}")
+        shard_conditions = self._shard_key_conditions(table_name, key_condition_expression, expression_values) or [
+            (key_condition_expression, expression_values)]
         try:
-            response = table.scan(
-                FilterExpression=condition_expression,
-                ExpressionAttributeValues=expression_values,
-                Select='COUNT'
-            )
-            return response.get('Count', 0)
+            return self._scatter_query(table_name, shard_conditions, index_name, filter_expression,
+                                       count_only=True)['Count']
         except Exception as e:
             self.logger.error(f"Error counting items: {e}")
             return 0
 
+    def register_sharded_key(self, table_name, attribute_name, shards, shard_function=None):
+        """
+        Declare a string partition key attribute as write-sharded. Single-item and bulk writes store it as
+        "<value>#<shard>"; keyed reads, key condition queries and counts address the logical value and
+        are scattered over every shard. query_items_page, scans and batch sessions see stored values.
+        With random sharding of a primary key attribute, puts first locate the shard an existing item
+        lives on; concurrent first writes of a new key may still pick different shards.
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            attribute_name (str): The partition key attribute (of the table or a GSI) to shard.
+            shards (int): Number of shards each value is spread across.
+            shard_function (callable, optional): Computes the shard from key attributes, e.g.
+                stable_shard_function('sk'), so keyed operations hit one shard; random when omitted.
+        Returns:
+            ShardedKeyDefinition: The registered sharded key.
+        """
+        self.logger.info(f"Registering sharded key {attribute_name} on {table_name} with {shards} shards")
+        sharded_key = ShardedKeyDefinition(table_name, attribute_name, shards, shard_function)
+        self._sharded_keys[table_name] = sharded_key
+        return sharded_key
+
+    def register_counter(self, table_name, counter_name, predicate, shards=1):
+        """
+        Register a materialized counter kept up to date by save_item, remove_item_by_key and
+        bulk_save_or_remove_items. update_item_attributes and batch sessions do not adjust counters;
+        use rebuild_counter after writes made through those paths. Deltas come from the ALL_OLD image of
+        each write, so concurrent writers do not make the count drift; a failed counter update raises
+        CounterUpdateError after the data write and the counter then needs rebuild_counter.
+        Args:
+            table_name (str): The name of the counted DynamoDB table.
+            counter_name (str): The counter name, unique per table.
+            predicate (callable): Called with a deserialized item; returns True if the item is counted.
+            shards (int, optional): Number of counter items the count is spread across.
+        Returns:
+            CounterDefinition: The registered counter.
+        """
+        self.logger.info(f"Registering counter {counter_name} on {table_name} with {shards} shards")
+        counter = CounterDefinition(table_name, counter_name, predicate, shards)
+        self._counters.setdefault(table_name, {})[counter_name] = counter
+        return counter
+
+    def read_counter(self, table_name, counter_name):
+        """
+        Read a materialized counter by summing its shards.
+        Args:
+            table_name (str): The name of the counted DynamoDB table.
+            counter_name (str): The registered counter name.
+        Returns:
+            int: The current count.
+        Raises:
+            KeyError: If the counter is not registered.
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Reading counter {counter_name} on {table_name}")
+        counter = self._counters[table_name][counter_name]
+        response = self._batch_get_low_level(self.counter_table_name, counter.shard_keys())
+        if response['UnprocessedKeys']:
+            raise RuntimeError(f"Counter {counter_name} shards unprocessed after retries")
+        return sum(int(item.get(COUNTER_VALUE_ATTRIBUTE, 0))
+                   for item in response['Responses'][self.counter_table_name])
+
+    def rebuild_counter(self, table_name, counter_name):
+        """
+        Recompute a counter from a full table scan and overwrite its shards.
+        Run while writes to the table are paused, e.g. when first enabling a counter.
+        Args:
+            table_name (str): The name of the counted DynamoDB table.
+            counter_name (str): The registered counter name.
+        Returns:
+            int: The recomputed count.
+        Raises:
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Rebuilding counter {counter_name} on {table_name}")
+        counter = self._counters[table_name][counter_name]
+        table = self.get_table(table_name)
+        kwargs, count = {}, 0
+        try:
+            while True:
+                response = table.scan(**kwargs)
+                count += sum(counter.matches(item) for item in response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    break
+                kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+            shard_items = [dict(key, **{COUNTER_VALUE_ATTRIBUTE: count if i == 0 else 0})
+                           for i, key in enumerate(counter.shard_keys())]
+            self._batch_write_low_level(
+                self.counter_table_name, [{'PutRequest': {'Item': self.serialize_item(item)}} for item in shard_items])
+        except Exception as e:
+            self.logger.error(f"Error rebuilding counter {counter_name}: {e}")
+            raise
+        return count
+
     def force_string(self, value):
         """
         Convert any value to a string, with logging and error handling.
@@ -339,4 +761,430 @@ class DynamoDBUtils(DynamoDBClient):
             return str(value)
         except Exception as e:
             self.logger.error(f"Error forcing value to string: {e}")
-            raise 
\ No newline at end of file
+            raise
+
+    def _build_expression_kwargs(self, key_condition_expression=None, filter_expression=None,
+                                 condition_expression=None, expression_values=None):
+        """
+        Build low-level client expression arguments from strings or boto3 condition objects.
+        Args:
+            key_condition_expression: Key condition (str or boto3 condition object), optional.
+            filter_expression: Filter expression (str or boto3 condition object), optional.
+            condition_expression: Condition expression (str or boto3 condition object), optional.
+            expression_values (dict, optional): Python values for string expression placeholders.
+        Returns:
+            dict: Expression kwargs with serialized attribute values.
+        """
+        builder = ConditionExpressionBuilder()
+        kwargs, names, values = {}, {}, {}
+        expressions = (
+            ('KeyConditionExpression', key_condition_expression, True),
+            ('FilterExpression', filter_expression, False),
+            ('ConditionExpression', condition_expression, False),
+        )
+        for param, expression, is_key_condition in expressions:
+            if expression is None:
+                continue
+            if isinstance(expression, str):
+                kwargs[param] = expression
+                continue
+            built = builder.build_expression(expression, is_key_condition=is_key_condition)
+            kwargs[param] = built.condition_expression
+            names.update(built.attribute_name_placeholders)
+            values.update(built.attribute_value_placeholders)
+        if expression_values:
+            values.update(expression_values)
+        if names:
+            kwargs['ExpressionAttributeNames'] = names
+        if values:
+            kwargs['ExpressionAttributeValues'] = self.serialize_item(values)
+        return kwargs
+
+    def batch_session(self, max_workers=DEFAULT_BATCH_WORKERS, raw=False):
+        """
+        Start a batch session that collects gets, puts and deletes across tables.
+        On flush (or when used as a context manager, on exit) the operations are packed into
+        the fewest batch_get_item/batch_write_item requests and sent concurrently.
+        Args:
+            max_workers (int, optional): Maximum number of batch requests in flight.
+            raw (bool, optional): Resolve gets to raw attribute-value dicts.
+        Returns:
+            DynamoDBBatchSession: The batch session.
+        """
+        self.logger.info(f"Starting batch session with {max_workers} workers")
+        return DynamoDBBatchSession(self, max_workers=max_workers, raw=raw)
+
+    def enable_write_behind(self, max_items=DEFAULT_WRITE_BEHIND_ITEMS, max_age_seconds=DEFAULT_WRITE_BEHIND_SECONDS,
+                            max_workers=DEFAULT_BATCH_WORKERS, table_names=None):
+        """
+        Buffer unconditional save_item/remove_item_by_key calls made by the current thread and flush them
+        as batched, parallel writes. Other threads sharing this instance are not affected.
+        Conditional writes, updates and writes to tables with registered counters still go straight
+        through; they first flush the buffer, so they apply after the buffered writes to the same table.
+        Buffered writes are not visible to reads until flushed, and nothing flushes them in the
+        background: call flush_write_behind or disable_write_behind before the invocation ends.
+        Args:
+            max_items (int, optional): Flush once this many distinct keys are buffered.
+            max_age_seconds (float, optional): Flush once the oldest buffered write is this old.
+            max_workers (int, optional): Maximum number of batch requests in flight during a flush.
+            table_names (iterable, optional): Only buffer writes to these tables (default: every table).
+        """
+        self.logger.info(f"Enabling write-behind: max_items={max_items}, max_age_seconds={max_age_seconds}")
+        if self._write_behind is not None:
+            self._write_behind.flush()
+        self._write_behind = WriteBehindBuffer(self, max_items, max_age_seconds, max_workers, table_names)
+
+    def flush_write_behind(self):
+        """
+        Flush the current thread's buffered writes. Call at the end of each invocation.
+        Raises:
+            WriteBehindFlushError: If any buffered write was not applied.
+        """
+        if self._write_behind is not None:
+            self._write_behind.flush()
+
+    def disable_write_behind(self):
+        """
+        Flush the current thread's buffered writes and return to writing each item directly.
+        Raises:
+            WriteBehindFlushError: If any buffered write was not applied.
+        """
+        write_behind, self._write_behind = self._write_behind, None
+        if write_behind is not None:
+            self.logger.info("Disabling write-behind")
+            write_behind.flush()
+
+    @contextmanager
+    def write_behind(self, max_items=DEFAULT_WRITE_BEHIND_ITEMS, max_age_seconds=DEFAULT_WRITE_BEHIND_SECONDS,
+                     max_workers=DEFAULT_BATCH_WORKERS, table_names=None):
+        """
+        Enable write-behind for the current thread for the duration of a with block, flushing on exit.
+        If the block raises, buffered writes are still flushed; a flush failure is logged and the
+        original exception propagates.
+        Raises:
+            WriteBehindFlushError: If the block completed but any buffered write was not applied.
+        """
+        self.enable_write_behind(max_items, max_age_seconds, max_workers, table_names)
+        try:
+            yield self
+        except Exception:
+            try:
+                self.disable_write_behind()
+            except Exception as flush_error:
+                self.logger.error(f"Error flushing write-behind after failure: {flush_error}")
+            raise
+        self.disable_write_behind()
+
+    def _buffers_writes(self, table_name, condition_expression):
+        write_behind = self._write_behind
+        return (write_behind is not None and condition_expression is None
+                and table_name not in self._counters and write_behind.buffers(table_name))
+
+    def _flush_write_behind_before_direct_write(self, table_name):
+        """
+        Flush buffered writes before a write that bypasses the buffer, so it cannot overtake (and be
+        overwritten by, or fail its condition because of) a buffered write to the same key.
+        """
+        write_behind = self._write_behind
+        if write_behind is not None and write_behind.buffers(table_name) and write_behind.pending_count():
+            write_behind.flush()
+
+    def _send_batch_get(self, request_items):
+        """
+        Send a single batch_get_item request, retrying unprocessed keys with backoff.
+        Args:
+            request_items (dict): Serialized RequestItems, at most 100 keys.
+        Returns:
+            tuple: (responses by table, unprocessed RequestItems left after retries).
+        """
+        responses, pending = {}, request_items
+        for attempt in range(MAX_UNPROCESSED_RETRIES + 1):
+            response = self.client.batch_get_item(RequestItems=pending)
+            for table_name, items in response.get('Responses', {}).items():
+                responses.setdefault(table_name, []).extend(items)
+            pending = response.get('UnprocessedKeys') or {}
+            if not pending:
+                break
+            if attempt < MAX_UNPROCESSED_RETRIES:
+                time.sleep(0.05 * (2 ** attempt))
+        return responses, pending
+
+    def _send_batch_write(self, request_items):
+        """
+        Send a single batch_write_item request, retrying unprocessed items with backoff.
+        Args:
+            request_items (dict): Serialized RequestItems, at most 25 requests.
+        Returns:
+            dict: Unprocessed RequestItems left after retries.
+        """
+        pending = request_items
+        for attempt in range(MAX_UNPROCESSED_RETRIES + 1):
+            response = self.client.batch_write_item(RequestItems=pending)
+            pending = response.get('UnprocessedItems') or {}
+            if not pending:
+                break
+            if attempt < MAX_UNPROCESSED_RETRIES:
+                time.sleep(0.05 * (2 ** attempt))
+        return pending
+
+    def _batch_get_low_level(self, table_name, keys, raw=False):
+        """
+        Batch get through the low-level client in 100-key requests, retrying unprocessed keys.
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            keys (list): List of key dicts for the items to fetch.
+            raw (bool, optional): Keep items as raw attribute-value dicts.
+        Returns:
+            dict: A batch_get_item shaped response merged across all requests.
+        """
+        items, unprocessed = [], []
+        serialized_keys = [self.serialize_item(key) for key in keys]
+        for start in range(0, len(serialized_keys), MAX_BATCH_GET_KEYS):
+            responses, pending = self._send_batch_get(
+                {table_name: {'Keys': serialized_keys[start:start + MAX_BATCH_GET_KEYS]}})
+            items.extend(responses.get(table_name, []))
+            if pending:
+                unprocessed.extend(pending[table_name]['Keys'])
+        if not raw:
+            items = [self.deserialize_item(item) for item in items]
+            unprocessed = [self.deserialize_item(key) for key in unprocessed]
+        response = {'Responses': {table_name: items}, 'UnprocessedKeys': {}}
+        if unprocessed:
+            response['UnprocessedKeys'][table_name] = {'Keys': unprocessed}
+        return response
+
+    def _batch_write_low_level(self, table_name, requests):
+        """
+        Batch write through the low-level client in 25-item requests, retrying unprocessed items.
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            requests (list): Serialized PutRequest/DeleteRequest dicts.
+        Raises:
+            RuntimeError: If items remain unprocessed after all retries.
+        """
+        for start in range(0, len(requests), MAX_BATCH_WRITE_ITEMS):
+            pending = self._send_batch_write({table_name: requests[start:start + MAX_BATCH_WRITE_ITEMS]})
+            if pending:
+                raise RuntimeError(f"{len(pending[table_name])} items unprocessed in {table_name} after retries")
+
+    def _stored_keys(self, sharded_key, key):
+        """
+        List the stored keys a logical key may live under: one shard if computed, else every shard.
+        """
+        if sharded_key.attribute_name not in key:
+            return [key]
+        if sharded_key.computed:
+            return [sharded_key.shard_item(key)]
+        return sharded_key.all_shard_items(key)
+
+    def _shard_items_for_write(self, sharded_key, items):
+        """
+        Add the shard suffix to items about to be put. With random sharding of a primary key attribute,
+        an item that already exists keeps the shard it lives on (found with one batch get over every
+        shard of every key), and repeated keys share one shard.
+        Returns:
+            list: The items as stored.
+        """
+        key_attributes = self.get_key_attributes(sharded_key.table_name)
+        if sharded_key.computed or sharded_key.attribute_name not in key_attributes:
+            return [sharded_key.shard_item(item) for item in items]
+        stored_keys = {}
+        for item in items:
+            for stored in sharded_key.all_shard_items({name: item[name] for name in key_attributes}):
+                stored_keys[self._key_identity(stored, key_attributes)] = stored
+        response = self._batch_get_low_level(sharded_key.table_name, list(stored_keys.values()))
+        if response['UnprocessedKeys']:
+            raise RuntimeError(f"Shards of {len(items)} items in {sharded_key.table_name} unprocessed after retries")
+        shards = {}
+        for found in response['Responses'][sharded_key.table_name]:
+            identity = self._key_identity(sharded_key.unshard_item(found), key_attributes)
+            shards[identity] = found[sharded_key.attribute_name]
+        stored_items = []
+        for item in items:
+            identity = self._key_identity(item, key_attributes)
+            if identity not in shards:
+                shards[identity] = sharded_key.shard_item(item)[sharded_key.attribute_name]
+            stored_items.append(dict(item, **{sharded_key.attribute_name: shards[identity]}))
+        return stored_items
+
+    def _locate_sharded_items(self, sharded_key, key, raw=False):
+        """
+        Batch get a logical key on every shard it may live under.
+        Returns:
+            list: The stored items found.
+        """
+        response = self._batch_get_low_level(sharded_key.table_name, self._stored_keys(sharded_key, key), raw)
+        if response['UnprocessedKeys']:
+            raise RuntimeError(f"Shards of {key} in {sharded_key.table_name} unprocessed after retries")
+        return response['Responses'][sharded_key.table_name]
+
+    def _resolve_sharded_key(self, table_name, key):
+        """
+        Map a logical key to its stored key. With random sharding the item is located first; a key that
+        exists on no shard is sent to a random shard, like a write to a new item.
+        """
+        sharded_key = self._sharded_keys.get(table_name)
+        if not sharded_key or sharded_key.attribute_name not in key:
+            return key
+        if not sharded_key.computed:
+            items = self._locate_sharded_items(sharded_key, key)
+            if items:
+                return dict(key, **{sharded_key.attribute_name: items[0][sharded_key.attribute_name]})
+        return sharded_key.shard_item(key)
+
+    def _fetch_sharded_item(self, sharded_key, key, raw=False):
+        """
+        Fetch a logical key from its shard(s), returning a get_item shaped response.
+        """
+        try:
+            items = self._locate_sharded_items(sharded_key, key, raw)
+        except Exception as e:
+            self.logger.error(f"Error fetching item: {e}")
+            raise
+        return {'Item': sharded_key.unshard_item(items[0])} if items else {}
+
+    def _shard_key_conditions(self, table_name, key_condition_expression, expression_values):
+        sharded_key = self._sharded_keys.get(table_name)
+        if not sharded_key:
+            return None
+        return sharded_key.shard_key_conditions(key_condition_expression, expression_values)
+
+    def _scatter_query(self, table_name, shard_conditions, index_name=None, filter_expression=None, raw=False,
+                       count_only=False):
+        """
+        Run every page of one query per shard condition in parallel and merge the results.
+        Items are unsharded and, for table queries, ordered by the sort key as one partition would be.
+        Returns:
+            dict: {'Items': list, 'Count': int, 'ScannedCount': int}.
+        """
+        def query(condition):
+            return self._query_all_pages(table_name, condition[0], condition[1], index_name, filter_expression,
+                                         raw, count_only)
+
+        with ThreadPoolExecutor(max_workers=min(len(shard_conditions), DEFAULT_BATCH_WORKERS)) as executor:
+            results = list(executor.map(query, shard_conditions))
+        sharded_key = self._sharded_keys.get(table_name)
+        items = [item for result in results for item in result['Items']]
+        if sharded_key:
+            items = [sharded_key.unshard_item(item) for item in items]
+        key_attributes = self.get_key_attributes(table_name) if items and not raw and not index_name else ()
+        if len(key_attributes) > 1:
+            items.sort(key=lambda item: item[key_attributes[1]])
+        return {
+            'Items': items,
+            'Count': sum(result['Count'] for result in results),
+            'ScannedCount': sum(result['ScannedCount'] for result in results),
+        }
+
+    def _query_all_pages(self, table_name, key_condition_expression, expression_values=None, index_name=None,
+                         filter_expression=None, raw=False, count_only=False):
+        """
+        Query every page of a key condition on either path.
+        Returns:
+            dict: {'Items': list, 'Count': int, 'ScannedCount': int}.
+        """
+        if self.use_low_level_client or raw:
+            kwargs = {'TableName': table_name}
+            kwargs.update(self._build_expression_kwargs(
+                key_condition_expression=key_condition_expression,
+                filter_expression=filter_expression,
+                expression_values=expression_values))
+            query = self.client.query
+        else:
+            kwargs = {'KeyConditionExpression': key_condition_expression}
+            if expression_values:
+                kwargs['ExpressionAttributeValues'] = expression_values
+            if filter_expression:
+                kwargs['FilterExpression'] = filter_expression
+            query = self.get_table(table_name).query
+        if index_name:
+            kwargs['IndexName'] = index_name
+        if count_only:
+            kwargs['Select'] = 'COUNT'
+        items, count, scanned_count = [], 0, 0
+        while True:
+            response = query(**kwargs)
+            items.extend(response.get('Items', []))
+            count += response.get('Count', 0)
+            scanned_count += response.get('ScannedCount', 0)
+            if 'LastEvaluatedKey' not in response:
+                break
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        if self.use_low_level_client and not raw:
+            items = [self.deserialize_item(item) for item in items]
+        return {'Items': items, 'Count': count, 'ScannedCount': scanned_count}
+
+    def _old_image(self, response):
+        """
+        Extract the deserialized ALL_OLD image from a put response on either path.
+        """
+        old_item = response.get('Attributes')
+        if old_item is not None and self.use_low_level_client:
+            old_item = self.deserialize_item(old_item)
+        return old_item
+
+    def _key_identity(self, item, key_attributes):
+        """
+        Build a hashable identity for an item's primary key.
+        """
+        return attribute_identity(self.serialize_item({name: item[name] for name in key_attributes}))
+
+    def _write_items_returning_old_images(self, table_name, put_items=None, delete_keys=None):
+        """
+        Apply a bulk write as single-item writes returning ALL_OLD. Writes to different keys run in
+        parallel; writes to the same key run in order, puts before deletes as in the bulk write itself.
+        Returns:
+            list: (old item, new item) pairs, one per write; None stands for a missing item.
+        """
+        key_attributes = self.get_key_attributes(table_name)
+        writes_by_key = {}
+        for item in put_items or []:
+            writes_by_key.setdefault(self._key_identity(item, key_attributes), []).append((item, item))
+        for key in delete_keys or []:
+            writes_by_key.setdefault(self._key_identity(key, key_attributes), []).append((key, None))
+
+        def write_key(writes):
+            changes = []
+            for target, new_item in writes:
+                if new_item is not None:
+                    response = self.client.put_item(TableName=table_name, Item=self.serialize_item(target),
+                                                    ReturnValues='ALL_OLD')
+                else:
+                    response = self.client.delete_item(TableName=table_name, Key=self.serialize_item(target),
+                                                       ReturnValues='ALL_OLD')
+                old_item = response.get('Attributes')
+                changes.append((self.deserialize_item(old_item) if old_item is not None else None, new_item))
+            return changes
+
+        with ThreadPoolExecutor(max_workers=DEFAULT_BATCH_WORKERS) as executor:
+            return [change for changes in executor.map(write_key, writes_by_key.values()) for change in changes]
+
+    def _apply_counter_deltas(self, table_name, changes):
+        """
+        Apply one atomic ADD per affected counter, on a random shard.
+        Every counter is attempted; failures are raised together afterwards, since the data write
+        already succeeded and the counts now need rebuild_counter.
+        Args:
+            table_name (str): The name of the counted DynamoDB table.
+            changes (list): (old item, new item) pairs; None stands for a missing item.
+        Raises:
+            CounterUpdateError: If any counter update failed.
+        """
+        failures = []
+        for counter in self._counters.get(table_name, {}).values():
+            total = sum(counter.delta(old_item, new_item) for old_item, new_item in changes)
+            if not total:
+                continue
+            try:
+                self.client.update_item(
+                    TableName=self.counter_table_name,
+                    Key=self.serialize_item(counter.random_shard_key()),
+                    UpdateExpression='ADD #count :delta',
+                    ExpressionAttributeNames={'#count': COUNTER_VALUE_ATTRIBUTE},
+                    ExpressionAttributeValues={':delta': {'N': str(total)}},
+                )
+            except Exception as e:
+                self.logger.error(f"Error updating counter {counter.counter_name} on {table_name}: {e}")
+                failures.append((counter.counter_name, total, e))
+        if failures:
+            raise CounterUpdateError(table_name, failures)
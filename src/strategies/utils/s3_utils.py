@@ -3,10 +3,39 @@ S3Utils: A comprehensive utility class for AWS S3 operations.
 
 This class provides high-level, descriptive methods for common S3 operations such as get, put, delete, and list objects.
 All methods include logging and error handling for robust production use.
+put_object can attach a SHA-256 checksum, which S3 verifies on upload. It can also skip the upload
+when the stored object already has the same checksum.
 """
-import boto3
+from botocore.exceptions import ClientError
+from common.config import get_config
+from common.priming import get_client
 from common.logger import Logger
-import os
+import base64
+import hashlib
+
+CHECKSUM_METADATA_KEY = 'sha256'
+MISSING_OBJECT_CODES = ('404', 'NoSuchKey', 'NotFound')
+
+
+def sha256_checksum(body):
+    """
+    Compute the base64 SHA-256 checksum S3 expects in ChecksumSHA256.
+    Args:
+        body (bytes or str): The object content.
+    Returns:
+        str: The base64-encoded digest.
+    """
+    digest = hashlib.sha256(body.encode('utf-8') if isinstance(body, str) else body).digest()
+    return base64.b64encode(digest).decode('ascii')
+
+
+def matches_checksum(stored, checksum):
+    """
+    Check whether a head_object response describes an object with the given checksum, either as
+    returned with ChecksumMode or as recorded in the object metadata.
+    """
+    return checksum in (stored.get('ChecksumSHA256'), stored.get('Metadata', {}).get(CHECKSUM_METADATA_KEY))
+
 
 class S3Utils:
     """
@@ -17,7 +46,7 @@ class S3Utils:
         Initialize the S3Utils class with region and logger.
         """
         self.logger = Logger(__name__)
-        self.s3 = boto3.client('s3', region_name=region_name or os.environ.get('AWS_REGION', 'us-east-1'))
+        self.s3 = get_client('s3', region_name=region_name or get_config().aws_region)
 
     def get_object(self, bucket, key):
         """
@@ -37,25 +66,53 @@ class S3Utils:
             self.logger.error(f"Error getting object: {e}")
             raise
 
-    def put_object(self, bucket, key, body):
+    def put_object(self, bucket, key, body, skip_if_unchanged=False, verify_checksum=False):
         """
         Put an object into an S3 bucket.
         Args:
             bucket (str): The name of the S3 bucket.
             key (str): The object key.
             body (bytes or str): The content to upload.
+            skip_if_unchanged (bool, optional): Skip the upload when the stored object has the same
+                SHA-256 checksum. Implies verify_checksum.
+            verify_checksum (bool, optional): Send the SHA-256 checksum so S3 rejects a corrupted upload,
+                and record it in the object metadata.
         Returns:
-            dict: The response from S3 put_object.
+            dict: The response from S3 put_object, or {'Skipped': True, 'ETag': ...} if the upload was skipped.
         Raises:
             Exception: If the operation fails.
         """
         self.logger.info(f"Putting object to bucket: {bucket}, key: {key}")
         try:
-            return self.s3.put_object(Bucket=bucket, Key=key, Body=body)
+            if not (skip_if_unchanged or verify_checksum):
+                return self.s3.put_object(Bucket=bucket, Key=key, Body=body)
+            if hasattr(body, 'read'):
+                body = body.read()
+            checksum = sha256_checksum(body)
+            if skip_if_unchanged:
+                stored = self._head_object_if_exists(bucket, key)
+                if stored is not None and matches_checksum(stored, checksum):
+                    self.logger.info(f"Skipping unchanged object: {bucket}/{key}")
+                    return {'Skipped': True, 'ETag': stored.get('ETag')}
+            return self.s3.put_object(Bucket=bucket, Key=key, Body=body, ChecksumSHA256=checksum,
+                                      Metadata={CHECKSUM_METADATA_KEY: checksum})
         except Exception as e:
             self.logger.error(f"Error putting object: {e}")
             raise
 
+    def _head_object_if_exists(self, bucket, key):
+        """
+        Head an object with checksums enabled.
+        Returns:
+            dict: The response from S3 head_object, or None if the object does not exist.
+        """
+        try:
+            return self.s3.head_object(Bucket=bucket, Key=key, ChecksumMode='ENABLED')
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in MISSING_OBJECT_CODES:
+                return None
+            raise
+
     def delete_object(self, bucket, key):
         """
         Delete an object from an S3 bucket.
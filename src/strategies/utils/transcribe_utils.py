@@ -4,7 +4,8 @@ TranscribeUtils: A comprehensive utility class for AWS Transcribe operations.
 This class provides high-level, descriptive methods for starting, getting, and checking transcription jobs.
 All methods include logging and error handling for robust production use.
 """
-from src.common.client.transcribe_client import TranscribeClient
+from common.client.transcribe_client import TranscribeClient
+import time
 
 
 class TranscribeUtils(TranscribeClient):
@@ -30,7 +31,6 @@ class TranscribeUtils(TranscribeClient):
                     return status
                 elif status == 'IN_PROGRESS':
                     self.logger.info("Transcription job in progress...")
-                    import time
                     time.sleep(5)
                 elif status == 'FAILED':
                     self.logger.error(f"Transcription job failed: {status}")
@@ -40,4 +40,27 @@ class TranscribeUtils(TranscribeClient):
                     return "UNKNOWN"
         except Exception as e:
             self.logger.error(f"Error checking transcription job status: {e}")
-            raise 
\ No newline at end of file
+            raise
+
+    def wait_for_transcription_job(self, transcription_job_name, poll_seconds=5):
+        """
+        Poll a transcription job until it leaves the QUEUED and IN_PROGRESS states.
+        Args:
+            transcription_job_name (str): Name of the transcription job.
+            poll_seconds (float, optional): Delay between status polls.
+        Returns:
+            dict: The final TranscriptionJob description, including Transcript file URIs.
+        Raises:
+            Exception: If the operation fails.
+        """
+        self.logger.info(f"Waiting for transcription job: {transcription_job_name}")
+        try:
+            while True:
+                job = self.get_transcription_job(transcription_job_name)['TranscriptionJob']
+                if job['TranscriptionJobStatus'] not in ('QUEUED', 'IN_PROGRESS'):
+                    self.logger.info(f"Transcription job finished with status: {job['TranscriptionJobStatus']}")
+                    return job
+                time.sleep(poll_seconds)
+        except Exception as e:
+            self.logger.error(f"Error waiting for transcription job: {e}")
+            raise
@@ -2,25 +2,30 @@
 s3_remove_pii.py: Lambda handler for removing PII from S3 audio files using AWS Transcribe.
 
 This handler uses S3 and Transcribe utility classes from the utils/ folder for all AWS operations.
-It demonstrates OOP, logging, and robust error handling.
+It demonstrates OOP, logging, and robust error handling. Settings come from the shared config
+(workflow name 's3_remove_pii'). When transcribe_chunk_seconds is set, WAV recordings are split into
+overlapping chunks that are redacted as parallel Transcribe jobs.
 """
 import uuid
 import time
-import os
-from strategies.base.s3_utils import S3Utils
-from strategies.base.transcribe_utils import TranscribeUtils
+from strategies.utils.chunked_transcribe_utils import ChunkedTranscribeUtils
+from common.config import get_config
 from common.logger import Logger
+from common.priming import prime
+from common.profiling import profiled
 
-class S3RemovePiiHandler(S3Utils, TranscribeUtils):
+WORKFLOW_NAME = 's3_remove_pii'
+
+class S3RemovePiiHandler(ChunkedTranscribeUtils):
     """
     Handler for removing PII from S3 audio files using AWS Transcribe.
-    Inherits S3Utils and TranscribeUtils for AWS operations.
+    Inherits S3Utils and TranscribeUtils (through ChunkedTranscribeUtils) for AWS operations.
     """
     def __init__(self):
-        S3Utils.__init__(self, region_name=os.environ.get('AWS_REGION', 'us-east-1'))
-        TranscribeUtils.__init__(self, region_name=os.environ.get('AWS_REGION', 'us-east-1'))
+        self.config = get_config().for_workflow(WORKFLOW_NAME)
+        ChunkedTranscribeUtils.__init__(self, region_name=self.config.aws_region)
         self.logger = Logger(__name__)
-        self.target_output_bucket = os.environ.get('TARGET_OUTPUT_BUCKET', 'new-recording-with-pii')
+        self.target_output_bucket = self.config.target_output_bucket
 
     def generate_random_id(self):
         """Generate a random UUID string."""
@@ -47,6 +52,19 @@ class S3RemovePiiHandler(S3Utils, TranscribeUtils):
         media_file_uri = f"s3://{source_bucket}/{source_key}"
         transcription_job_name = f"Transcription_Job_Name-{self.generate_random_id()}"
         try:
+            if self.config.transcribe_chunk_seconds and source_key.lower().endswith('.wav'):
+                result = self.transcribe_wav_in_chunks(
+                    source_bucket, source_key, self.target_output_bucket, transcription_job_name,
+                    chunk_seconds=self.config.transcribe_chunk_seconds,
+                    overlap_seconds=self.config.transcribe_chunk_overlap_seconds,
+                    max_parallel_jobs=self.config.transcribe_max_parallel_jobs)
+                self.logger.info(f"Chunked transcription completed with {result['ChunkCount']} chunks")
+                return {
+                    'statusCode': 200,
+                    'message': 'Transcription job processing completed',
+                    'media_file_uri': media_file_uri,
+                    'Status': result['TranscriptionJobStatus']
+                }
             # Example usage of inherited S3Utils method (get_object):
             # obj = self.get_object(source_bucket, source_key)
             transcription_start = self.start_transcription_job(
@@ -95,6 +113,11 @@ class S3RemovePiiHandler(S3Utils, TranscribeUtils):
                 'media_file_uri': f"s3://{source_bucket}/{source_key}",
             }
 
+# Load the shared config and build the S3 and Transcribe clients during the init phase
+# rather than on the first invocation.
+prime(('s3', 'transcribe'), region_name=get_config().aws_region, warm_up=get_config().prime_warm_up)
+
+@profiled('s3_remove_pii')
 def lambda_handler(event, context):
     """Lambda entry point."""
     return S3RemovePiiHandler().handle(event, context) 
\ No newline at end of file
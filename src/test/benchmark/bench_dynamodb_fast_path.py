@@ -0,0 +1,73 @@
+"""
+bench_dynamodb_fast_path.py: Compare ops/sec of the DynamoDBUtils resource path against the low-level client path.
+
+Requests are answered with canned responses from a before-call hook, so botocore still builds every
+request and the resource layer still runs its (de)serialization handlers; the numbers isolate the
+client-side cost that the fast path removes. Run with PYTHONPATH=src:
+    python src/test/benchmark/bench_dynamodb_fast_path.py [iterations]
+"""
+import copy
+import sys
+import time
+from decimal import Decimal
+from botocore.awsrequest import AWSResponse
+from boto3.dynamodb.conditions import Key
+from strategies.utils.dynamodb_utils import DynamoDBUtils
+
+ITEM = {
+    'pk': {'S': 'contact#1'},
+    'sk': {'S': '2024-01-01T00:00:00Z'},
+    'duration': {'N': '125'},
+    'agent': {'S': 'agent-42'},
+    'tags': {'L': [{'S': 'inbound'}, {'S': 'priority'}]},
+    'attributes': {'M': {'queue': {'S': 'billing'}, 'transferred': {'BOOL': False}}},
+}
+
+RESPONSES = {
+    'GetItem': {'Item': ITEM},
+    'PutItem': {},
+    'Query': {'Items': [copy.deepcopy(ITEM) for _ in range(25)], 'Count': 25},
+    'BatchGetItem': {'Responses': {'bench': [copy.deepcopy(ITEM) for _ in range(100)]}},
+}
+
+
+def canned_response(model, **kwargs):
+    # Both paths transform parsed responses in place, so hand out a fresh copy each call.
+    return AWSResponse('https://dynamodb.local', 200, {}, None), copy.deepcopy(RESPONSES[model.name])
+
+
+def run(utils, iterations):
+    item = {'pk': 'contact#1', 'sk': '2024-01-01T00:00:00Z', 'duration': Decimal(125), 'agent': 'agent-42'}
+    key = {'pk': 'contact#1', 'sk': '2024-01-01T00:00:00Z'}
+    keys = [key] * 100
+    operations = {
+        'get': lambda: utils.fetch_item_by_key('bench', key),
+        'put': lambda: utils.save_item('bench', item),
+        'query': lambda: utils.find_items_by_key_condition('bench', Key('pk').eq('contact#1'), {}),
+        'batch_get': lambda: utils.fetch_multiple_items_by_keys('bench', keys),
+    }
+    results = {}
+    for name, operation in operations.items():
+        start = time.perf_counter()
+        for _ in range(iterations):
+            operation()
+        results[name] = iterations / (time.perf_counter() - start)
+    return results
+
+
+def main(iterations=2000):
+    utils = DynamoDBUtils()
+    for client in (utils.dynamodb.meta.client, utils.client):
+        client.meta.events.register('before-call.dynamodb', canned_response)
+    utils.logger.set_level('WARNING')
+    resource_results = run(utils, iterations)
+    utils.use_low_level_client = True
+    client_results = run(utils, iterations)
+    print(f"{'operation':<12}{'resource ops/s':>16}{'client ops/s':>16}{'speedup':>10}")
+    for name, resource_ops in resource_results.items():
+        client_ops = client_results[name]
+        print(f"{name:<12}{resource_ops:>16.0f}{client_ops:>16.0f}{client_ops / resource_ops:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,853 @@
+"""
+fake_aws.py: In-memory stand-ins for the S3, DynamoDB and Transcribe APIs used by the utils.
+
+FakeAWS holds the shared state and exposes client()/resource() factories with the same signatures as
+boto3.client/boto3.resource, so utils can be built against it with unittest.mock.patch. Every call
+sleeps for the configured latency (releasing the GIL, like real network I/O) and can be throttled at a
+configured rate; list/query/scan responses are cut into pages of the configured size.
+
+    aws = FakeAWS(latency=0.02, throttle_rate=0.05, page_size=100)
+    aws.create_table('contacts', 'id')
+    with patch('boto3.client', aws.client), patch('boto3.resource', aws.resource):
+        utils = DynamoDBUtils()
+"""
+import copy
+import hashlib
+import io
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from boto3.dynamodb.conditions import ConditionExpressionBuilder
+from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
+from botocore.exceptions import ClientError, ParamValidationError
+
+
+def client_error(code, message, operation_name, status_code=400):
+    return ClientError({'Error': {'Code': code, 'Message': message},
+                        'ResponseMetadata': {'HTTPStatusCode': status_code}}, operation_name)
+
+
+class FakeAWS:
+    """
+    Shared in-memory backend with latency, throttling and paging controls.
+    """
+    def __init__(self, latency=0.0, jitter=0.0, throttle_rate=0.0, page_size=1000,
+                 transcribe_polls_to_complete=0, seed=None):
+        """
+        Initialize the backend.
+        Args:
+            latency (float, optional): Seconds each call takes.
+            jitter (float, optional): Extra random seconds, uniform in [0, jitter], added to each call.
+            throttle_rate (float, optional): Probability a call is throttled; batch calls instead
+                return each entry as unprocessed with this probability.
+            page_size (int, optional): Maximum items per list/query/scan page.
+            transcribe_polls_to_complete (int, optional): get_transcription_job calls before a job completes.
+            seed (int, optional): Seed for the latency and throttling random generator.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.page_size = page_size
+        self.transcribe_polls_to_complete = transcribe_polls_to_complete
+        self.random = random.Random(seed)
+        self.lock = threading.RLock()
+        self.call_counts = {}
+        self.buckets = {}
+        self.tables = {}
+        self.transcription_jobs = {}
+        self._clients = {}
+
+    def client(self, service_name, region_name=None, **kwargs):
+        """
+        Drop-in replacement for boto3.client.
+        """
+        with self.lock:
+            if service_name not in self._clients:
+                factories = {
+                    's3': FakeS3Client,
+                    'dynamodb': FakeDynamoDBClient,
+                    'transcribe': FakeTranscribeClient,
+                }
+                if service_name not in factories:
+                    raise ValueError(f"FakeAWS does not implement {service_name}")
+                self._clients[service_name] = factories[service_name](self, region_name)
+            return self._clients[service_name]
+
+    def resource(self, service_name, region_name=None, **kwargs):
+        """
+        Drop-in replacement for boto3.resource (DynamoDB only).
+        """
+        if service_name != 'dynamodb':
+            raise ValueError(f"FakeAWS does not implement a {service_name} resource")
+        return FakeDynamoDBResource(self.client('dynamodb', region_name))
+
+    def create_bucket(self, bucket):
+        with self.lock:
+            self.buckets.setdefault(bucket, {})
+
+    def create_table(self, table_name, hash_key, range_key=None):
+        with self.lock:
+            key_schema = [{'AttributeName': hash_key, 'KeyType': 'HASH'}]
+            if range_key:
+                key_schema.append({'AttributeName': range_key, 'KeyType': 'RANGE'})
+            self.tables[table_name] = {'KeySchema': key_schema, 'Items': {}}
+
+    def call(self, operation_name, throttle_code='ThrottlingException', throttle=True):
+        """
+        Account for one API call: count it, sleep for its latency and maybe throttle it.
+        """
+        with self.lock:
+            self.call_counts[operation_name] = self.call_counts.get(operation_name, 0) + 1
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+            throttled = throttle and self.throttle_rate and self.random.random() < self.throttle_rate
+        if delay:
+            time.sleep(delay)
+        if throttled:
+            raise client_error(throttle_code, 'Rate exceeded', operation_name)
+
+    def unprocessed(self):
+        with self.lock:
+            return bool(self.throttle_rate) and self.random.random() < self.throttle_rate
+
+
+class FakeMeta:
+    def __init__(self, region_name, client=None):
+        self.region_name = region_name or 'us-east-1'
+        self.client = client
+
+
+# ---------------------------------------------------------------------------------------------- S3
+
+class FakeStreamingBody(io.BytesIO):
+    """
+    Minimal botocore StreamingBody stand-in.
+    """
+    def iter_chunks(self, chunk_size=1024):
+        while True:
+            chunk = self.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+class FakeS3Client:
+    def __init__(self, aws, region_name=None):
+        self.aws = aws
+        self.meta = FakeMeta(region_name)
+
+    def _bucket(self, bucket, operation_name):
+        if bucket not in self.aws.buckets:
+            raise client_error('NoSuchBucket', f"Bucket {bucket} does not exist", operation_name, 404)
+        return self.aws.buckets[bucket]
+
+    def put_object(self, Bucket, Key, Body=b'', Metadata=None, **kwargs):
+        self.aws.call('PutObject', throttle_code='SlowDown')
+        body = Body.encode('utf-8') if isinstance(Body, str) else Body.read() if hasattr(Body, 'read') else Body
+        etag = f'"{hashlib.md5(body).hexdigest()}"'  # nosec B324 - mirrors the S3 ETag format
+        with self.aws.lock:
+            self._bucket(Bucket, 'PutObject')[Key] = {
+                'Body': body,
+                'ETag': etag,
+                'Metadata': dict(Metadata or {}),
+                'LastModified': datetime.now(timezone.utc),
+                'Checksums': {name: value for name, value in kwargs.items() if name.startswith('Checksum')
+                              and name != 'ChecksumAlgorithm'},
+            }
+        return {'ETag': etag, 'ResponseMetadata': {'HTTPStatusCode': 200}}
+
+    def _object(self, Bucket, Key, operation_name):
+        with self.aws.lock:
+            obj = self._bucket(Bucket, operation_name).get(Key)
+        if obj is None:
+            code = 'NoSuchKey' if operation_name == 'GetObject' else '404'
+            raise client_error(code, f"Key {Key} does not exist", operation_name, 404)
+        return obj
+
+    @staticmethod
+    def _object_response(obj, checksum_mode=None):
+        response = {
+            'ContentLength': len(obj['Body']),
+            'ETag': obj['ETag'],
+            'Metadata': dict(obj['Metadata']),
+            'LastModified': obj['LastModified'],
+            'ResponseMetadata': {'HTTPStatusCode': 200},
+        }
+        if checksum_mode == 'ENABLED':
+            response.update(obj.get('Checksums', {}))
+        return response
+
+    def get_object(self, Bucket, Key, **kwargs):
+        self.aws.call('GetObject', throttle_code='SlowDown')
+        obj = self._object(Bucket, Key, 'GetObject')
+        response = self._object_response(obj, kwargs.get('ChecksumMode'))
+        response['Body'] = FakeStreamingBody(obj['Body'])
+        return response
+
+    def head_object(self, Bucket, Key, **kwargs):
+        self.aws.call('HeadObject', throttle_code='SlowDown')
+        return self._object_response(self._object(Bucket, Key, 'HeadObject'), kwargs.get('ChecksumMode'))
+
+    def delete_object(self, Bucket, Key, **kwargs):
+        self.aws.call('DeleteObject', throttle_code='SlowDown')
+        with self.aws.lock:
+            self._bucket(Bucket, 'DeleteObject').pop(Key, None)
+        return {'ResponseMetadata': {'HTTPStatusCode': 204}}
+
+    def list_objects_v2(self, Bucket, Prefix='', MaxKeys=1000, ContinuationToken=None, StartAfter=None, **kwargs):
+        self.aws.call('ListObjectsV2', throttle_code='SlowDown')
+        with self.aws.lock:
+            keys = sorted(key for key in self._bucket(Bucket, 'ListObjectsV2') if key.startswith(Prefix or ''))
+            start_after = ContinuationToken or StartAfter
+            if start_after:
+                keys = [key for key in keys if key > start_after]
+            page = keys[:min(MaxKeys, self.aws.page_size)]
+            contents = [{'Key': key, 'Size': len(self.aws.buckets[Bucket][key]['Body']),
+                         'ETag': self.aws.buckets[Bucket][key]['ETag'],
+                         'LastModified': self.aws.buckets[Bucket][key]['LastModified']} for key in page]
+        response = {'Name': Bucket, 'Prefix': Prefix or '', 'KeyCount': len(contents),
+                    'IsTruncated': len(keys) > len(page), 'ResponseMetadata': {'HTTPStatusCode': 200}}
+        if contents:
+            response['Contents'] = contents
+        if response['IsTruncated']:
+            response['NextContinuationToken'] = page[-1]
+        return response
+
+
+# ---------------------------------------------------------------------------------------- DynamoDB
+
+_TOKEN = re.compile(r'\s*(<>|<=|>=|=|<|>|\(|\)|,|\+|-|:\w+|[#A-Za-z_]\w*(?:\.[#A-Za-z_]\w*)*)')
+_KEYWORDS = {'AND', 'OR', 'NOT', 'BETWEEN', 'IN'}
+_deserializer = TypeDeserializer()
+_serializer = TypeSerializer()
+
+
+def _tokenize(expression):
+    tokens, position = [], 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if not match:
+            raise ValueError(f"Unsupported expression syntax at: {expression[position:]}")
+        tokens.append(match.group(1))
+        position = match.end()
+    return tokens
+
+
+class _Expression:
+    """
+    Parses condition, key condition and filter expressions into a callable over deserialized items.
+    Supports comparisons, BETWEEN, IN, AND/OR/NOT, parentheses and the begins_with, contains,
+    attribute_exists and attribute_not_exists functions.
+    """
+    def __init__(self, expression, names=None, values=None):
+        self.names = names or {}
+        self.values = {k: _deserializer.deserialize(v) for k, v in (values or {}).items()}
+        self.tokens = _tokenize(expression)
+        self.position = 0
+        self.evaluate = self._or()
+        if self.position != len(self.tokens):
+            raise ValueError(f"Unexpected token {self.tokens[self.position]} in {expression}")
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _take(self, expected=None):
+        token = self._peek()
+        if expected is not None and (token or '').upper() != expected:
+            raise ValueError(f"Expected {expected}, got {token}")
+        self.position += 1
+        return token
+
+    def _or(self):
+        left = self._and()
+        while (self._peek() or '').upper() == 'OR':
+            self._take()
+            right = self._and()
+            left = (lambda a, b: lambda item: a(item) or b(item))(left, right)
+        return left
+
+    def _and(self):
+        left = self._not()
+        while (self._peek() or '').upper() == 'AND':
+            self._take()
+            right = self._not()
+            left = (lambda a, b: lambda item: a(item) and b(item))(left, right)
+        return left
+
+    def _not(self):
+        if (self._peek() or '').upper() == 'NOT':
+            self._take()
+            inner = self._not()
+            return lambda item: not inner(item)
+        return self._primary()
+
+    def _primary(self):
+        if self._peek() == '(':
+            self._take()
+            inner = self._or()
+            self._take(')')
+            return inner
+        token = self._peek()
+        if token in ('begins_with', 'contains', 'attribute_exists', 'attribute_not_exists'):
+            return self._function()
+        left = self._operand()
+        operator = self._take()
+        if operator.upper() == 'BETWEEN':
+            low = self._operand()
+            self._take('AND')
+            high = self._operand()
+            return lambda item: _compare(low(item), '<=', left(item)) and _compare(left(item), '<=', high(item))
+        if operator.upper() == 'IN':
+            self._take('(')
+            options = [self._operand()]
+            while self._peek() == ',':
+                self._take()
+                options.append(self._operand())
+            self._take(')')
+            return lambda item: any(left(item) == option(item) for option in options)
+        right = self._operand()
+        return lambda item: _compare(left(item), operator, right(item))
+
+    def _function(self):
+        name = self._take()
+        self._take('(')
+        arguments = [self._operand()]
+        while self._peek() == ',':
+            self._take()
+            arguments.append(self._operand())
+        self._take(')')
+        if name == 'attribute_exists':
+            return lambda item: arguments[0](item) is not _MISSING
+        if name == 'attribute_not_exists':
+            return lambda item: arguments[0](item) is _MISSING
+        if name == 'begins_with':
+            return lambda item: isinstance(arguments[0](item), (str, bytes)) and arguments[0](item).startswith(
+                arguments[1](item))
+        return lambda item: arguments[0](item) is not _MISSING and arguments[1](item) in arguments[0](item)
+
+    def _operand(self):
+        token = self._take()
+        if token is None or token.upper() in _KEYWORDS:
+            raise ValueError(f"Expected operand, got {token}")
+        if token.startswith(':'):
+            value = self.values[token]
+            return lambda item: value
+        path = [self.names.get(segment, segment) for segment in token.split('.')]
+        return lambda item: _resolve(item, path)
+
+    def path(self):
+        """
+        Return the attribute path of a single-operand expression (used by update expressions).
+        """
+        return [self.names.get(segment, segment) for segment in self.tokens[0].split('.')]
+
+
+class _Missing:
+    pass
+
+
+_MISSING = _Missing()
+
+
+def _resolve(item, path):
+    value = item
+    for segment in path:
+        if not isinstance(value, dict) or segment not in value:
+            return _MISSING
+        value = value[segment]
+    return value
+
+
+def _compare(left, operator, right):
+    if left is _MISSING or right is _MISSING:
+        return operator == '<>' and (left is _MISSING) != (right is _MISSING)
+    if operator == '=':
+        return left == right
+    if operator == '<>':
+        return left != right
+    try:
+        return {'<': left < right, '<=': left <= right, '>': left > right, '>=': left >= right}[operator]
+    except TypeError:
+        return False
+
+
+def _apply_update(item, update_expression, names, values):
+    """
+    Apply SET, ADD and REMOVE clauses to a deserialized item in place.
+    Returns:
+        set: Top-level attribute names that were updated.
+    """
+    values = {k: _deserializer.deserialize(v) for k, v in (values or {}).items()}
+    names = names or {}
+    updated = set()
+    clauses = re.split(r'\b(SET|ADD|REMOVE|DELETE)\b', update_expression, flags=re.IGNORECASE)
+    for action, body in zip(clauses[1::2], clauses[2::2]):
+        action = action.upper()
+        for part in _split_top_level(body):
+            if action == 'SET':
+                target, value_expression = (side.strip() for side in part.split('=', 1))
+                path = [names.get(segment, segment) for segment in target.split('.')]
+                _set_path(item, path, _evaluate_set_value(item, value_expression, names, values))
+            elif action == 'ADD':
+                target, value_name = part.split()
+                path = [names.get(segment, segment) for segment in target.split('.')]
+                current = _resolve(item, path)
+                addend = values[value_name]
+                if current is _MISSING:
+                    current = set() if isinstance(addend, set) else Decimal(0)
+                _set_path(item, path, current | addend if isinstance(addend, set) else current + addend)
+            elif action == 'REMOVE':
+                path = [names.get(segment, segment) for segment in part.split('.')]
+                parent = _resolve(item, path[:-1]) if len(path) > 1 else item
+                if isinstance(parent, dict):
+                    parent.pop(path[-1], None)
+            else:
+                target, value_name = part.split()
+                path = [names.get(segment, segment) for segment in target.split('.')]
+                current = _resolve(item, path)
+                if isinstance(current, set):
+                    _set_path(item, path, current - values[value_name])
+            updated.add(path[0])
+    return updated
+
+
+def _split_top_level(body):
+    parts, depth, current = [], 0, ''
+    for char in body:
+        if char == ',' and depth == 0:
+            parts.append(current.strip())
+            current = ''
+            continue
+        depth += char == '('
+        depth -= char == ')'
+        current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+def _evaluate_set_value(item, expression, names, values):
+    match = re.fullmatch(r'if_not_exists\(\s*([^,]+?)\s*,\s*(.+?)\s*\)', expression)
+    if match:
+        path = [names.get(segment, segment) for segment in match.group(1).split('.')]
+        current = _resolve(item, path)
+        return current if current is not _MISSING else _evaluate_set_value(item, match.group(2), names, values)
+    for operator in ('+', '-'):
+        if operator in expression:
+            left, right = expression.split(operator, 1)
+            left = _evaluate_set_value(item, left.strip(), names, values)
+            right = _evaluate_set_value(item, right.strip(), names, values)
+            return left + right if operator == '+' else left - right
+    if expression.startswith(':'):
+        return values[expression]
+    value = _resolve(item, [names.get(segment, segment) for segment in expression.split('.')])
+    if value is _MISSING:
+        raise client_error('ValidationException', f"Attribute {expression} does not exist", 'UpdateItem')
+    return value
+
+
+def _set_path(item, path, value):
+    target = item
+    for segment in path[:-1]:
+        target = target.setdefault(segment, {})
+    target[path[-1]] = value
+
+
+def _key_part(value):
+    (type_name, raw), = _serializer.serialize(value).items()
+    if type_name == 'N':
+        return type_name, Decimal(raw)
+    if type_name == 'B':
+        return type_name, bytes(raw)
+    return type_name, raw
+
+
+def _to_plain(raw_item):
+    return {k: _deserializer.deserialize(v) for k, v in raw_item.items()}
+
+
+def _to_raw(item):
+    return {k: _serializer.serialize(v) for k, v in item.items()}
+
+
+class FakeDynamoDBClient:
+    """
+    In-memory low-level DynamoDB client. Items are stored deserialized and converted on the way in and out.
+    """
+    def __init__(self, aws, region_name=None):
+        self.aws = aws
+        self.meta = FakeMeta(region_name)
+
+    def _table(self, table_name, operation_name):
+        table = self.aws.tables.get(table_name)
+        if table is None:
+            raise client_error('ResourceNotFoundException', f"Table {table_name} not found", operation_name)
+        return table
+
+    def _key(self, table, item):
+        # (type, value) per key attribute: hashable for binary keys, and numbers sort numerically.
+        try:
+            return tuple(_key_part(item[key['AttributeName']]) for key in table['KeySchema'])
+        except KeyError as e:
+            raise client_error('ValidationException', f"Missing key attribute {e}", 'KeyCheck')
+
+    def _check_condition(self, existing, kwargs, operation_name):
+        if kwargs.get('ConditionExpression'):
+            condition = _Expression(kwargs['ConditionExpression'], kwargs.get('ExpressionAttributeNames'),
+                                    kwargs.get('ExpressionAttributeValues'))
+            if not condition.evaluate(existing or {}):
+                raise client_error('ConditionalCheckFailedException', 'The conditional request failed', operation_name)
+
+    def describe_table(self, TableName):
+        self.aws.call('DescribeTable', throttle=False)
+        table = self._table(TableName, 'DescribeTable')
+        return {'Table': {'TableName': TableName, 'KeySchema': table['KeySchema'], 'TableStatus': 'ACTIVE',
+                          'ItemCount': len(table['Items'])}}
+
+    def get_item(self, TableName, Key, **kwargs):
+        self.aws.call('GetItem', 'ProvisionedThroughputExceededException')
+        with self.aws.lock:
+            table = self._table(TableName, 'GetItem')
+            item = table['Items'].get(self._key(table, _to_plain(Key)))
+            return {'Item': _to_raw(item)} if item is not None else {}
+
+    def put_item(self, TableName, Item, ReturnValues='NONE', **kwargs):
+        self.aws.call('PutItem', 'ProvisionedThroughputExceededException')
+        with self.aws.lock:
+            table = self._table(TableName, 'PutItem')
+            item = _to_plain(Item)
+            key = self._key(table, item)
+            existing = table['Items'].get(key)
+            self._check_condition(existing, kwargs, 'PutItem')
+            table['Items'][key] = item
+        return {'Attributes': _to_raw(existing)} if ReturnValues == 'ALL_OLD' and existing else {}
+
+    def delete_item(self, TableName, Key, ReturnValues='NONE', **kwargs):
+        self.aws.call('DeleteItem', 'ProvisionedThroughputExceededException')
+        with self.aws.lock:
+            table = self._table(TableName, 'DeleteItem')
+            key = self._key(table, _to_plain(Key))
+            existing = table['Items'].get(key)
+            self._check_condition(existing, kwargs, 'DeleteItem')
+            table['Items'].pop(key, None)
+        return {'Attributes': _to_raw(existing)} if ReturnValues == 'ALL_OLD' and existing else {}
+
+    def update_item(self, TableName, Key, UpdateExpression, ReturnValues='NONE', **kwargs):
+        self.aws.call('UpdateItem', 'ProvisionedThroughputExceededException')
+        with self.aws.lock:
+            table = self._table(TableName, 'UpdateItem')
+            plain_key = _to_plain(Key)
+            key = self._key(table, plain_key)
+            existing = table['Items'].get(key)
+            self._check_condition(existing, kwargs, 'UpdateItem')
+            item = copy.deepcopy(existing or plain_key)
+            updated = _apply_update(item, UpdateExpression, kwargs.get('ExpressionAttributeNames'),
+                                    kwargs.get('ExpressionAttributeValues'))
+            table['Items'][key] = item
+        if ReturnValues == 'ALL_NEW':
+            return {'Attributes': _to_raw(item)}
+        if ReturnValues == 'ALL_OLD' and existing:
+            return {'Attributes': _to_raw(existing)}
+        if ReturnValues == 'UPDATED_NEW':
+            return {'Attributes': _to_raw({k: item[k] for k in updated if k in item})}
+        if ReturnValues == 'UPDATED_OLD' and existing:
+            return {'Attributes': _to_raw({k: existing[k] for k in updated if k in existing})}
+        return {}
+
+    def _read_page(self, table, kwargs, key_condition=None):
+        items = sorted(table['Items'].items(), key=lambda entry: entry[0])
+        if not kwargs.get('ScanIndexForward', True):
+            items.reverse()
+        if key_condition is not None:
+            items = [(key, item) for key, item in items if key_condition.evaluate(item)]
+        if kwargs.get('ExclusiveStartKey'):
+            start = self._key(table, _to_plain(kwargs['ExclusiveStartKey']))
+            positions = [key for key, _ in items]
+            items = items[positions.index(start) + 1:] if start in positions else []
+        limit = min(kwargs.get('Limit') or self.aws.page_size, self.aws.page_size)
+        page, remaining = items[:limit], items[limit:]
+        scanned = [item for _, item in page]
+        if kwargs.get('FilterExpression'):
+            filter_expression = _Expression(kwargs['FilterExpression'], kwargs.get('ExpressionAttributeNames'),
+                                            kwargs.get('ExpressionAttributeValues'))
+            matched = [item for item in scanned if filter_expression.evaluate(item)]
+        else:
+            matched = scanned
+        if kwargs.get('ProjectionExpression'):
+            paths = [[kwargs.get('ExpressionAttributeNames', {}).get(segment, segment)
+                      for segment in path.strip().split('.')] for path in kwargs['ProjectionExpression'].split(',')]
+            matched = [self._project(item, paths) for item in matched]
+        response = {'Count': len(matched), 'ScannedCount': len(scanned)}
+        if kwargs.get('Select') != 'COUNT':
+            response['Items'] = [_to_raw(item) for item in matched]
+        if remaining and page:
+            last = page[-1][1]
+            response['LastEvaluatedKey'] = _to_raw({k['AttributeName']: last[k['AttributeName']]
+                                                    for k in table['KeySchema']})
+        return response
+
+    @staticmethod
+    def _project(item, paths):
+        projected = {}
+        for path in paths:
+            value = _resolve(item, path)
+            if value is not _MISSING:
+                _set_path(projected, path, value)
+        return projected
+
+    def query(self, TableName, KeyConditionExpression, **kwargs):
+        self.aws.call('Query', 'ProvisionedThroughputExceededException')
+        with self.aws.lock:
+            table = self._table(TableName, 'Query')
+            key_condition = _Expression(KeyConditionExpression, kwargs.get('ExpressionAttributeNames'),
+                                        kwargs.get('ExpressionAttributeValues'))
+            return self._read_page(table, kwargs, key_condition)
+
+    def scan(self, TableName, **kwargs):
+        self.aws.call('Scan', 'ProvisionedThroughputExceededException')
+        with self.aws.lock:
+            return self._read_page(self._table(TableName, 'Scan'), kwargs)
+
+    def batch_get_item(self, RequestItems, **kwargs):
+        self.aws.call('BatchGetItem', 'ProvisionedThroughputExceededException')
+        if sum(len(request['Keys']) for request in RequestItems.values()) > 100:
+            raise client_error('ValidationException', 'Too many items requested for the BatchGetItem call',
+                               'BatchGetItem')
+        responses, unprocessed = {}, {}
+        with self.aws.lock:
+            for table_name, request in RequestItems.items():
+                table = self._table(table_name, 'BatchGetItem')
+                responses.setdefault(table_name, [])
+                for key in request['Keys']:
+                    if self.aws.unprocessed():
+                        unprocessed.setdefault(table_name, {'Keys': []})['Keys'].append(key)
+                        continue
+                    item = table['Items'].get(self._key(table, _to_plain(key)))
+                    if item is not None:
+                        responses[table_name].append(_to_raw(item))
+        return {'Responses': responses, 'UnprocessedKeys': unprocessed}
+
+    def batch_write_item(self, RequestItems, **kwargs):
+        self.aws.call('BatchWriteItem', 'ProvisionedThroughputExceededException')
+        if sum(len(requests) for requests in RequestItems.values()) > 25:
+            raise client_error('ValidationException', 'Too many items requested for the BatchWriteItem call',
+                               'BatchWriteItem')
+        unprocessed = {}
+        with self.aws.lock:
+            for table_name, requests in RequestItems.items():
+                table = self._table(table_name, 'BatchWriteItem')
+                for request in requests:
+                    if self.aws.unprocessed():
+                        unprocessed.setdefault(table_name, []).append(request)
+                    elif 'PutRequest' in request:
+                        item = _to_plain(request['PutRequest']['Item'])
+                        table['Items'][self._key(table, item)] = item
+                    else:
+                        table['Items'].pop(self._key(table, _to_plain(request['DeleteRequest']['Key'])), None)
+        return {'UnprocessedItems': unprocessed}
+
+
+class FakeTable:
+    """
+    Resource-style Table adapter over FakeDynamoDBClient, converting Python values and boto3
+    condition objects the same way the boto3 resource layer does.
+    """
+    def __init__(self, client, table_name):
+        self.client = client
+        self.name = table_name
+
+    @property
+    def key_schema(self):
+        return self.client.describe_table(TableName=self.name)['Table']['KeySchema']
+
+    def _request(self, kwargs):
+        request = {'TableName': self.name}
+        for param, value in kwargs.items():
+            if value is None:
+                # boto3 rejects explicit None parameters instead of dropping them.
+                raise ParamValidationError(report=f"Invalid type for parameter {param}, value: None")
+        builder = ConditionExpressionBuilder()
+        names = dict(kwargs.pop('ExpressionAttributeNames', None) or {})
+        values = dict(kwargs.pop('ExpressionAttributeValues', None) or {})
+        for param in ('KeyConditionExpression', 'FilterExpression', 'ConditionExpression'):
+            expression = kwargs.pop(param, None)
+            if expression is None:
+                continue
+            if isinstance(expression, str):
+                request[param] = expression
+                continue
+            built = builder.build_expression(expression, is_key_condition=param == 'KeyConditionExpression')
+            request[param] = built.condition_expression
+            names.update(built.attribute_name_placeholders)
+            values.update(built.attribute_value_placeholders)
+        for param in ('Key', 'Item', 'ExclusiveStartKey'):
+            if param in kwargs:
+                request[param] = _to_raw(kwargs.pop(param))
+        if names:
+            request['ExpressionAttributeNames'] = names
+        if values:
+            request['ExpressionAttributeValues'] = _to_raw(values)
+        request.update(kwargs)
+        return request
+
+    @staticmethod
+    def _response(response):
+        for param in ('Item', 'Attributes', 'LastEvaluatedKey'):
+            if param in response:
+                response[param] = _to_plain(response[param])
+        if 'Items' in response:
+            response['Items'] = [_to_plain(item) for item in response['Items']]
+        return response
+
+    def get_item(self, **kwargs):
+        return self._response(self.client.get_item(**self._request(kwargs)))
+
+    def put_item(self, **kwargs):
+        return self._response(self.client.put_item(**self._request(kwargs)))
+
+    def delete_item(self, **kwargs):
+        return self._response(self.client.delete_item(**self._request(kwargs)))
+
+    def update_item(self, **kwargs):
+        return self._response(self.client.update_item(**self._request(kwargs)))
+
+    def query(self, **kwargs):
+        return self._response(self.client.query(**self._request(kwargs)))
+
+    def scan(self, **kwargs):
+        return self._response(self.client.scan(**self._request(kwargs)))
+
+    def batch_writer(self):
+        return FakeBatchWriter(self.client, self.name)
+
+
+class FakeBatchWriter:
+    """
+    Buffers writes in 25-item batch_write_item calls and resends unprocessed items, like boto3's BatchWriter.
+    """
+    def __init__(self, client, table_name):
+        self.client = client
+        self.table_name = table_name
+        self.requests = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        while self.requests:
+            self._flush()
+        return False
+
+    def put_item(self, Item):
+        self.requests.append({'PutRequest': {'Item': _to_raw(Item)}})
+        if len(self.requests) >= 25:
+            self._flush()
+
+    def delete_item(self, Key):
+        self.requests.append({'DeleteRequest': {'Key': _to_raw(Key)}})
+        if len(self.requests) >= 25:
+            self._flush()
+
+    def _flush(self):
+        batch, self.requests = self.requests[:25], self.requests[25:]
+        response = self.client.batch_write_item(RequestItems={self.table_name: batch})
+        self.requests.extend(response.get('UnprocessedItems', {}).get(self.table_name, []))
+
+
+class FakeDynamoDBResource:
+    def __init__(self, client):
+        self.meta = FakeMeta(client.meta.region_name, client)
+
+    def Table(self, table_name):
+        return FakeTable(self.meta.client, table_name)
+
+    def batch_get_item(self, RequestItems, **kwargs):
+        request = {table_name: dict(params, Keys=[_to_raw(key) for key in params['Keys']])
+                   for table_name, params in RequestItems.items()}
+        response = self.meta.client.batch_get_item(RequestItems=request)
+        response['Responses'] = {table_name: [_to_plain(item) for item in items]
+                                 for table_name, items in response['Responses'].items()}
+        response['UnprocessedKeys'] = {table_name: dict(params, Keys=[_to_plain(key) for key in params['Keys']])
+                                       for table_name, params in response['UnprocessedKeys'].items()}
+        return response
+
+
+# -------------------------------------------------------------------------------------- Transcribe
+
+class FakeTranscribeClient:
+    """
+    In-memory Transcribe client. Jobs complete after the configured number of status polls and write
+    a redacted transcript JSON to the output bucket when that bucket exists in the fake S3.
+    """
+    def __init__(self, aws, region_name=None):
+        self.aws = aws
+        self.meta = FakeMeta(region_name)
+
+    def start_transcription_job(self, TranscriptionJobName, Media, OutputBucketName=None, **kwargs):
+        self.aws.call('StartTranscriptionJob')
+        with self.aws.lock:
+            if TranscriptionJobName in self.aws.transcription_jobs:
+                raise client_error('ConflictException', f"Job {TranscriptionJobName} already exists",
+                                   'StartTranscriptionJob')
+            job = {
+                'TranscriptionJobName': TranscriptionJobName,
+                'TranscriptionJobStatus': 'IN_PROGRESS',
+                'Media': Media,
+                'OutputBucketName': OutputBucketName,
+                'OutputKey': kwargs.get('OutputKey'),
+                'LanguageCode': kwargs.get('LanguageCode'),
+                'ContentRedaction': kwargs.get('ContentRedaction'),
+                'Polls': 0,
+            }
+            self.aws.transcription_jobs[TranscriptionJobName] = job
+            if self.aws.transcribe_polls_to_complete == 0:
+                self._complete(job)
+            return {'TranscriptionJob': self._public(job)}
+
+    def get_transcription_job(self, TranscriptionJobName):
+        self.aws.call('GetTranscriptionJob')
+        with self.aws.lock:
+            job = self.aws.transcription_jobs.get(TranscriptionJobName)
+            if job is None:
+                raise client_error('BadRequestException', f"Job {TranscriptionJobName} not found",
+                                   'GetTranscriptionJob')
+            job['Polls'] += 1
+            if job['TranscriptionJobStatus'] == 'IN_PROGRESS' and job['Polls'] >= self.aws.transcribe_polls_to_complete:
+                self._complete(job)
+            return {'TranscriptionJob': self._public(job)}
+
+    def delete_transcription_job(self, TranscriptionJobName):
+        self.aws.call('DeleteTranscriptionJob')
+        with self.aws.lock:
+            self.aws.transcription_jobs.pop(TranscriptionJobName, None)
+        return {'ResponseMetadata': {'HTTPStatusCode': 200}}
+
+    def _complete(self, job):
+        job['TranscriptionJobStatus'] = 'COMPLETED'
+        bucket = job['OutputBucketName']
+        if bucket not in self.aws.buckets:
+            return
+        key = job['OutputKey'] or f"redacted-{job['TranscriptionJobName']}.json"
+        if key.endswith('/'):
+            key = f"{key}redacted-{job['TranscriptionJobName']}.json"
+        transcript = {'jobName': job['TranscriptionJobName'], 'results': {
+            'transcripts': [{'transcript': '[PII] transcript'}],
+            'items': [
+                {'type': 'pronunciation', 'start_time': '0.0', 'end_time': '0.5',
+                 'alternatives': [{'content': '[PII]', 'confidence': '0.0'}]},
+                {'type': 'pronunciation', 'start_time': '0.5', 'end_time': '1.0',
+                 'alternatives': [{'content': 'transcript', 'confidence': '0.99'}]},
+            ]}}
+        self.aws.buckets[bucket][key] = {
+            'Body': json.dumps(transcript).encode('utf-8'), 'ETag': '"transcript"', 'Metadata': {},
+            'LastModified': datetime.now(timezone.utc), 'Checksums': {},
+        }
+        job['Transcript'] = {'RedactedTranscriptFileUri': f"https://s3.amazonaws.com/{bucket}/{key}"}
+
+    @staticmethod
+    def _public(job):
+        return {k: v for k, v in job.items() if k not in ('Polls', 'OutputBucketName', 'OutputKey')}
@@ -0,0 +1,184 @@
+"""
+harness.py: Throughput benchmark for S3Utils, DynamoDBUtils and TranscribeUtils against the in-memory fakes.
+
+Each scenario runs a util method a fixed number of times across a thread pool, once per concurrency
+level, and reports ops/sec (and items/sec for batching scenarios) with p50/p95/p99 latency. Batching
+scenarios write the same number of items one call at a time, in bulk, through write-behind and through
+a batch session, so the paths can be compared before they are rolled out. Run with PYTHONPATH=src:
+    python src/test/benchmark/harness.py --latency-ms 20 --concurrency 1,8,32 --ops 200
+"""
+import argparse
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from boto3.dynamodb.conditions import Key
+from fake_aws import FakeAWS
+from strategies.utils.dynamodb_utils import DynamoDBUtils
+from strategies.utils.s3_utils import S3Utils
+from strategies.utils.transcribe_utils import TranscribeUtils
+
+BUCKET = 'bench-bucket'
+TABLE = 'bench-table'
+BATCH_ITEMS = 100
+
+
+class Scenario:
+    """
+    A named benchmark: build() returns the util under test, run(util, i) performs operation i.
+    """
+    def __init__(self, name, build, run, setup=None, items_per_op=1):
+        self.name = name
+        self.build = build
+        self.run = run
+        self.setup = setup
+        self.items_per_op = items_per_op
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+
+def run_scenario(scenario, aws, concurrency, ops):
+    """
+    Run one scenario at one concurrency level.
+    Returns:
+        dict: ops_per_sec, items_per_sec, p50/p95/p99 latency in milliseconds and error count.
+    """
+    # Keep the fakes patched for the whole run: some clients are created lazily on first use.
+    with patch('boto3.client', aws.client), patch('boto3.resource', aws.resource):
+        util = scenario.build()
+        if scenario.setup:
+            throttle_rate, aws.throttle_rate = aws.throttle_rate, 0.0
+            scenario.setup(util, ops)
+            aws.throttle_rate = throttle_rate
+        latencies, errors = [], 0
+
+        def timed(i):
+            start = time.perf_counter()
+            try:
+                scenario.run(util, i)
+                return time.perf_counter() - start, None
+            except Exception as e:
+                return time.perf_counter() - start, e
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for latency, error in executor.map(timed, range(ops)):
+                latencies.append(latency)
+                errors += error is not None
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'ops_per_sec': ops / elapsed,
+        'items_per_sec': ops * scenario.items_per_op / elapsed,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'errors': errors,
+    }
+
+
+def seed_objects(util, ops):
+    for i in range(ops):
+        util.put_object(BUCKET, f"bench/{i}", b'x' * 1024)
+
+
+def seed_items(util, ops):
+    util.bulk_save_or_remove_items(TABLE, put_items=[{'pk': f"p{i % 10}", 'sk': f"{i:08d}", 'v': i}
+                                                     for i in range(max(ops, BATCH_ITEMS))])
+
+
+def batch_items(i):
+    return [{'pk': f"b{i}", 'sk': f"{n:08d}", 'v': n} for n in range(BATCH_ITEMS)]
+
+
+def write_one_at_a_time(util, i):
+    for item in batch_items(i):
+        util.save_item(TABLE, item)
+
+
+def write_behind(util, i):
+    # Write-behind buffers are per thread, so each worker batches and flushes only its own writes.
+    with util.write_behind():
+        for item in batch_items(i):
+            util.save_item(TABLE, item)
+
+
+def write_batch_session(util, i):
+    with util.batch_session() as session:
+        for item in batch_items(i):
+            session.put(TABLE, item)
+
+
+def scenarios():
+    s3 = S3Utils
+    dynamodb = DynamoDBUtils
+
+    def low_level():
+        return DynamoDBUtils(use_low_level_client=True)
+
+    return [
+        Scenario('s3.put_object', s3, lambda u, i: u.put_object(BUCKET, f"bench/{i}", b'x' * 1024)),
+        Scenario('s3.get_object', s3, lambda u, i: u.get_object(BUCKET, f"bench/{i}")['Body'].read(), seed_objects),
+        Scenario('s3.list_objects', s3, lambda u, i: u.list_objects(BUCKET, 'bench/'), seed_objects),
+        Scenario('s3.delete_object', s3, lambda u, i: u.delete_object(BUCKET, f"bench/{i}"), seed_objects),
+        Scenario('ddb.fetch_item_by_key', dynamodb,
+                 lambda u, i: u.fetch_item_by_key(TABLE, {'pk': f"p{i % 10}", 'sk': f"{i:08d}"}), seed_items),
+        Scenario('ddb.fetch_item_by_key[low-level]', low_level,
+                 lambda u, i: u.fetch_item_by_key(TABLE, {'pk': f"p{i % 10}", 'sk': f"{i:08d}"}), seed_items),
+        Scenario('ddb.save_item', dynamodb, lambda u, i: u.save_item(TABLE, {'pk': 'w', 'sk': f"{i:08d}", 'v': i})),
+        Scenario('ddb.save_item[low-level]', low_level,
+                 lambda u, i: u.save_item(TABLE, {'pk': 'w', 'sk': f"{i:08d}", 'v': i})),
+        Scenario('ddb.find_items_by_key_condition', dynamodb,
+                 lambda u, i: u.find_items_by_key_condition(TABLE, Key('pk').eq(f"p{i % 10}"), {}), seed_items),
+        Scenario('ddb.fetch_multiple_items_by_keys', low_level,
+                 lambda u, i: u.fetch_multiple_items_by_keys(
+                     TABLE, [{'pk': f"p{n % 10}", 'sk': f"{n:08d}"} for n in range(BATCH_ITEMS)]),
+                 seed_items, items_per_op=BATCH_ITEMS),
+        Scenario('ddb.write x100[one-at-a-time]', dynamodb, write_one_at_a_time, items_per_op=BATCH_ITEMS),
+        Scenario('ddb.write x100[bulk_save_or_remove_items]', dynamodb,
+                 lambda u, i: u.bulk_save_or_remove_items(TABLE, put_items=batch_items(i)), items_per_op=BATCH_ITEMS),
+        Scenario('ddb.write x100[write_behind]', dynamodb, write_behind, items_per_op=BATCH_ITEMS),
+        Scenario('ddb.write x100[batch_session]', dynamodb, write_batch_session, items_per_op=BATCH_ITEMS),
+        Scenario('transcribe.start_transcription_job', TranscribeUtils,
+                 lambda u, i: u.start_transcription_job(f"bench-{time.time_ns()}-{i}", f"s3://{BUCKET}/a.wav", BUCKET)),
+        Scenario('transcribe.check_transcription_status', TranscribeUtils,
+                 lambda u, i: u.check_transcription_status(
+                     u.start_transcription_job(f"bench-{time.time_ns()}-{i}", f"s3://{BUCKET}/a.wav", BUCKET)
+                     ['TranscriptionJob']['TranscriptionJobName'])),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency-ms', type=float, default=10.0, help='Per-call latency of the fakes')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Random extra latency per call')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of calls/entries throttled')
+    parser.add_argument('--page-size', type=int, default=1000, help='Items per list/query/scan page')
+    parser.add_argument('--concurrency', default='1,8,32', help='Comma-separated thread counts')
+    parser.add_argument('--ops', type=int, default=100, help='Operations per scenario and concurrency level')
+    parser.add_argument('--only', default='', help='Run only scenarios whose name contains this text')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    # Failures are counted in the err column; keep per-call error logs out of the table.
+    logging.disable(logging.ERROR)
+
+    print(f"{'scenario':<42}{'conc':>5}{'ops/s':>10}{'items/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'err':>5}")
+    for scenario in scenarios():
+        if args.only not in scenario.name:
+            continue
+        for concurrency in (int(value) for value in args.concurrency.split(',')):
+            aws = FakeAWS(latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                          throttle_rate=args.throttle_rate, page_size=args.page_size, seed=args.seed)
+            aws.create_bucket(BUCKET)
+            aws.create_table(TABLE, 'pk', 'sk')
+            result = run_scenario(scenario, aws, concurrency, args.ops)
+            print(f"{scenario.name:<42}{concurrency:>5}{result['ops_per_sec']:>10.1f}{result['items_per_sec']:>10.1f}"
+                  f"{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}{result['p99_ms']:>9.1f}{result['errors']:>5}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+from botocore.exceptions import ClientError
+from strategies.utils import async_support
+from strategies.utils.async_support import bounded_map, bounded_gather
+from strategies.utils.s3_utils import sha256_checksum
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+class TestBoundedMap(unittest.TestCase):
+    def test_preserves_order_and_limits_concurrency(self):
+        in_flight, peak = 0, 0
+
+        async def work(item):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001 * (5 - item % 5))
+            in_flight -= 1
+            return item * 2
+        self.assertEqual(run(bounded_map(work, range(20), limit=3)), [i * 2 for i in range(20)])
+        self.assertEqual(peak, 3)
+
+    def test_raises_first_error_or_returns_exceptions(self):
+        async def work(item):
+            if item == 2:
+                raise ValueError("boom")
+            return item
+        with self.assertRaises(ValueError):
+            run(bounded_map(work, range(5), limit=2))
+        results = run(bounded_map(work, range(5), limit=2, return_exceptions=True))
+        self.assertIsInstance(results[2], ValueError)
+        self.assertEqual(results[:2], [0, 1])
+
+    def test_bounded_gather_calls_factories(self):
+        async def value(v):
+            return v
+        self.assertEqual(run(bounded_gather(lambda: value(1), lambda: value(2), limit=1)), [1, 2])
+
+    def test_missing_aioboto3_raises_import_error(self):
+        from strategies.utils.async_s3_utils import AsyncS3Utils
+        with patch.object(async_support, 'aioboto3', None):
+            with self.assertRaises(ImportError):
+                AsyncS3Utils()
+
+@unittest.skipUnless(async_support.aioboto3, "aioboto3 not installed")
+class TestAsyncClientUtils(unittest.TestCase):
+    def test_async_with_opens_and_closes_client(self):
+        from strategies.utils.async_s3_utils import AsyncS3Utils
+        session = MagicMock()
+        client_context = session.client.return_value
+        client_context.__aenter__ = AsyncMock(return_value='client')
+        client_context.__aexit__ = AsyncMock(return_value=None)
+        s3_utils = AsyncS3Utils(region_name='eu-west-1', max_concurrency=8, session=session)
+
+        async def use():
+            async with s3_utils as s3:
+                self.assertEqual(s3.s3, 'client')
+        run(use())
+        self.assertIsNone(s3_utils.s3)
+        self.assertEqual(session.client.call_args.kwargs['config'].max_pool_connections, 8)
+        client_context.__aexit__.assert_awaited_once()
+
+@unittest.skipUnless(async_support.aioboto3, "aioboto3 not installed")
+class TestAsyncS3Utils(unittest.TestCase):
+    def setUp(self):
+        from strategies.utils.async_s3_utils import AsyncS3Utils
+        self.s3_utils = AsyncS3Utils(session=MagicMock())
+        self.s3_utils.s3 = AsyncMock()
+
+    def test_get_objects_reads_bodies(self):
+        def get_object(Bucket, Key):
+            body = MagicMock()
+            body.__aenter__ = AsyncMock(return_value=body)
+            body.__aexit__ = AsyncMock(return_value=None)
+            body.read = AsyncMock(return_value=Key.encode())
+            return {'Body': body}
+        self.s3_utils.s3.get_object.side_effect = get_object
+        self.assertEqual(run(self.s3_utils.get_objects('b', ['k1', 'k2'])), [b'k1', b'k2'])
+
+    def test_put_and_delete_objects(self):
+        run(self.s3_utils.put_objects('b', {'k1': b'1', 'k2': b'2'}))
+        self.assertEqual(self.s3_utils.s3.put_object.await_count, 2)
+        run(self.s3_utils.delete_objects('b', ['k1']))
+        self.s3_utils.s3.delete_object.assert_awaited_once_with(Bucket='b', Key='k1')
+
+    def test_put_object_with_checksum_options(self):
+        checksum = sha256_checksum(b'data')
+        run(self.s3_utils.put_object('b', 'k', b'data', verify_checksum=True))
+        self.s3_utils.s3.head_object.assert_not_awaited()
+        self.assertEqual(self.s3_utils.s3.put_object.call_args.kwargs['ChecksumSHA256'], checksum)
+        self.s3_utils.s3.head_object.return_value = {'ETag': '"e"', 'ChecksumSHA256': checksum}
+        self.assertEqual(run(self.s3_utils.put_object('b', 'k', b'data', skip_if_unchanged=True)),
+                         {'Skipped': True, 'ETag': '"e"'})
+        self.s3_utils.s3.head_object.side_effect = ClientError({'Error': {'Code': '404'}}, 'HeadObject')
+        run(self.s3_utils.put_object('b', 'k', b'data', skip_if_unchanged=True))
+        self.assertEqual(self.s3_utils.s3.put_object.await_count, 2)
+        self.assertEqual(self.s3_utils.s3.put_object.call_args.kwargs['Metadata'], {'sha256': checksum})
+
+    def test_list_objects_for_prefixes_follows_pages(self):
+        pages = {None: {'Contents': [{'Key': 'a/1'}], 'IsTruncated': True, 'NextContinuationToken': 't'},
+                 't': {'Contents': [{'Key': 'a/2'}], 'IsTruncated': False}}
+        self.s3_utils.s3.list_objects_v2.side_effect = lambda **kwargs: pages[kwargs.get('ContinuationToken')]
+        self.assertEqual(run(self.s3_utils.list_objects_for_prefixes('b', ['a/'])),
+                         {'a/': [{'Key': 'a/1'}, {'Key': 'a/2'}]})
+
+@unittest.skipUnless(async_support.aioboto3, "aioboto3 not installed")
+class TestAsyncDynamoDBUtils(unittest.TestCase):
+    def setUp(self):
+        from strategies.utils.async_dynamodb_utils import AsyncDynamoDBUtils
+        self.dynamodb_utils = AsyncDynamoDBUtils(session=MagicMock())
+        self.dynamodb_utils.client = AsyncMock()
+
+    def test_fetch_item_deserializes(self):
+        self.dynamodb_utils.client.get_item.return_value = {'Item': {'id': {'S': '1'}, 'n': {'N': '2'}}}
+        response = run(self.dynamodb_utils.fetch_item_by_key('t', {'id': '1'}))
+        self.assertEqual(response['Item'], {'id': '1', 'n': 2})
+        self.dynamodb_utils.client.get_item.assert_awaited_once_with(TableName='t', Key={'id': {'S': '1'}})
+
+    def test_update_item_serializes_values(self):
+        self.dynamodb_utils.client.update_item.return_value = {'Attributes': {'v': {'N': '3'}}}
+        response = run(self.dynamodb_utils.update_item_attributes('t', {'id': '1'}, 'SET v = :v', {':v': 3}))
+        self.assertEqual(response['Attributes'], {'v': 3})
+        kwargs = self.dynamodb_utils.client.update_item.call_args.kwargs
+        self.assertEqual(kwargs['ExpressionAttributeValues'], {':v': {'N': '3'}})
+
+    def test_conditions_with_and_without_values(self):
+        run(self.dynamodb_utils.save_item('t', {'id': '1'}, 'attribute_not_exists(id)'))
+        kwargs = self.dynamodb_utils.client.put_item.call_args.kwargs
+        self.assertEqual(kwargs['ConditionExpression'], 'attribute_not_exists(id)')
+        self.assertNotIn('ExpressionAttributeValues', kwargs)
+        run(self.dynamodb_utils.remove_item_by_key('t', {'id': '1'}, 'v = :v', {':v': 1}))
+        kwargs = self.dynamodb_utils.client.delete_item.call_args.kwargs
+        self.assertEqual((kwargs['ConditionExpression'], kwargs['ExpressionAttributeValues']), ('v = :v', {':v': {'N': '1'}}))
+        with self.assertRaises(TypeError):
+            run(self.dynamodb_utils.find_items_by_key_condition('t', 'id = :id'))
+
+    def test_fetch_multiple_items_chunks_and_retries(self):
+        calls = []
+
+        def batch_get_item(RequestItems):
+            keys = RequestItems['t']['Keys']
+            calls.append(len(keys))
+            if len(calls) == 1:
+                return {'Responses': {'t': keys[:-1]}, 'UnprocessedKeys': {'t': {'Keys': keys[-1:]}}}
+            return {'Responses': {'t': keys}}
+        self.dynamodb_utils.client.batch_get_item.side_effect = batch_get_item
+        with patch('asyncio.sleep', AsyncMock()):
+            response = run(self.dynamodb_utils.fetch_multiple_items_by_keys(
+                't', [{'id': str(i)} for i in range(150)], limit=1))
+        self.assertEqual(calls, [100, 1, 50])
+        self.assertEqual(len(response['Responses']['t']), 150)
+        self.assertEqual(response['UnprocessedKeys'], {})
+
+    def test_bulk_write_chunks_and_raises_when_unprocessed(self):
+        self.dynamodb_utils.client.batch_write_item.return_value = {}
+        run(self.dynamodb_utils.bulk_save_or_remove_items('t', [{'id': str(i)} for i in range(30)], [{'id': 'x'}]))
+        self.assertEqual(self.dynamodb_utils.client.batch_write_item.await_count, 2)
+        self.dynamodb_utils.client.batch_write_item.return_value = {
+            'UnprocessedItems': {'t': [{'DeleteRequest': {'Key': {'id': {'S': 'x'}}}}]}}
+        with patch('asyncio.sleep', AsyncMock()), self.assertRaises(RuntimeError):
+            run(self.dynamodb_utils.bulk_save_or_remove_items('t', delete_keys=[{'id': 'x'}]))
+
+@unittest.skipUnless(async_support.aioboto3, "aioboto3 not installed")
+class TestAsyncTranscribeUtils(unittest.TestCase):
+    def setUp(self):
+        from strategies.utils.async_transcribe_utils import AsyncTranscribeUtils
+        self.transcribe_utils = AsyncTranscribeUtils(session=MagicMock())
+        self.transcribe_utils.transcribe = AsyncMock()
+
+    def test_wait_for_transcription_jobs_polls_until_done(self):
+        statuses = {'a': iter(['QUEUED', 'IN_PROGRESS', 'COMPLETED']), 'b': iter(['FAILED'])}
+        self.transcribe_utils.transcribe.get_transcription_job.side_effect = lambda TranscriptionJobName: {
+            'TranscriptionJob': {'TranscriptionJobName': TranscriptionJobName,
+                                 'TranscriptionJobStatus': next(statuses[TranscriptionJobName])}}
+        jobs = run(self.transcribe_utils.wait_for_transcription_jobs(['a', 'b'], poll_seconds=0))
+        self.assertEqual([job['TranscriptionJobStatus'] for job in jobs], ['COMPLETED', 'FAILED'])
+
+    def test_start_transcription_jobs_passes_output_key(self):
+        run(self.transcribe_utils.start_transcription_jobs([
+            {'transcription_job_name': 'a', 'media_file_uri': 's3://b/a.wav', 'output_bucket': 'o',
+             'output_key': 'out/a.json'}]))
+        kwargs = self.transcribe_utils.transcribe.start_transcription_job.call_args.kwargs
+        self.assertEqual(kwargs['OutputKey'], 'out/a.json')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import io
+import json
+import unittest
+import wave
+from unittest.mock import patch
+from strategies.utils.chunked_transcribe_utils import ChunkedTranscribeUtils, split_wav, merge_transcripts
+
+def make_wav(seconds, rate=100):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(rate)
+        writer.writeframes(b''.join(i.to_bytes(2, 'little') for i in range(int(seconds * rate))))
+    return buffer.getvalue()
+
+def word(content, start, end):
+    return {'type': 'pronunciation', 'start_time': str(start), 'end_time': str(end),
+            'alternatives': [{'content': content, 'confidence': '0.9'}]}
+
+def transcript(*items):
+    return {'results': {'transcripts': [{'transcript': ''}], 'items': list(items)}}
+
+class TestSplitWav(unittest.TestCase):
+    def test_chunks_overlap_and_cover_the_recording(self):
+        chunks = list(split_wav(io.BytesIO(make_wav(25)), chunk_seconds=10, overlap_seconds=2))
+        self.assertEqual([(index, offset) for index, offset, _ in chunks], [(0, 0.0), (1, 8.0), (2, 16.0)])
+        durations = []
+        for _, offset, audio in chunks:
+            with wave.open(io.BytesIO(audio)) as reader:
+                durations.append(reader.getnframes() / reader.getframerate())
+                first_sample = int.from_bytes(reader.readframes(1), 'little')
+            self.assertEqual(first_sample, int(offset * 100))
+        self.assertEqual(durations, [10.0, 10.0, 9.0])
+
+    def test_short_recording_is_one_chunk(self):
+        chunks = list(split_wav(io.BytesIO(make_wav(3)), chunk_seconds=10, overlap_seconds=2))
+        self.assertEqual(len(chunks), 1)
+
+    def test_overlap_must_be_shorter_than_chunk(self):
+        with self.assertRaises(ValueError):
+            list(split_wav(io.BytesIO(make_wav(3)), chunk_seconds=2, overlap_seconds=2))
+
+class TestMergeTranscripts(unittest.TestCase):
+    def test_offsets_and_overlap_dedup(self):
+        punctuation = {'type': 'punctuation', 'alternatives': [{'content': '.'}]}
+        merged = merge_transcripts([
+            (0, transcript(word('hello', 1, 2), word('[PII]', 8.5, 8.9), punctuation, word('again', 9.5, 9.9))),
+            (8, transcript(word('[PII]', 0.5, 0.9), punctuation, word('again', 1.5, 1.9), word('bye', 5, 6))),
+        ], overlap_seconds=2, job_name='job')
+        self.assertEqual(merged['results']['transcripts'][0]['transcript'], 'hello [PII]. again bye')
+        self.assertEqual([(i.get('start_time'), i.get('end_time')) for i in merged['results']['items']],
+                         [('1.000', '2.000'), ('8.500', '8.900'), (None, None), ('9.500', '9.900'),
+                          ('13.000', '14.000')])
+        self.assertEqual(merged['jobName'], 'job')
+
+class TestChunkedTranscribeUtils(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('boto3.client')
+        self.addCleanup(patcher.stop)
+        self.mock_client = patcher.start().return_value
+        self.utils = ChunkedTranscribeUtils(region_name='us-east-1')
+        self.mock_client.get_transcription_job.side_effect = lambda TranscriptionJobName: {'TranscriptionJob': {
+            'TranscriptionJobStatus': 'COMPLETED',
+            'Transcript': {'RedactedTranscriptFileUri':
+                           f"https://s3.us-east-1.amazonaws.com/out/transcribe-chunks/job/{TranscriptionJobName}.json"},
+        }}
+
+        def get_object(Bucket, Key):
+            if Key.endswith('.wav'):
+                return {'Body': io.BytesIO(make_wav(25))}
+            return {'Body': io.BytesIO(json.dumps(transcript(word('hi', 1, 2))).encode())}
+        self.mock_client.get_object.side_effect = get_object
+
+    def test_transcribes_chunks_in_parallel_and_merges(self):
+        result = self.utils.transcribe_wav_in_chunks('in', 'call.wav', 'out', 'job', chunk_seconds=10,
+                                                     overlap_seconds=2, poll_seconds=0)
+        self.assertEqual(result, {'TranscriptionJobStatus': 'COMPLETED', 'TranscriptKey': 'redacted-job.json',
+                                  'ChunkCount': 3})
+        self.assertEqual(self.mock_client.start_transcription_job.call_count, 3)
+        self.mock_client.start_transcription_job.assert_any_call(
+            TranscriptionJobName='job-00001', LanguageCode='en-US',
+            Media={'MediaFileUri': 's3://out/transcribe-chunks/job/chunk-00001.wav'},
+            ContentRedaction={'RedactionType': 'PII', 'RedactionOutput': 'redacted'},
+            OutputBucketName='out', OutputKey='transcribe-chunks/job/')
+        merged_put = [c for c in self.mock_client.put_object.call_args_list if c.kwargs['Key'] == 'redacted-job.json']
+        merged = json.loads(merged_put[0].kwargs['Body'])
+        self.assertEqual([i['start_time'] for i in merged['results']['items']], ['1.000', '9.000', '17.000'])
+        self.assertEqual(self.mock_client.delete_transcription_job.call_count, 3)
+        self.assertEqual(self.mock_client.delete_object.call_count, 6)
+
+    def test_failed_chunk_raises_and_cleans_up(self):
+        self.mock_client.get_transcription_job.side_effect = None
+        self.mock_client.get_transcription_job.return_value = {'TranscriptionJob': {
+            'TranscriptionJobStatus': 'FAILED', 'FailureReason': 'bad audio'}}
+        with self.assertRaises(RuntimeError):
+            self.utils.transcribe_wav_in_chunks('in', 'call.wav', 'out', 'job', chunk_seconds=10,
+                                                overlap_seconds=2, poll_seconds=0)
+        self.assertEqual(self.mock_client.delete_object.call_count, 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import dataclasses
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+from common.config import Config, ConfigError, ConfigStore, get_config, load_config, reset_config, validate
+
+class TestConfig(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.yaml')
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+
+    def write_yaml(self, text):
+        with open(self.path, 'w') as f:
+            f.write(text)
+
+    def test_defaults(self):
+        config = load_config({'CONFIG_FILE': '/missing.yaml'})
+        self.assertEqual(config, Config())
+
+    def test_environment_overrides_yaml(self):
+        self.write_yaml("aws_region: eu-west-1\ntarget_output_bucket: from-yaml\ntranscribe_chunk_seconds: 300\n")
+        config = load_config({'CONFIG_FILE': self.path, 'TARGET_OUTPUT_BUCKET': 'from-env'})
+        self.assertEqual(config.aws_region, 'eu-west-1')
+        self.assertEqual(config.target_output_bucket, 'from-env')
+        self.assertEqual(config.transcribe_chunk_seconds, 300.0)
+
+    def test_workflow_overrides(self):
+        self.write_yaml("target_output_bucket: shared\nworkflows:\n  s3_remove_pii:\n    transcribe_max_parallel_jobs: 4\n")
+        config = load_config({'CONFIG_FILE': self.path})
+        workflow = config.for_workflow('s3_remove_pii')
+        self.assertEqual(workflow.transcribe_max_parallel_jobs, 4)
+        self.assertEqual(workflow.target_output_bucket, 'shared')
+        self.assertIs(config.for_workflow('other'), config)
+
+    def test_config_is_immutable(self):
+        config = validate({})
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            config.aws_region = 'eu-west-1'
+        with self.assertRaises(TypeError):
+            config.workflows['x'] = config
+
+    def test_validation_errors(self):
+        for values in ({'unknown': 1}, {'transcribe_max_parallel_jobs': 'many'}, {'counter_table_name': 5},
+                       {'transcribe_chunk_seconds': 5, 'transcribe_chunk_overlap_seconds': 5},
+                       {'scheduler_safety_margin_ms': -1}, {'workflows': {'w': {'unknown': 1}}}):
+            with self.assertRaises(ConfigError):
+                validate(values)
+
+    @patch('boto3.client')
+    def test_remote_sources(self, mock_client):
+        mock_client.return_value.get_object.return_value = {'Body': MagicMock(read=lambda: b'counter_table_name: s3\n')}
+        mock_client.return_value.get_paginator.return_value.paginate.return_value = [{'Parameters': [
+            {'Name': '/app/config/checkpoint_table_name', 'Value': 'ssm'},
+            {'Name': '/app/config/workflows/s3_remove_pii/transcribe_chunk_seconds', 'Value': '600'},
+        ]}]
+        config = load_config({'CONFIG_FILE': '/missing.yaml', 'CONFIG_S3_URI': 's3://bucket/config.yaml',
+                              'CONFIG_SSM_PATH': '/app/config'})
+        mock_client.return_value.get_object.assert_called_once_with(Bucket='bucket', Key='config.yaml')
+        self.assertEqual(config.counter_table_name, 's3')
+        self.assertEqual(config.checkpoint_table_name, 'ssm')
+        self.assertEqual(config.for_workflow('s3_remove_pii').transcribe_chunk_seconds, 600.0)
+
+class TestConfigStore(unittest.TestCase):
+    def test_failed_refresh_keeps_previous_config(self):
+        loader = MagicMock(side_effect=[Config(aws_region='a'), Exception('unavailable'), Config(aws_region='b')])
+        store = ConfigStore(loader)
+        self.assertEqual(store.refresh().aws_region, 'a')
+        self.assertEqual(store.refresh().aws_region, 'b')
+
+    def test_get_config_loads_once(self):
+        reset_config()
+        self.addCleanup(reset_config)
+        with patch('common.config.load_config', return_value=Config()) as mock_load:
+            self.assertIs(get_config(), get_config())
+        mock_load.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
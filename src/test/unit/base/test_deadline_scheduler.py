@@ -0,0 +1,183 @@
+import json
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+from botocore.exceptions import ClientError
+from strategies.utils.deadline_scheduler import (DeadlineScheduler, dynamodb_scan_source, s3_prefix_source,
+                                                 dumps_checkpoint_value, loads_checkpoint_value)
+
+class TestDeadlineScheduler(unittest.TestCase):
+    def setUp(self):
+        self.dynamodb_utils = MagicMock()
+        self.dynamodb_utils.fetch_item_by_key.return_value = {}
+        self.context = MagicMock()
+        self.context.get_remaining_time_in_millis.return_value = 600000
+        self.context.invoked_function_arn = 'arn:aws:lambda:us-east-1:123:function:job'
+        self.continuation = MagicMock()
+        self.processed = []
+
+    def scheduler(self, **kwargs):
+        return DeadlineScheduler(self.context, 'job-1', event={'bucket': 'b'}, dynamodb_utils=self.dynamodb_utils,
+                                 checkpoint_table_name='checkpoints', safety_margin_ms=1000, max_workers=2,
+                                 continuation=self.continuation, **kwargs)
+
+    def pages(self, cursor):
+        pages = {None: ([1, 2, 3], 'p2'), 'p2': ([4, 5], None)}
+        return pages[cursor]
+
+    def last_checkpoint(self):
+        return self.dynamodb_utils.save_item.call_args[0][1]
+
+    def test_runs_to_completion(self):
+        result = self.scheduler().run(self.pages, self.processed.append)
+        self.assertEqual(result['status'], 'COMPLETED')
+        self.assertEqual(result['processed'], 5)
+        self.assertEqual(sorted(self.processed), [1, 2, 3, 4, 5])
+        self.assertEqual(self.last_checkpoint()['status'], 'COMPLETED')
+        self.continuation.assert_not_called()
+
+    def test_stops_before_deadline_and_continues(self):
+        self.context.get_remaining_time_in_millis.side_effect = [5000, 5000, 5000, 5000, 500, 500]
+        result = self.scheduler().run(self.pages, self.processed.append)
+        self.assertEqual(result['status'], 'CONTINUED')
+        self.assertEqual(sorted(self.processed), [1, 2])
+        checkpoint = self.last_checkpoint()
+        self.assertEqual(checkpoint['status'], 'CONTINUED')
+        self.assertEqual(json.loads(checkpoint['cursor']), 'p2')
+        self.assertEqual(json.loads(checkpoint['pending']), [3])
+        self.continuation.assert_called_once_with({'bucket': 'b', 'job_id': 'job-1'})
+
+    def test_resumes_from_checkpoint(self):
+        self.dynamodb_utils.fetch_item_by_key.return_value = {'Item': {
+            'job_id': 'job-1', 'status': 'CONTINUED', 'cursor': '"p2"', 'pending': '[3]',
+            'started': True, 'processed': 2, 'failed': 0, 'invocations': 1,
+        }}
+        result = self.scheduler().run(self.pages, self.processed.append)
+        self.assertEqual(sorted(self.processed), [3, 4, 5])
+        self.assertEqual(result, {'job_id': 'job-1', 'status': 'COMPLETED', 'processed': 5,
+                                  'failed': 0, 'invocations': 2})
+
+    def test_completed_job_is_not_rerun(self):
+        self.dynamodb_utils.fetch_item_by_key.return_value = {'Item': {'status': 'COMPLETED', 'processed': 5}}
+        source = MagicMock()
+        result = self.scheduler().run(source, self.processed.append)
+        self.assertEqual(result['status'], 'COMPLETED')
+        source.assert_not_called()
+
+    def test_failed_units_are_counted(self):
+        attempts = []
+
+        def process(unit):
+            if unit == 2:
+                attempts.append(unit)
+                raise Exception('fail')
+        result = self.scheduler().run(self.pages, process)
+        self.assertEqual(result['processed'], 4)
+        self.assertEqual(result['failed'], 1)
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(json.loads(self.last_checkpoint()['failed_units']), [2])
+
+    def test_failed_units_are_retried(self):
+        attempts = []
+
+        def process(unit):
+            attempts.append(unit)
+            if attempts.count(unit) == 1 and unit == 2:
+                raise Exception('transient')
+        result = self.scheduler().run(self.pages, process)
+        self.assertEqual((result['processed'], result['failed']), (5, 0))
+        self.assertEqual(attempts.count(2), 2)
+
+    def test_checkpoints_are_written_conditionally_on_version(self):
+        self.dynamodb_utils.fetch_item_by_key.return_value = {'Item': {
+            'job_id': 'job-1', 'status': 'CONTINUED', 'cursor': '"p2"', 'pending': '[]',
+            'started': True, 'processed': 3, 'failed': 0, 'invocations': 1, 'version': 4,
+        }}
+        self.scheduler().run(self.pages, self.processed.append)
+        calls = self.dynamodb_utils.save_item.call_args_list
+        self.assertEqual([call[0][1]['version'] for call in calls], [5, 6, 7])
+        self.assertEqual([call[0][3] for call in calls], [{':version': 4}, {':version': 5}, {':version': 6}])
+        self.assertEqual(calls[0][0][2], 'attribute_not_exists(version) OR version = :version')
+        self.assertIsNotNone(calls[0][0][1]['owner'])
+        self.assertIsNone(calls[-1][0][1]['owner'])
+
+    def test_leased_job_is_not_run_twice(self):
+        self.dynamodb_utils.fetch_item_by_key.return_value = {'Item': {
+            'job_id': 'job-1', 'status': 'RUNNING', 'owner': 'other', 'version': 2,
+            'lease_expires_at': int(time.time() * 1000) + 60000,
+        }}
+        source = MagicMock()
+        result = self.scheduler().run(source, self.processed.append)
+        self.assertEqual(result['status'], 'SUPERSEDED')
+        source.assert_not_called()
+        self.dynamodb_utils.save_item.assert_not_called()
+
+    def test_conflicting_checkpoint_write_stops_the_job(self):
+        self.dynamodb_utils.save_item.side_effect = [
+            {}, ClientError({'Error': {'Code': 'ConditionalCheckFailedException'}}, 'PutItem')]
+        result = self.scheduler().run(self.pages, self.processed.append)
+        self.assertEqual(result['status'], 'SUPERSEDED')
+        self.assertEqual(sorted(self.processed), [1, 2, 3])
+        self.continuation.assert_not_called()
+
+    def test_binary_units_and_cursors_are_checkpointed(self):
+        self.context.get_remaining_time_in_millis.side_effect = [5000, 5000, 5000, 500, 500]
+        pages = {None: ([{'id': {'B': b'\x01'}}, {'id': {'B': b'\x02'}}], {'id': {'B': b'\x02'}})}
+        self.scheduler().run(lambda cursor: pages[cursor], self.processed.append)
+        checkpoint = self.last_checkpoint()
+        self.assertEqual(loads_checkpoint_value(checkpoint['cursor']), {'id': {'B': b'\x02'}})
+        self.assertEqual(loads_checkpoint_value(checkpoint['pending']), [{'id': {'B': b'\x02'}}])
+        self.assertEqual(loads_checkpoint_value(dumps_checkpoint_value([b'a'])), [b'a'])
+
+    def test_remove_items_by_attribute_runs_as_a_job(self):
+        self.dynamodb_utils.get_key_attributes.return_value = ('id',)
+        self.dynamodb_utils._build_expression_kwargs.return_value = {'FilterExpression': 'f'}
+        self.dynamodb_utils.client.scan.return_value = {'Items': [{'id': {'S': '1'}}, {'id': {'S': '2'}}]}
+        self.dynamodb_utils.deserialize_item.side_effect = lambda key: {'id': key['id']['S']}
+        result = self.scheduler().remove_items_by_attribute('table', 'status', 'stale')
+        self.assertEqual(result['processed'], 2)
+        removed = sorted(call[0][1]['id'] for call in self.dynamodb_utils.remove_item_by_key.call_args_list)
+        self.assertEqual(removed, ['1', '2'])
+
+    @patch('strategies.utils.deadline_scheduler.LambdaClient')
+    def test_default_continuation_reinvokes_function(self, mock_lambda_client):
+        self.context.get_remaining_time_in_millis.return_value = 0
+        scheduler = DeadlineScheduler(self.context, 'job-1', dynamodb_utils=self.dynamodb_utils)
+        result = scheduler.run(self.pages, self.processed.append)
+        self.assertEqual(result['status'], 'CONTINUED')
+        self.assertFalse(self.last_checkpoint()['started'])
+        mock_lambda_client.return_value.invoke_async.assert_called_once_with(
+            self.context.invoked_function_arn, {'job_id': 'job-1'})
+
+class TestSchedulerSources(unittest.TestCase):
+    def test_dynamodb_scan_source(self):
+        dynamodb_utils = MagicMock()
+        dynamodb_utils.get_key_attributes.return_value = ('id',)
+        dynamodb_utils._build_expression_kwargs.return_value = {}
+        dynamodb_utils.client.scan.return_value = {
+            'Items': [{'id': {'S': '1'}, 'v': {'N': '1'}}], 'LastEvaluatedKey': {'id': {'S': '1'}}}
+        dynamodb_utils.encode_cursor.return_value = 'cursor'
+        keys, cursor = dynamodb_scan_source(dynamodb_utils, 'table', page_size=10)(None)
+        self.assertEqual(keys, [{'id': {'S': '1'}}])
+        self.assertEqual(cursor, 'cursor')
+        dynamodb_utils.client.scan.assert_called_once_with(TableName='table', Limit=10)
+
+    def test_dynamodb_scan_source_bounds_page_size(self):
+        dynamodb_utils = MagicMock()
+        dynamodb_utils.get_key_attributes.return_value = ('id',)
+        dynamodb_utils._build_expression_kwargs.return_value = {}
+        dynamodb_utils.client.scan.return_value = {'Items': []}
+        self.assertEqual(dynamodb_scan_source(dynamodb_utils, 'table')(None), ([], None))
+        dynamodb_utils.client.scan.assert_called_once_with(TableName='table', Limit=100)
+
+    def test_s3_prefix_source(self):
+        s3_utils = MagicMock()
+        s3_utils.s3.list_objects_v2.return_value = {
+            'Contents': [{'Key': 'a'}], 'IsTruncated': True, 'NextContinuationToken': 'token'}
+        keys, cursor = s3_prefix_source(s3_utils, 'bucket', 'p/')('previous')
+        self.assertEqual((keys, cursor), (['a'], 'token'))
+        s3_utils.s3.list_objects_v2.assert_called_once_with(
+            Bucket='bucket', MaxKeys=1000, Prefix='p/', ContinuationToken='previous')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,243 @@
+import os
+import sys
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from common.client.dynamodb_client import reset_key_attributes
+from strategies.utils.dynamodb_utils import DynamoDBUtils
+from strategies.utils.dynamodb_batch_session import WriteBehindFlushError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'benchmark'))
+from fake_aws import FakeAWS  # noqa: E402
+
+class TestDynamoDBBatchSession(unittest.TestCase):
+    def setUp(self):
+        resource_patcher = patch('boto3.resource')
+        client_patcher = patch('boto3.client')
+        self.addCleanup(resource_patcher.stop)
+        self.addCleanup(client_patcher.stop)
+        reset_key_attributes()
+        self.addCleanup(reset_key_attributes)
+        self.mock_resource = resource_patcher.start()
+        self.mock_client = client_patcher.start().return_value
+        self.mock_resource.return_value.Table.return_value.key_schema = [{'AttributeName': 'id', 'KeyType': 'HASH'}]
+        self.dynamodb_utils = DynamoDBUtils()
+
+    def test_gets_across_tables_share_one_request(self):
+        self.mock_client.batch_get_item.return_value = {
+            'Responses': {'a': [{'id': {'S': '1'}, 'v': {'N': '1'}}], 'b': []}
+        }
+        with self.dynamodb_utils.batch_session() as session:
+            first = session.get('a', {'id': '1'})
+            duplicate = session.get('a', {'id': '1'})
+            missing = session.get('b', {'id': '2'})
+        self.mock_client.batch_get_item.assert_called_once_with(RequestItems={
+            'a': {'Keys': [{'id': {'S': '1'}}]},
+            'b': {'Keys': [{'id': {'S': '2'}}]},
+        })
+        self.assertEqual(first.result(), {'id': '1', 'v': 1})
+        self.assertEqual(duplicate.result(), {'id': '1', 'v': 1})
+        self.assertIsNone(missing.result())
+
+    def test_gets_are_split_at_100_keys(self):
+        self.mock_client.batch_get_item.return_value = {'Responses': {}}
+        session = self.dynamodb_utils.batch_session()
+        for i in range(150):
+            session.get('a' if i % 2 else 'b', {'id': str(i)})
+        session.flush()
+        self.assertEqual(self.mock_client.batch_get_item.call_count, 2)
+
+    def test_writes_to_same_key_are_collapsed(self):
+        self.mock_client.batch_write_item.return_value = {}
+        session = self.dynamodb_utils.batch_session()
+        put = session.put('a', {'id': '1', 'v': 1})
+        delete = session.delete('a', {'id': '1'})
+        other = session.put('b', {'id': '1'})
+        self.assertEqual(session.pending_count(), 2)
+        session.flush()
+        self.mock_client.batch_write_item.assert_called_once_with(RequestItems={
+            'a': [{'DeleteRequest': {'Key': {'id': {'S': '1'}}}}],
+            'b': [{'PutRequest': {'Item': {'id': {'S': '1'}}}}],
+        })
+        self.assertIsNone(put.result())
+        self.assertIsNone(delete.result())
+        self.assertIsNone(other.result())
+
+    def test_writes_are_split_at_25_items(self):
+        self.mock_client.batch_write_item.return_value = {}
+        session = self.dynamodb_utils.batch_session()
+        for i in range(60):
+            session.put('a', {'id': str(i)})
+        session.flush()
+        self.assertEqual(self.mock_client.batch_write_item.call_count, 3)
+
+    def test_unprocessed_writes_are_reported(self):
+        unprocessed = {'a': [{'PutRequest': {'Item': {'id': {'S': '2'}}}}]}
+        self.mock_client.batch_write_item.return_value = {'UnprocessedItems': unprocessed}
+        session = self.dynamodb_utils.batch_session()
+        ok = session.put('a', {'id': '1'})
+        failed = session.put('a', {'id': '2'})
+        with patch('time.sleep'):
+            summary = session.flush()
+        self.assertIsNone(ok.result())
+        with self.assertRaises(RuntimeError):
+            failed.result()
+        self.assertEqual(summary['UnprocessedItems'], unprocessed)
+
+    def test_binary_keys_are_supported(self):
+        self.mock_client.batch_write_item.return_value = {}
+        self.mock_client.batch_get_item.return_value = {'Responses': {'a': [{'id': {'B': b'\x01'}, 'v': {'N': '1'}}]}}
+        session = self.dynamodb_utils.batch_session()
+        put = session.put('a', {'id': b'\x01', 'v': 1})
+        session.put('a', {'id': b'\x01', 'v': 2})
+        get = session.get('a', {'id': b'\x01'})
+        self.assertEqual(session.pending_count(), 2)
+        session.flush()
+        self.assertIsNone(put.result())
+        self.assertEqual(get.result()['v'], 1)
+
+    def test_key_schema_is_read_once_per_table(self):
+        self.mock_client.batch_write_item.return_value = {}
+        for _ in range(2):
+            with DynamoDBUtils().batch_session() as session:
+                session.put('a', {'id': '1'})
+        self.mock_resource.return_value.Table.assert_called_once_with('a')
+
+    def test_concurrent_puts_and_flushes_lose_nothing(self):
+        written = []
+        lock = threading.Lock()
+
+        def batch_write_item(RequestItems):
+            with lock:
+                written.extend(RequestItems['a'])
+            return {}
+        self.mock_client.batch_write_item.side_effect = batch_write_item
+        session = self.dynamodb_utils.batch_session()
+
+        def put_many(worker):
+            for n in range(200):
+                session.put('a', {'id': f"{worker}-{n}"})
+                if n % 50 == 0:
+                    session.flush()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(put_many, range(8)))
+        session.flush()
+        self.assertEqual(len(written), 1600)
+
+    def test_request_error_is_set_on_futures(self):
+        self.mock_client.batch_get_item.side_effect = Exception('fail')
+        session = self.dynamodb_utils.batch_session()
+        future = session.get('a', {'id': '1'})
+        session.flush()
+        with self.assertRaises(Exception):
+            future.result()
+
+class TestWriteBehind(unittest.TestCase):
+    def setUp(self):
+        resource_patcher = patch('boto3.resource')
+        client_patcher = patch('boto3.client')
+        self.addCleanup(resource_patcher.stop)
+        self.addCleanup(client_patcher.stop)
+        reset_key_attributes()
+        self.addCleanup(reset_key_attributes)
+        self.mock_resource = resource_patcher.start()
+        self.mock_client = client_patcher.start().return_value
+        self.mock_table = self.mock_resource.return_value.Table.return_value
+        self.mock_table.key_schema = [{'AttributeName': 'id', 'KeyType': 'HASH'}]
+        self.mock_client.batch_write_item.return_value = {}
+        self.dynamodb_utils = DynamoDBUtils()
+
+    def test_writes_are_buffered_until_exit(self):
+        with self.dynamodb_utils.write_behind():
+            self.assertEqual(self.dynamodb_utils.save_item('a', {'id': '1', 'v': 1}), {})
+            self.dynamodb_utils.save_item('a', {'id': '1', 'v': 2})
+            self.dynamodb_utils.remove_item_by_key('b', {'id': '2'})
+            self.mock_client.batch_write_item.assert_not_called()
+        self.mock_table.put_item.assert_not_called()
+        self.mock_client.batch_write_item.assert_called_once_with(RequestItems={
+            'a': [{'PutRequest': {'Item': {'id': {'S': '1'}, 'v': {'N': '2'}}}}],
+            'b': [{'DeleteRequest': {'Key': {'id': {'S': '2'}}}}],
+        })
+
+    def test_conditional_writes_go_straight_through(self):
+        with self.dynamodb_utils.write_behind():
+            self.dynamodb_utils.save_item('a', {'id': '1'}, 'attribute_not_exists(id)', {':x': 1})
+            self.mock_table.put_item.assert_called_once()
+        self.mock_client.batch_write_item.assert_not_called()
+
+    def test_size_threshold_flushes(self):
+        self.dynamodb_utils.enable_write_behind(max_items=2, max_age_seconds=60)
+        self.dynamodb_utils.save_item('a', {'id': '1'})
+        self.mock_client.batch_write_item.assert_not_called()
+        self.dynamodb_utils.save_item('a', {'id': '2'})
+        self.mock_client.batch_write_item.assert_called_once()
+
+    def test_age_threshold_flushes(self):
+        self.dynamodb_utils.enable_write_behind(max_items=100, max_age_seconds=0)
+        self.dynamodb_utils.save_item('a', {'id': '1'})
+        self.mock_client.batch_write_item.assert_called_once()
+
+    def test_buffers_are_per_thread(self):
+        started, release = threading.Event(), threading.Event()
+
+        def other_thread():
+            self.dynamodb_utils.save_item('a', {'id': 'direct'})
+            with self.dynamodb_utils.write_behind():
+                started.set()
+                release.wait(5)
+                self.dynamodb_utils.save_item('a', {'id': 'other'})
+        with self.dynamodb_utils.write_behind():
+            thread = threading.Thread(target=other_thread)
+            thread.start()
+            started.wait(5)
+            self.dynamodb_utils.save_item('a', {'id': 'main'})
+            release.set()
+            thread.join()
+            # The other thread's block flushed only its own buffer.
+            self.assertEqual(self.dynamodb_utils._write_behind.pending_count(), 1)
+        self.mock_table.put_item.assert_called_once_with(Item={'id': 'direct'})
+        self.assertEqual(self.mock_client.batch_write_item.call_count, 2)
+
+    def test_table_scope_leaves_other_tables_direct(self):
+        with self.dynamodb_utils.write_behind(table_names=['a']):
+            self.dynamodb_utils.save_item('a', {'id': '1'})
+            self.dynamodb_utils.save_item('checkpoints', {'id': 'job'})
+            self.mock_table.put_item.assert_called_once_with(Item={'id': 'job'})
+        self.mock_client.batch_write_item.assert_called_once()
+
+    def test_failed_flush_raises(self):
+        self.mock_client.batch_write_item.side_effect = Exception('throttled')
+        with self.assertRaises(WriteBehindFlushError) as ctx:
+            with self.dynamodb_utils.write_behind():
+                self.dynamodb_utils.save_item('a', {'id': '1'})
+        self.assertEqual(ctx.exception.failures[0][0], 'a')
+        self.assertIsNone(self.dynamodb_utils._write_behind)
+
+class TestWriteBehindOrdering(unittest.TestCase):
+    def setUp(self):
+        self.aws = FakeAWS()
+        self.aws.create_table('t', 'id')
+        for target, fake in (('boto3.client', self.aws.client), ('boto3.resource', self.aws.resource)):
+            patcher = patch(target, fake)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        reset_key_attributes()
+        self.addCleanup(reset_key_attributes)
+        self.dynamodb_utils = DynamoDBUtils()
+
+    def test_update_applies_after_buffered_put(self):
+        with self.dynamodb_utils.write_behind():
+            self.dynamodb_utils.save_item('t', {'id': '1', 'v': 1})
+            self.dynamodb_utils.update_item_attributes('t', {'id': '1'}, 'SET v = :v', {':v': 2})
+        self.assertEqual(self.dynamodb_utils.fetch_item_by_key('t', {'id': '1'})['Item']['v'], 2)
+
+    def test_conditional_put_applies_after_buffered_delete(self):
+        self.dynamodb_utils.save_item('t', {'id': '1', 'v': 1})
+        with self.dynamodb_utils.write_behind():
+            self.dynamodb_utils.remove_item_by_key('t', {'id': '1'})
+            self.dynamodb_utils.save_item('t', {'id': '1', 'v': 2}, 'attribute_not_exists(id) OR v = :v', {':v': 0})
+        self.assertEqual(self.dynamodb_utils.fetch_item_by_key('t', {'id': '1'})['Item']['v'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
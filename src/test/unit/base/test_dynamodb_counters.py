@@ -0,0 +1,110 @@
+import unittest
+from unittest.mock import patch
+from common.client.dynamodb_client import reset_key_attributes
+from strategies.utils.dynamodb_utils import DynamoDBUtils
+from strategies.utils.dynamodb_counters import CounterUpdateError
+
+def is_open(item):
+    return item.get('status') == 'OPEN'
+
+class TestDynamoDBCounters(unittest.TestCase):
+    def setUp(self):
+        resource_patcher = patch('boto3.resource')
+        client_patcher = patch('boto3.client')
+        self.addCleanup(resource_patcher.stop)
+        self.addCleanup(client_patcher.stop)
+        reset_key_attributes()
+        self.addCleanup(reset_key_attributes)
+        self.mock_resource = resource_patcher.start()
+        self.mock_client = client_patcher.start().return_value
+        self.mock_table = self.mock_resource.return_value.Table.return_value
+        self.mock_table.key_schema = [{'AttributeName': 'id', 'KeyType': 'HASH'}]
+        self.dynamodb_utils = DynamoDBUtils(counter_table_name='counters')
+        self.dynamodb_utils.register_counter('contacts', 'open', is_open)
+
+    def added(self):
+        return [int(call.kwargs['ExpressionAttributeValues'][':delta']['N'])
+                for call in self.mock_client.update_item.call_args_list]
+
+    def test_save_new_matching_item_increments(self):
+        self.mock_table.put_item.return_value = {}
+        self.dynamodb_utils.save_item('contacts', {'id': '1', 'status': 'OPEN'})
+        self.assertEqual(self.mock_table.put_item.call_args.kwargs['ReturnValues'], 'ALL_OLD')
+        self.assertEqual(self.added(), [1])
+        kwargs = self.mock_client.update_item.call_args.kwargs
+        self.assertEqual(kwargs['TableName'], 'counters')
+        self.assertEqual(kwargs['Key'], {'counter_id': {'S': 'contacts#open#0'}})
+
+    def test_overwrite_with_same_state_does_not_update(self):
+        self.mock_table.put_item.return_value = {'Attributes': {'id': '1', 'status': 'OPEN'}}
+        self.dynamodb_utils.save_item('contacts', {'id': '1', 'status': 'OPEN'})
+        self.mock_client.update_item.assert_not_called()
+
+    def test_remove_matching_item_decrements(self):
+        self.mock_table.delete_item.return_value = {'Attributes': {'id': '1', 'status': 'OPEN'}}
+        self.dynamodb_utils.remove_item_by_key('contacts', {'id': '1'})
+        self.assertEqual(self.added(), [-1])
+
+    def test_untracked_table_is_unchanged(self):
+        self.dynamodb_utils.save_item('other', {'id': '1'})
+        self.assertNotIn('ReturnValues', self.mock_table.put_item.call_args.kwargs)
+        self.mock_client.update_item.assert_not_called()
+
+    def test_bulk_write_uses_old_images(self):
+        old_images = {'1': {'id': {'S': '1'}, 'status': {'S': 'OPEN'}}, '3': {'id': {'S': '3'}, 'status': {'S': 'OPEN'}}}
+        self.mock_client.put_item.side_effect = lambda **kwargs: (
+            {'Attributes': old_images['1']} if kwargs['Item']['id']['S'] == '1' else {})
+        self.mock_client.delete_item.return_value = {'Attributes': old_images['3']}
+        self.dynamodb_utils.bulk_save_or_remove_items(
+            'contacts',
+            put_items=[{'id': '1', 'status': 'CLOSED'}, {'id': '2', 'status': 'OPEN'}, {'id': '3', 'status': 'OPEN'}],
+            delete_keys=[{'id': '3'}])
+        # id 1 leaves the count, id 2 joins it and id 3 is created then deleted: net zero.
+        self.assertEqual(self.mock_client.put_item.call_args.kwargs['ReturnValues'], 'ALL_OLD')
+        self.assertEqual(self.mock_client.delete_item.call_args.kwargs['ReturnValues'], 'ALL_OLD')
+        self.mock_client.batch_write_item.assert_not_called()
+        self.mock_client.update_item.assert_not_called()
+
+    def test_bulk_write_net_delta(self):
+        self.mock_client.put_item.return_value = {}
+        self.dynamodb_utils.bulk_save_or_remove_items(
+            'contacts', put_items=[{'id': '1', 'status': 'OPEN'}, {'id': '2', 'status': 'OPEN'}])
+        self.assertEqual(self.added(), [2])
+
+    def test_counter_failure_is_raised_after_write(self):
+        self.mock_table.put_item.return_value = {}
+        self.mock_client.update_item.side_effect = Exception('throttled')
+        with self.assertRaises(CounterUpdateError) as ctx:
+            self.dynamodb_utils.save_item('contacts', {'id': '1', 'status': 'OPEN'})
+        self.mock_table.put_item.assert_called_once()
+        self.assertEqual(ctx.exception.failures[0][:2], ('open', 1))
+
+    def test_read_counter_sums_shards(self):
+        self.dynamodb_utils.register_counter('contacts', 'busy', is_open, shards=3)
+        self.mock_client.batch_get_item.return_value = {'Responses': {'counters': [
+            {'counter_id': {'S': 'contacts#busy#0'}, 'item_count': {'N': '4'}},
+            {'counter_id': {'S': 'contacts#busy#2'}, 'item_count': {'N': '-1'}},
+        ]}}
+        self.assertEqual(self.dynamodb_utils.count_items_by_condition('contacts', counter_name='busy'), 3)
+        keys = self.mock_client.batch_get_item.call_args.kwargs['RequestItems']['counters']['Keys']
+        self.assertEqual(len(keys), 3)
+
+    def test_count_items_by_condition_scans_all_pages(self):
+        self.mock_table.scan.side_effect = [{'Count': 2, 'LastEvaluatedKey': {'id': '2'}}, {'Count': 1}]
+        self.assertEqual(self.dynamodb_utils.count_items_by_condition('contacts', 'status = :s', {':s': 'OPEN'}), 3)
+        self.assertEqual(self.mock_table.scan.call_args.kwargs['ExclusiveStartKey'], {'id': '2'})
+
+    def test_count_items_by_condition_without_filter(self):
+        self.mock_table.scan.return_value = {'Count': 4}
+        self.assertEqual(self.dynamodb_utils.count_items_by_condition('contacts'), 4)
+        self.assertEqual(self.mock_table.scan.call_args.kwargs, {'Select': 'COUNT'})
+
+    def test_rebuild_counter(self):
+        self.mock_table.scan.return_value = {'Items': [{'id': '1', 'status': 'OPEN'}, {'id': '2', 'status': 'CLOSED'}]}
+        self.mock_client.batch_write_item.return_value = {}
+        self.assertEqual(self.dynamodb_utils.rebuild_counter('contacts', 'open'), 1)
+        request = self.mock_client.batch_write_item.call_args.kwargs['RequestItems']['counters']
+        self.assertEqual(request[0]['PutRequest']['Item']['item_count'], {'N': '1'})
+
+if __name__ == '__main__':
+    unittest.main()
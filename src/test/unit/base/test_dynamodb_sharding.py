@@ -0,0 +1,168 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+from boto3.dynamodb.conditions import Attr, Key
+from common.client.dynamodb_client import reset_key_attributes
+from strategies.utils.dynamodb_utils import DynamoDBUtils
+from strategies.utils.dynamodb_sharding import ShardedKeyDefinition, stable_shard_function
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'benchmark'))
+from fake_aws import FakeAWS  # noqa: E402
+
+class TestShardedKeyDefinition(unittest.TestCase):
+    def test_shard_item_and_unshard(self):
+        sharded_key = ShardedKeyDefinition('t', 'pk', 4, stable_shard_function('sk'))
+        stored = sharded_key.shard_item({'pk': 'day', 'sk': 'a'})
+        self.assertEqual(stored, sharded_key.shard_item({'pk': 'day', 'sk': 'a'}))
+        self.assertRegex(stored['pk'], r'^day#[0-3]$')
+        self.assertEqual(sharded_key.unshard_item(stored), {'pk': 'day', 'sk': 'a'})
+        self.assertEqual(sharded_key.unshard_item({'pk': {'S': 'day#2'}}), {'pk': {'S': 'day'}})
+
+    def test_random_shards_cover_all_values(self):
+        sharded_key = ShardedKeyDefinition('t', 'pk', 3)
+        shards = {sharded_key.shard_item({'pk': 'day'})['pk'] for _ in range(200)}
+        self.assertEqual(shards, {'day#0', 'day#1', 'day#2'})
+
+    def test_invalid_definitions(self):
+        with self.assertRaises(ValueError):
+            ShardedKeyDefinition('t', 'pk', 0)
+        with self.assertRaises(ValueError):
+            ShardedKeyDefinition('t', 'pk', 2).shard_item({'pk': 5})
+
+    def test_condition_objects_are_rewritten_per_shard(self):
+        sharded_key = ShardedKeyDefinition('t', 'pk', 2)
+        conditions = sharded_key.shard_key_conditions(Key('pk').eq('day') & Key('sk').begins_with('a'), None)
+        self.assertEqual([c.get_expression()['values'][0].get_expression()['values'][1] for c, _ in conditions],
+                         ['day#0', 'day#1'])
+        self.assertIsNone(sharded_key.shard_key_conditions(Key('other').eq('day')))
+
+    def test_string_conditions_are_rewritten_per_shard(self):
+        sharded_key = ShardedKeyDefinition('t', 'pk', 2)
+        conditions = sharded_key.shard_key_conditions('pk = :p AND sk > :s', {':p': 'day', ':s': 'a'})
+        self.assertEqual([values for _, values in conditions],
+                         [{':p': 'day#0', ':s': 'a'}, {':p': 'day#1', ':s': 'a'}])
+        self.assertIsNone(sharded_key.shard_key_conditions('gsi_pk = :p', {':p': 'day'}))
+        with self.assertRaises(ValueError):
+            sharded_key.shard_key_conditions('#p = :p', {':p': 'day'})
+
+class TestDynamoDBUtilsSharding(unittest.TestCase):
+    def setUp(self):
+        resource_patcher = patch('boto3.resource')
+        client_patcher = patch('boto3.client')
+        self.addCleanup(resource_patcher.stop)
+        self.addCleanup(client_patcher.stop)
+        reset_key_attributes()
+        self.addCleanup(reset_key_attributes)
+        self.mock_table = resource_patcher.start().return_value.Table.return_value
+        self.mock_table.key_schema = [{'AttributeName': 'pk', 'KeyType': 'HASH'},
+                                      {'AttributeName': 'sk', 'KeyType': 'RANGE'}]
+        self.mock_client = client_patcher.start().return_value
+        self.dynamodb_utils = DynamoDBUtils()
+
+    def test_save_item_stores_shard_suffix(self):
+        self.dynamodb_utils.register_sharded_key('t', 'pk', 4, lambda item: 6)
+        self.dynamodb_utils.save_item('t', {'pk': 'day', 'sk': 'a'})
+        self.mock_table.put_item.assert_called_once_with(Item={'pk': 'day#2', 'sk': 'a'})
+
+    def test_computed_update_goes_to_one_shard(self):
+        self.dynamodb_utils.register_sharded_key('t', 'pk', 4, lambda item: 1)
+        self.dynamodb_utils.update_item_attributes('t', {'pk': 'day', 'sk': 'a'}, 'SET v = :v', {':v': 1})
+        self.assertEqual(self.mock_table.update_item.call_args.kwargs['Key'], {'pk': 'day#1', 'sk': 'a'})
+        self.mock_client.batch_get_item.assert_not_called()
+
+    def test_random_update_locates_item(self):
+        self.dynamodb_utils.register_sharded_key('t', 'pk', 3)
+        self.mock_client.batch_get_item.return_value = {'Responses': {'t': [
+            {'pk': {'S': 'day#2'}, 'sk': {'S': 'a'}}]}}
+        self.dynamodb_utils.update_item_attributes('t', {'pk': 'day', 'sk': 'a'}, 'SET v = :v', {':v': 1})
+        self.assertEqual(len(self.mock_client.batch_get_item.call_args.kwargs['RequestItems']['t']['Keys']), 3)
+        self.assertEqual(self.mock_table.update_item.call_args.kwargs['Key'], {'pk': 'day#2', 'sk': 'a'})
+
+    def test_fetch_item_strips_suffix(self):
+        self.dynamodb_utils.register_sharded_key('t', 'pk', 3)
+        self.mock_client.batch_get_item.return_value = {'Responses': {'t': [
+            {'pk': {'S': 'day#1'}, 'sk': {'S': 'a'}}]}}
+        self.assertEqual(self.dynamodb_utils.fetch_item_by_key('t', {'pk': 'day', 'sk': 'a'}),
+                         {'Item': {'pk': 'day', 'sk': 'a'}})
+
+    def test_query_scatters_and_merges_in_sort_order(self):
+        self.dynamodb_utils.register_sharded_key('t', 'pk', 2)
+
+        def query(**kwargs):
+            shard = kwargs['KeyConditionExpression'].get_expression()['values'][1]
+            if shard == 'day#0':
+                return {'Items': [{'pk': 'day#0', 'sk': 'b'}], 'Count': 1, 'ScannedCount': 1}
+            return {'Items': [{'pk': 'day#1', 'sk': 'a'}], 'Count': 1, 'ScannedCount': 2}
+        self.mock_table.query.side_effect = query
+        response = self.dynamodb_utils.find_items_by_key_condition('t', Key('pk').eq('day'), {})
+        self.assertEqual(response, {'Items': [{'pk': 'day', 'sk': 'a'}, {'pk': 'day', 'sk': 'b'}],
+                                    'Count': 2, 'ScannedCount': 3})
+
+    def test_count_sums_every_shard_and_page(self):
+        self.dynamodb_utils.register_sharded_key('t', 'pk', 3)
+        self.mock_table.query.side_effect = lambda **kwargs: (
+            {'Count': 5, 'LastEvaluatedKey': {'pk': 'x'}} if 'ExclusiveStartKey' not in kwargs else {'Count': 1})
+        self.assertEqual(self.dynamodb_utils.count_items_by_key_condition('t', Key('pk').eq('day')), 18)
+        self.assertEqual(self.mock_table.query.call_args.kwargs['Select'], 'COUNT')
+
+    @patch('time.sleep')
+    def test_unprocessed_keys_are_returned_unsharded(self, _):
+        self.dynamodb_utils.register_sharded_key('t', 'pk', 3)
+        self.mock_client.batch_get_item.side_effect = lambda RequestItems: {
+            'Responses': {}, 'UnprocessedKeys': RequestItems}
+        response = self.dynamodb_utils.fetch_multiple_items_by_keys('t', [{'pk': 'day', 'sk': 'a'}])
+        self.assertEqual(response['UnprocessedKeys'], {'t': {'Keys': [{'pk': 'day', 'sk': 'a'}]}})
+
+    def test_unsharded_query_is_unchanged(self):
+        self.dynamodb_utils.register_sharded_key('t', 'pk', 3)
+        self.mock_table.query.return_value = {'Items': [], 'LastEvaluatedKey': {'gsi': 'x'}}
+        response = self.dynamodb_utils.find_items_by_key_condition('t', Key('gsi').eq('x'), {}, index_name='gsi')
+        self.mock_table.query.assert_called_once()
+        self.assertIn('LastEvaluatedKey', response)
+
+class TestRandomShardingAgainstFake(unittest.TestCase):
+    def setUp(self):
+        self.aws = FakeAWS()
+        self.aws.create_table('t', 'pk', 'sk')
+        for target, fake in (('boto3.client', self.aws.client), ('boto3.resource', self.aws.resource)):
+            patcher = patch(target, fake)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        reset_key_attributes()
+        self.addCleanup(reset_key_attributes)
+        self.dynamodb_utils = DynamoDBUtils()
+        self.dynamodb_utils.register_sharded_key('t', 'pk', 8)
+
+    def stored_items(self):
+        return self.aws.client('dynamodb').scan(TableName='t')['Items']
+
+    def test_overwrites_keep_one_copy(self):
+        for version in range(10):
+            self.dynamodb_utils.save_item('t', {'pk': 'day', 'sk': 'a', 'v': version})
+        self.dynamodb_utils.bulk_save_or_remove_items('t', [{'pk': 'day', 'sk': 'a', 'v': 10},
+                                                            {'pk': 'day', 'sk': 'a', 'v': 11}])
+        self.assertEqual(len(self.stored_items()), 1)
+        self.assertEqual(self.dynamodb_utils.fetch_item_by_key('t', {'pk': 'day', 'sk': 'a'})['Item']['v'], 11)
+        items = self.dynamodb_utils.find_items_by_key_condition('t', Key('pk').eq('day'), {})['Items']
+        self.assertEqual([item['v'] for item in items], [11])
+        self.dynamodb_utils.remove_item_by_key('t', {'pk': 'day', 'sk': 'a'})
+        self.assertEqual(self.dynamodb_utils.fetch_item_by_key('t', {'pk': 'day', 'sk': 'a'}), {})
+        self.assertEqual(self.stored_items(), [])
+
+    def test_fetch_multiple_items_chunks_expanded_keys(self):
+        keys = [{'pk': 'day', 'sk': str(n)} for n in range(30)]
+        self.dynamodb_utils.bulk_save_or_remove_items('t', [dict(key, v=1) for key in keys])
+        response = self.dynamodb_utils.fetch_multiple_items_by_keys('t', keys)
+        self.assertEqual(sorted(item['sk'] for item in response['Responses']['t']), sorted(key['sk'] for key in keys))
+        self.assertTrue(all(item['pk'] == 'day' for item in response['Responses']['t']))
+
+    def test_scan_count_by_sharded_attribute_raises(self):
+        self.dynamodb_utils.save_item('t', {'pk': 'day', 'sk': 'a', 'v': 1})
+        self.assertEqual(self.dynamodb_utils.count_items_by_condition('t', Attr('v').eq(1)), 1)
+        with self.assertRaises(ValueError):
+            self.dynamodb_utils.count_items_by_condition('t', Attr('pk').eq('day'))
+        self.assertEqual(self.dynamodb_utils.count_items_by_key_condition('t', Key('pk').eq('day')), 1)
+
+if __name__ == '__main__':
+    unittest.main()
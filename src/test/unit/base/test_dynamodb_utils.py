@@ -1,6 +1,6 @@
 import unittest
 from unittest.mock import patch, MagicMock
-from strategies.base.dynamodb_utils import DynamoDBUtils
+from strategies.utils.dynamodb_utils import DynamoDBUtils
 
 class TestDynamoDBUtils(unittest.TestCase):
     def setUp(self):
@@ -71,5 +71,97 @@ class TestDynamoDBUtils(unittest.TestCase):
         with self.assertRaises(Exception):
             self.dynamodb_utils.force_string(Bad())
 
+class TestDynamoDBUtilsLowLevelClient(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('boto3.resource')
+        self.addCleanup(patcher.stop)
+        self.mock_resource = patcher.start()
+        client_patcher = patch('boto3.client')
+        self.addCleanup(client_patcher.stop)
+        self.mock_client = client_patcher.start().return_value
+        self.dynamodb_utils = DynamoDBUtils(use_low_level_client=True)
+
+    def test_table_handles_are_cached(self):
+        self.dynamodb_utils.get_table('table')
+        self.dynamodb_utils.get_table('table')
+        self.mock_resource.return_value.Table.assert_called_once_with('table')
+
+    def test_fetch_item_by_key_deserializes(self):
+        self.mock_client.get_item.return_value = {'Item': {'id': {'S': '1'}, 'n': {'N': '2'}}}
+        result = self.dynamodb_utils.fetch_item_by_key('table', {'id': '1'})
+        self.mock_client.get_item.assert_called_once_with(TableName='table', Key={'id': {'S': '1'}})
+        self.assertEqual(result['Item'], {'id': '1', 'n': 2})
+
+    def test_fetch_item_by_key_raw(self):
+        self.mock_client.get_item.return_value = {'Item': {'id': {'S': '1'}}}
+        result = self.dynamodb_utils.fetch_item_by_key('table', {'id': '1'}, raw=True)
+        self.assertEqual(result['Item'], {'id': {'S': '1'}})
+
+    def test_save_item_serializes(self):
+        self.dynamodb_utils.save_item('table', {'id': '1'})
+        self.mock_client.put_item.assert_called_once_with(TableName='table', Item={'id': {'S': '1'}})
+
+    def test_find_items_by_key_condition_builds_expression(self):
+        from boto3.dynamodb.conditions import Key
+        self.mock_client.query.return_value = {'Items': [{'id': {'S': '1'}}]}
+        result = self.dynamodb_utils.find_items_by_key_condition('table', Key('id').eq('1'), None)
+        kwargs = self.mock_client.query.call_args.kwargs
+        self.assertEqual(kwargs['KeyConditionExpression'], '#n0 = :v0')
+        self.assertEqual(kwargs['ExpressionAttributeValues'], {':v0': {'S': '1'}})
+        self.assertEqual(result['Items'], [{'id': '1'}])
+
+    def test_fetch_multiple_items_by_keys_chunks_and_retries(self):
+        keys = [{'id': str(i)} for i in range(150)]
+        self.mock_client.batch_get_item.side_effect = [
+            {'Responses': {'table': [{'id': {'S': '0'}}]}, 'UnprocessedKeys': {'table': {'Keys': [{'id': {'S': '1'}}]}}},
+            {'Responses': {'table': [{'id': {'S': '1'}}]}},
+            {'Responses': {'table': [{'id': {'S': '100'}}]}},
+        ]
+        with patch('time.sleep'):
+            result = self.dynamodb_utils.fetch_multiple_items_by_keys('table', keys)
+        self.assertEqual(self.mock_client.batch_get_item.call_count, 3)
+        self.assertEqual(result['Responses']['table'], [{'id': '0'}, {'id': '1'}, {'id': '100'}])
+        self.assertEqual(result['UnprocessedKeys'], {})
+
+    def test_bulk_save_or_remove_items_raises_on_unprocessed(self):
+        unprocessed = {'table': [{'PutRequest': {'Item': {'id': {'S': '1'}}}}]}
+        self.mock_client.batch_write_item.return_value = {'UnprocessedItems': unprocessed}
+        with patch('time.sleep'), self.assertRaises(RuntimeError):
+            self.dynamodb_utils.bulk_save_or_remove_items('table', put_items=[{'id': '1'}])
+
+    def test_query_items_page_returns_cursor(self):
+        from boto3.dynamodb.conditions import Key
+        self.mock_client.query.return_value = {
+            'Items': [{'id': {'S': '1'}, 'name': {'S': 'a'}}], 'Count': 1, 'ScannedCount': 1,
+            'LastEvaluatedKey': {'id': {'S': '1'}, 'bin': {'B': b'\x00'}},
+        }
+        page = self.dynamodb_utils.query_items_page(
+            'table', Key('id').eq('1'), projection=['name', 'meta.size'], limit=10, scan_index_forward=False)
+        kwargs = self.mock_client.query.call_args.kwargs
+        self.assertEqual(kwargs['ProjectionExpression'], '#p0, #p1.#p2')
+        self.assertEqual(kwargs['ExpressionAttributeNames']['#p1'], 'meta')
+        self.assertEqual(kwargs['Limit'], 10)
+        self.assertFalse(kwargs['ScanIndexForward'])
+        self.assertEqual(page['Items'], [{'id': '1', 'name': 'a'}])
+        self.assertEqual(self.dynamodb_utils.decode_cursor(page['Cursor']),
+                         {'id': {'S': '1'}, 'bin': {'B': b'\x00'}})
+
+    def test_iterate_items_by_key_condition_follows_cursor(self):
+        self.mock_client.query.side_effect = [
+            {'Items': [{'id': {'S': '1'}}], 'LastEvaluatedKey': {'id': {'S': '1'}}},
+            {'Items': [{'id': {'S': '2'}}]},
+        ]
+        items = list(self.dynamodb_utils.iterate_items_by_key_condition('table', 'id = :id', {':id': '1'}))
+        self.assertEqual(items, [{'id': '1'}, {'id': '2'}])
+        self.assertEqual(self.mock_client.query.call_args.kwargs['ExclusiveStartKey'], {'id': {'S': '1'}})
+
+    def test_decode_cursor_rejects_garbage(self):
+        with self.assertRaises(ValueError):
+            self.dynamodb_utils.decode_cursor('not-a-cursor')
+        with self.assertRaises(ValueError):
+            self.dynamodb_utils.decode_cursor('bnVsbA==')
+        with self.assertRaises(ValueError):
+            self.dynamodb_utils.decode_cursor('eyJpZCI6IDF9')
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
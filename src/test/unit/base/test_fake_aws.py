@@ -0,0 +1,137 @@
+import os
+import sys
+import unittest
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError, ParamValidationError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'benchmark'))
+from fake_aws import FakeAWS  # noqa: E402
+
+class TestFakeDynamoDB(unittest.TestCase):
+    def setUp(self):
+        self.aws = FakeAWS()
+        self.aws.create_table('t', 'pk', 'sk')
+        self.client = self.aws.client('dynamodb')
+        self.table = self.aws.resource('dynamodb').Table('t')
+        for sk in (1, 2, 10, 20):
+            self.table.put_item(Item={'pk': 'a', 'sk': sk, 'status': 'OPEN' if sk % 2 else 'CLOSED',
+                                      'tags': {'x'}, 'meta': {'size': sk}})
+        self.table.put_item(Item={'pk': 'b', 'sk': 1})
+
+    def sort_keys(self, response):
+        return [int(item['sk']) for item in response['Items']]
+
+    def test_conditions(self):
+        cases = [
+            ('attribute_exists(pk)', None, None, True),
+            ('attribute_not_exists(pk)', None, None, False),
+            ('#s = :s AND meta.size > :n', {'#s': 'status'}, {':s': 'OPEN', ':n': 0}, True),
+            ('NOT (#s = :s) OR sk < :n', {'#s': 'status'}, {':s': 'OPEN', ':n': 0}, False),
+            ('sk BETWEEN :lo AND :hi', None, {':lo': 1, ':hi': 1}, True),
+            ('#s IN (:a, :b)', {'#s': 'status'}, {':a': 'CLOSED', ':b': 'OPEN'}, True),
+            ('contains(tags, :t) AND begins_with(#s, :p)', {'#s': 'status'}, {':t': 'x', ':p': 'OP'}, True),
+            ('missing <> :v', None, {':v': 1}, True),
+        ]
+        for expression, names, values, passes in cases:
+            with self.subTest(expression=expression):
+                kwargs = {'TableName': 't', 'Key': {'pk': {'S': 'a'}, 'sk': {'N': '1'}},
+                          'UpdateExpression': 'SET touched = :one',
+                          'ConditionExpression': expression}
+                all_values = dict(values or {}, **{':one': 1})
+                kwargs['ExpressionAttributeValues'] = {k: self.aws_value(v) for k, v in all_values.items()}
+                if names:
+                    kwargs['ExpressionAttributeNames'] = names
+                if passes:
+                    self.client.update_item(**kwargs)
+                else:
+                    with self.assertRaises(ClientError) as ctx:
+                        self.client.update_item(**kwargs)
+                    self.assertEqual(ctx.exception.response['Error']['Code'], 'ConditionalCheckFailedException')
+
+    @staticmethod
+    def aws_value(value):
+        from boto3.dynamodb.types import TypeSerializer
+        return TypeSerializer().serialize(value)
+
+    def test_boto3_condition_objects(self):
+        self.table.put_item(Item={'pk': 'a', 'sk': 1, 'v': 1}, ConditionExpression=Attr('pk').exists())
+        with self.assertRaises(ClientError):
+            self.table.delete_item(Key={'pk': 'a', 'sk': 1}, ConditionExpression=Attr('v').gt(1))
+
+    def test_updates(self):
+        self.table.update_item(
+            Key={'pk': 'a', 'sk': 1},
+            UpdateExpression='SET #n = if_not_exists(#n, :zero) + :one, meta.size = :s, added = :v '
+                             'ADD hits :one, tags :tag REMOVE #s DELETE tags :gone',
+            ExpressionAttributeNames={'#n': 'n', '#s': 'status'},
+            ExpressionAttributeValues={':zero': 0, ':one': 1, ':s': 5, ':v': 'new', ':tag': {'y'}, ':gone': {'x'}})
+        response = self.table.update_item(Key={'pk': 'a', 'sk': 1}, UpdateExpression='SET n = n - :one ADD hits :one',
+                                          ExpressionAttributeValues={':one': 1}, ReturnValues='UPDATED_NEW')
+        self.assertEqual(response['Attributes'], {'n': 0, 'hits': 2})
+        item = self.table.get_item(Key={'pk': 'a', 'sk': 1})['Item']
+        self.assertEqual(item['meta'], {'size': 5})
+        self.assertEqual(item['tags'], {'y'})
+        self.assertNotIn('status', item)
+        with self.assertRaises(ClientError):
+            self.table.update_item(Key={'pk': 'a', 'sk': 1}, UpdateExpression='SET x = missing + :one',
+                                   ExpressionAttributeValues={':one': 1})
+
+    def test_key_conditions_order_numerically(self):
+        self.assertEqual(self.sort_keys(self.table.query(KeyConditionExpression=Key('pk').eq('a'))), [1, 2, 10, 20])
+        self.assertEqual(self.sort_keys(self.table.query(KeyConditionExpression=Key('pk').eq('a') & Key('sk').gte(2),
+                                                         ScanIndexForward=False)), [20, 10, 2])
+        response = self.table.query(KeyConditionExpression='#p = :p AND sk BETWEEN :lo AND :hi',
+                                    ExpressionAttributeNames={'#p': 'pk'},
+                                    ExpressionAttributeValues={':p': 'a', ':lo': 2, ':hi': 10})
+        self.assertEqual(self.sort_keys(response), [2, 10])
+
+    def test_query_pages_and_filters(self):
+        self.aws.page_size = 3
+        first = self.table.query(KeyConditionExpression=Key('pk').eq('a'), FilterExpression=Attr('status').eq('OPEN'))
+        self.assertEqual((first['Count'], first['ScannedCount']), (1, 3))
+        second = self.table.query(KeyConditionExpression=Key('pk').eq('a'), FilterExpression=Attr('status').eq('OPEN'),
+                                  ExclusiveStartKey=first['LastEvaluatedKey'])
+        self.assertEqual((second['Count'], second['ScannedCount']), (0, 1))
+        self.assertNotIn('LastEvaluatedKey', second)
+
+    def test_binary_keys(self):
+        self.aws.create_table('bin', 'id')
+        self.client.put_item(TableName='bin', Item={'id': {'B': b'\x01'}, 'v': {'N': '1'}})
+        self.assertEqual(self.client.get_item(TableName='bin', Key={'id': {'B': b'\x01'}})['Item']['v'], {'N': '1'})
+
+    def test_explicit_none_parameters_are_rejected(self):
+        with self.assertRaises(ParamValidationError):
+            self.table.scan(FilterExpression=None, Select='COUNT')
+
+class TestFakeS3(unittest.TestCase):
+    def test_checksums_are_returned_only_in_checksum_mode(self):
+        aws = FakeAWS()
+        aws.create_bucket('b')
+        s3 = aws.client('s3')
+        s3.put_object(Bucket='b', Key='k', Body=b'data', ChecksumAlgorithm='SHA256', ChecksumSHA256='abc=')
+        self.assertNotIn('ChecksumSHA256', s3.head_object(Bucket='b', Key='k'))
+        self.assertEqual(s3.head_object(Bucket='b', Key='k', ChecksumMode='ENABLED')['ChecksumSHA256'], 'abc=')
+        response = s3.get_object(Bucket='b', Key='k', ChecksumMode='ENABLED')
+        self.assertNotIn('ChecksumAlgorithm', response)
+        self.assertEqual(response['Body'].read(), b'data')
+
+class TestFakeTranscribe(unittest.TestCase):
+    def setUp(self):
+        self.aws = FakeAWS()
+        self.aws.create_bucket('out')
+        self.transcribe = self.aws.client('transcribe')
+        self.s3 = self.aws.client('s3')
+
+    def test_output_key_prefix_and_streamed_transcript(self):
+        job = self.transcribe.start_transcription_job(
+            TranscriptionJobName='j', Media={'MediaFileUri': 's3://in/a.wav'}, OutputBucketName='out',
+            OutputKey='chunks/')['TranscriptionJob']
+        self.assertNotIn('OutputKey', job)
+        self.assertTrue(job['Transcript']['RedactedTranscriptFileUri'].endswith('/out/chunks/redacted-j.json'))
+        body = self.s3.get_object(Bucket='out', Key='chunks/redacted-j.json')['Body']
+        chunks = list(body.iter_chunks(chunk_size=16))
+        self.assertTrue(all(len(chunk) <= 16 for chunk in chunks))
+        self.assertIn(b'[PII] transcript', b''.join(chunks))
+
+if __name__ == '__main__':
+    unittest.main()
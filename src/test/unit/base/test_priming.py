@@ -0,0 +1,50 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from common import priming
+from common.config import get_config
+from common.priming import get_client, get_resource, prime, reset_primed_clients
+
+class TestPriming(unittest.TestCase):
+    def setUp(self):
+        session_patcher = patch('boto3.Session')
+        self.addCleanup(session_patcher.stop)
+        self.mock_session = session_patcher.start().return_value
+        self.mock_session.client.side_effect = lambda service: MagicMock(name=service)
+        self.addCleanup(reset_primed_clients)
+
+    def test_primed_clients_are_registered(self):
+        timings = prime(('s3', 'dynamodb'), region_name='us-east-1')
+        self.assertEqual(set(timings), {'session', 'credentials', 's3.client', 'dynamodb.client',
+                                        'dynamodb.resource', 'total'})
+        self.mock_session.get_credentials.return_value.get_frozen_credentials.assert_called_once()
+        self.assertEqual(get_client('s3', 'us-east-1')._mock_name, 's3')
+        self.assertIs(get_resource('dynamodb', 'us-east-1'), self.mock_session.resource.return_value)
+
+    @patch('boto3.client')
+    def test_unprimed_services_get_new_clients(self, mock_client):
+        prime(('s3',), region_name='us-east-1')
+        self.assertIs(get_client('s3', 'eu-west-1'), mock_client.return_value)
+        mock_client.assert_called_once_with('s3', region_name='eu-west-1')
+
+    def test_warm_up_calls_and_failures_are_ignored(self):
+        failing = MagicMock(side_effect=Exception('AccessDenied'))
+        timings = prime(('s3', 'dynamodb'), warm_up=True, warm_up_calls={'s3': failing})
+        failing.assert_called_once()
+        get_client('dynamodb').describe_limits.assert_called_once()
+        self.assertIn('s3.warm_up', timings)
+
+    def test_s3_warm_up_heads_the_configured_bucket(self):
+        prime(('s3',), warm_up=True)
+        get_client('s3').head_bucket.assert_called_once_with(Bucket=get_config().target_output_bucket)
+        get_client('s3').list_buckets.assert_not_called()
+
+    def test_reprimes_after_snapshot_restore(self):
+        register = MagicMock()
+        with patch.object(priming, 'register_after_restore', register), \
+                patch.object(priming, '_restore_hook_registered', False):
+            prime(('s3',), region_name='us-east-1')
+            prime(('s3',), region_name='us-east-1')
+        register.assert_called_once_with(prime, ('s3',), 'us-east-1', False, None)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import marshal
+import unittest
+from unittest.mock import patch, MagicMock
+from common.config import Config
+from common.profiling import InvocationProfile, profiled
+
+def work(event, context):
+    return sum(range(event)) and [bytearray(1024) for _ in range(10)]
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        config_patcher = patch('common.profiling.get_config')
+        self.addCleanup(config_patcher.stop)
+        self.mock_get_config = config_patcher.start()
+
+    def profile(self, func, **settings):
+        self.mock_get_config.return_value = Config(**settings)
+        return profiled('job')(func)
+
+    @patch('common.profiling.logger')
+    @patch('common.profiling.InvocationProfile')
+    def test_sample_rate_is_read_on_each_call(self, mock_profile, _):
+        handler = self.profile(work)
+        self.assertEqual(len(handler(1000, None)), 10)
+        mock_profile.assert_not_called()
+        self.mock_get_config.return_value = Config(profiling_sample_rate=1.0)
+        handler(10, None)
+        mock_profile.assert_called_once()
+
+    @patch('common.profiling.logger')
+    def test_profiled_invocation_logs_summary(self, mock_logger):
+        handler = self.profile(work, profiling_sample_rate=1.0, profiling_top_n=5)
+        self.assertEqual(len(handler(1000, None)), 10)
+        summary = mock_logger.add_tempdata.call_args[0][1]
+        self.assertEqual(summary['name'], 'job')
+        self.assertLessEqual(len(summary['top_functions']), 5)
+        self.assertTrue(any('work' in entry['function'] for entry in summary['top_functions']))
+        self.assertGreater(summary['peak_memory_kb'], 0)
+        self.assertNotIn('pstats_uri', summary)
+
+    @patch('common.profiling.get_client')
+    @patch('common.profiling.logger')
+    def test_pstats_are_uploaded(self, mock_logger, mock_get_client):
+        handler = self.profile(work, profiling_sample_rate=1.0, profiling_s3_uri='s3://bucket/profiles')
+        handler(10, MagicMock(aws_request_id='req-1'))
+        kwargs = mock_get_client.return_value.put_object.call_args.kwargs
+        self.assertEqual(kwargs['Bucket'], 'bucket')
+        self.assertTrue(kwargs['Key'].startswith('profiles/job/'))
+        self.assertTrue(kwargs['Key'].endswith('-req-1.pstats'))
+        self.assertIsInstance(marshal.loads(kwargs['Body']), dict)
+        self.assertEqual(mock_logger.add_tempdata.call_args[0][1]['pstats_uri'], f"s3://bucket/{kwargs['Key']}")
+
+    @patch('common.profiling.logger')
+    def test_failing_invocation_is_still_reported(self, mock_logger):
+        handler = self.profile(MagicMock(side_effect=ValueError('boom'), __qualname__='f'), profiling_sample_rate=1.0)
+        with self.assertRaises(ValueError):
+            handler({}, None)
+        mock_logger.warning.assert_called_once()
+
+    @patch('common.profiling.random.random', return_value=0.9)
+    @patch('common.profiling.InvocationProfile')
+    def test_unsampled_invocations_are_not_profiled(self, mock_profile, _):
+        handler = self.profile(work, profiling_sample_rate=0.5)
+        handler(10, None)
+        mock_profile.assert_not_called()
+
+    def test_invocation_profile_as_context_manager(self):
+        with InvocationProfile('block', top_n=3) as profile:
+            work(100, None)
+        self.assertEqual(len(profile.summary()['top_functions']), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import io
+import json
+import os
+import sys
+import unittest
+import wave
+from unittest.mock import patch
+from common.config import Config
+from common.priming import reset_primed_clients
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'benchmark'))
+from fake_aws import FakeAWS  # noqa: E402
+
+with patch('boto3.Session'):
+    from strategies.workflow import s3_remove_pii  # noqa: E402
+reset_primed_clients()
+
+def make_wav(seconds, rate=100):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(rate)
+        writer.writeframes(b'\x00\x00' * int(seconds * rate))
+    return buffer.getvalue()
+
+def s3_event(bucket, key):
+    return {'Records': [{'s3': {'bucket': {'name': bucket}, 'object': {'key': key}}}]}
+
+class TestS3RemovePiiHandler(unittest.TestCase):
+    def setUp(self):
+        self.aws = FakeAWS()
+        self.aws.create_bucket('in')
+        self.aws.create_bucket('out')
+        self.aws.client('s3').put_object(Bucket='in', Key='call.wav', Body=make_wav(25))
+        client_patcher = patch('boto3.client', self.aws.client)
+        client_patcher.start()
+        self.addCleanup(client_patcher.stop)
+        self.addCleanup(reset_primed_clients)
+
+    def handle(self, key, **settings):
+        config = Config(aws_region='us-east-1', target_output_bucket='out', **settings)
+        with patch.object(s3_remove_pii, 'get_config', return_value=config):
+            return s3_remove_pii.S3RemovePiiHandler().handle(s3_event('in', key), None)
+
+    def test_wav_is_transcribed_in_chunks_when_configured(self):
+        response = self.handle('call.wav', transcribe_chunk_seconds=10, transcribe_chunk_overlap_seconds=2)
+        self.assertEqual((response['statusCode'], response['Status']), (200, 'COMPLETED'))
+        self.assertEqual(self.aws.call_counts['StartTranscriptionJob'], 3)
+        self.assertEqual(self.aws.transcription_jobs, {})
+        merged_keys = [key for key in self.aws.buckets['out'] if key.startswith('redacted-')]
+        self.assertEqual(len(merged_keys), 1)
+        merged = json.loads(self.aws.buckets['out'][merged_keys[0]]['Body'])
+        self.assertIn('[PII]', merged['results']['transcripts'][0]['transcript'])
+        self.assertEqual(sorted(self.aws.buckets['out']), merged_keys)
+
+    @patch('time.sleep')
+    def test_single_job_without_chunking(self, _):
+        response = self.handle('call.wav')
+        self.assertEqual((response['statusCode'], response['Status']), (200, 'COMPLETED'))
+        self.assertEqual(self.aws.call_counts['StartTranscriptionJob'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
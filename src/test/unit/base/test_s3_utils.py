@@ -1,6 +1,11 @@
+import base64
+import hashlib
 import unittest
 from unittest.mock import patch, MagicMock
-from strategies.base.s3_utils import S3Utils
+from botocore.exceptions import ClientError
+from strategies.utils.s3_utils import S3Utils
+
+DATA_SHA256 = base64.b64encode(hashlib.sha256(b'data').digest()).decode('ascii')
 
 class TestS3Utils(unittest.TestCase):
     def setUp(self):
@@ -21,6 +26,39 @@ class TestS3Utils(unittest.TestCase):
         result = self.s3_utils.put_object('bucket', 'key', b'data')
         self.assertEqual(result, {'ResponseMetadata': {'HTTPStatusCode': 200}})
 
+    def test_put_object_with_checksum(self):
+        self.s3_utils.put_object('bucket', 'key', 'data', verify_checksum=True)
+        self.mock_s3.head_object.assert_not_called()
+        self.mock_s3.put_object.assert_called_once_with(Bucket='bucket', Key='key', Body='data',
+                                                        ChecksumSHA256=DATA_SHA256,
+                                                        Metadata={'sha256': DATA_SHA256})
+
+    def test_put_object_skips_unchanged(self):
+        self.mock_s3.head_object.return_value = {'ETag': '"e"', 'Metadata': {'sha256': DATA_SHA256}}
+        result = self.s3_utils.put_object('bucket', 'key', b'data', skip_if_unchanged=True)
+        self.assertEqual(result, {'Skipped': True, 'ETag': '"e"'})
+        self.mock_s3.head_object.assert_called_once_with(Bucket='bucket', Key='key', ChecksumMode='ENABLED')
+        self.mock_s3.put_object.assert_not_called()
+
+    def test_put_object_skips_unchanged_by_returned_checksum(self):
+        self.mock_s3.head_object.return_value = {'ETag': '"e"', 'ChecksumSHA256': DATA_SHA256, 'Metadata': {}}
+        result = self.s3_utils.put_object('bucket', 'key', 'data', skip_if_unchanged=True)
+        self.assertEqual(result, {'Skipped': True, 'ETag': '"e"'})
+        self.mock_s3.put_object.assert_not_called()
+
+    def test_put_object_uploads_changed_or_missing(self):
+        self.mock_s3.head_object.return_value = {'ChecksumSHA256': 'other', 'Metadata': {}}
+        self.s3_utils.put_object('bucket', 'key', b'data', skip_if_unchanged=True)
+        self.mock_s3.head_object.side_effect = ClientError({'Error': {'Code': '404'}}, 'HeadObject')
+        self.s3_utils.put_object('bucket', 'key', b'data', skip_if_unchanged=True)
+        self.assertEqual(self.mock_s3.put_object.call_count, 2)
+        self.assertEqual(self.mock_s3.put_object.call_args.kwargs['ChecksumSHA256'], DATA_SHA256)
+
+    def test_put_object_head_error_is_raised(self):
+        self.mock_s3.head_object.side_effect = ClientError({'Error': {'Code': '403'}}, 'HeadObject')
+        with self.assertRaises(ClientError):
+            self.s3_utils.put_object('bucket', 'key', b'data', skip_if_unchanged=True)
+
     def test_delete_object(self):
         self.mock_s3.delete_object.return_value = {'ResponseMetadata': {'HTTPStatusCode': 204}}
         result = self.s3_utils.delete_object('bucket', 'key')
@@ -1,6 +1,6 @@
 import unittest
 from unittest.mock import patch, MagicMock
-from strategies.base.transcribe_utils import TranscribeUtils
+from strategies.utils.transcribe_utils import TranscribeUtils
 
 class TestTranscribeUtils(unittest.TestCase):
     def setUp(self):
@@ -29,5 +29,17 @@ class TestTranscribeUtils(unittest.TestCase):
         status = self.transcribe_utils.check_transcription_status('job')
         self.assertEqual(status, 'COMPLETED')
 
+    def test_delete_transcription_job(self):
+        self.transcribe_utils.delete_transcription_job('job')
+        self.mock_transcribe.delete_transcription_job.assert_called_once_with(TranscriptionJobName='job')
+
+    def test_wait_for_transcription_job(self):
+        self.mock_transcribe.get_transcription_job.side_effect = [
+            {'TranscriptionJob': {'TranscriptionJobStatus': 'QUEUED'}},
+            {'TranscriptionJob': {'TranscriptionJobStatus': 'FAILED', 'FailureReason': 'bad audio'}}
+        ]
+        job = self.transcribe_utils.wait_for_transcription_job('job', poll_seconds=0)
+        self.assertEqual(job['FailureReason'], 'bad audio')
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file